@@ -1,15 +1,21 @@
-import asyncio
 from aiogram import executor
 
+from data.config import USE_WEBHOOK, WORKERS, WORKER_QUEUE_SIZE, METRICS_HOST, METRICS_PORT
 from loader import dp, bot
 import middlewares, filters, handlers
 from utils.notify_admins import on_startup_notify
 from utils.set_bot_commands import set_default_commands
-from utils.scheduler import subscription_scheduler
-from utils.db_api.database import init_db
+from utils.leader import singleton_jobs
+from utils.metrics import start_metrics_server
+from utils.webhook import start_webhook, wait_in_flight
+from utils.db_api import db, writes
+from utils.db_api.database import init_db, close_pool
+from utils.supervisor import Supervisor
+
+leader = singleton_jobs(bot)
 
 async def on_startup(dispatcher):
-    # Database ni yaratish
+    # Database migratsiyalarini bajarish (faqat shu yerda, bir marta)
     init_db()
     
     # Birlamchi komandalar (/start va /help)
@@ -18,18 +24,46 @@ async def on_startup(dispatcher):
     # Bot ishga tushgani haqida adminga xabar berish
     await on_startup_notify(dispatcher)
     
-    # Obunalar tekshirish schedulerini ishga tushirish
-    asyncio.create_task(subscription_scheduler(bot))
+    # Obunalar scheduleri va reklamalar navbati - bir nechta nusxa ishlasa
+    # ham faqat lider nusxada (to'xtab qolgan reklamalar shu yerda davom etadi)
+    leader.start()
+
+    # Lokal Prometheus endpoint'i (/metrics)
+    if METRICS_PORT:
+        dispatcher['metrics_server'] = await start_metrics_server(METRICS_HOST, METRICS_PORT)
     
     print("Bot ishga tushdi!")
 
 async def on_shutdown(dispatcher):
+    # Webhook rejimida fonda ishlanayotgan update'larni kutish
+    await wait_in_flight()
+
+    # Ijarani bo'shatish - boshqa nusxa scheduler'ni darhol davom ettiradi
+    await leader.stop()
+
+    if dispatcher.get('metrics_server'):
+        await dispatcher['metrics_server'].cleanup()
+
+    # Navbatdagi yozuvlar va FSM holatlarini saqlash (DB yopilishidan oldin)
+    await writes.close()
+    await dispatcher.storage.close()
+
+    # DB thread'lari va ulanishlarni yopish
+    db.shutdown()
+    close_pool()
+
     print("Bot to'xtatildi!")
 
 if __name__ == '__main__':
-    executor.start_polling(
-        dp, 
-        on_startup=on_startup,
-        on_shutdown=on_shutdown,
-        skip_updates=True
-    )
+    if WORKERS > 1:
+        # Ko'p jarayonli rejim: update'lar user_id bo'yicha worker'larga taqsimlanadi
+        Supervisor(WORKERS, WORKER_QUEUE_SIZE).run()
+    elif USE_WEBHOOK:
+        start_webhook(dp, on_startup=on_startup, on_shutdown=on_shutdown)
+    else:
+        executor.start_polling(
+            dp, 
+            on_startup=on_startup,
+            on_shutdown=on_shutdown,
+            skip_updates=True
+        )
@@ -0,0 +1,6 @@
+import os
+
+# Benchmarklar haqiqiy bot tokenisiz ishlashi uchun (data/config.py shularni talab qiladi)
+os.environ.setdefault("BOT_TOKEN", "123456:BENCHMARK")
+os.environ.setdefault("ADMINS", "1")
+os.environ.setdefault("ip", "localhost")
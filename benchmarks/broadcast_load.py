@@ -0,0 +1,272 @@
+"""
+Reklama yuborish benchmarki: haqiqiy reklama yo'li (db.create_broadcast ->
+broadcast_worker -> Broadcaster -> RateLimitedBot) soxta Bot API serverga
+(benchmarks/fake_bot_api.py, alohida jarayon) qarshi ishlaydi.
+
+O'lchanadi: erishilgan xabar/s, 429 (RetryAfter) soni, yakunlash vaqti va
+reklama davomida jarayonning eng katta xotirasi (RSS). Limit va
+parallellikni production token'siz sozlash uchun.
+
+Ishlatish:
+    python -m benchmarks.broadcast_load --users 10000 --rate 1000 --workers 32
+    python -m benchmarks.broadcast_load --users 100000 --rate 30 --rate-limit 30 --latency 40
+    python -m benchmarks.broadcast_load --users 500000 --rate 2000 --workers 64 --retry-after-rate 0.001
+
+--bot-workers N bilan bot alohida jarayonda (python app.py, WORKERS=N) ishga
+tushiriladi va reklamani supervisor tanlagan lider worker yuboradi. Vaqt
+vazifa 'running' bo'lgan paytdan o'lchanadi (worker navbatni o'zi tekshiradi).
+
+    python -m benchmarks.broadcast_load --users 10000 --rate 25 --bot-workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.dataset import dataset
+from benchmarks.fake_bot_api import add_arguments
+
+ADMIN_CHAT_ID = 1
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def rss_mb(pid='self') -> float:
+    """Jarayonning joriy RSS'i (MB); /proc bo'lmasa - shu jarayonning eng katta RSS'i"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if pid == 'self' else 0.0
+
+
+def tree_rss_mb(pid: int) -> float:
+    """Jarayon va uning bolalari (worker'lar) RSS'i yig'indisi"""
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            children = [int(child) for child in f.read().split()]
+    except OSError:
+        children = []
+    return rss_mb(pid) + sum(tree_rss_mb(child) for child in children)
+
+
+def start_fake_api(args) -> subprocess.Popen:
+    command = [
+        sys.executable, '-m', 'benchmarks.fake_bot_api', '--port', str(args.port),
+        '--latency', str(args.latency), '--jitter', str(args.jitter),
+        '--error-rate', str(args.error_rate), '--retry-after-rate', str(args.retry_after_rate),
+        '--retry-after', str(args.retry_after), '--rate-limit', str(args.rate_limit),
+    ]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            api_stats(args.port)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("Soxta Bot API ishga tushmadi")
+
+
+def fake_api_url(port: int) -> str:
+    return f"http://127.0.0.1:{port}"
+
+
+def api_stats(port: int) -> dict:
+    with urllib.request.urlopen(f"{fake_api_url(port)}/_stats", timeout=5) as response:
+        return json.load(response)
+
+
+async def run_broadcast(args) -> dict:
+    # Konfiguratsiya o'qilishidan oldin import qilinmasligi kerak (main() ga qarang)
+    from loader import bot
+    from utils.broadcast_jobs import broadcast_worker, wake_broadcast_worker
+    from utils.db_api import db
+    from data import config
+
+    # Haqiqiy Telegram'ga (sintetik foydalanuvchilarga) hech narsa ketmasin
+    assert config.BOT_API_SERVER == fake_api_url(args.port), (
+        f"BOT_API_SERVER soxta serverga qaramayapti: {config.BOT_API_SERVER!r}")
+    assert config.BROADCAST_RATE == args.rate and config.BROADCAST_WORKERS == args.workers
+
+    peak = rss_mb()
+    sampling = True
+
+    async def sample_rss():
+        nonlocal peak
+        while sampling:
+            peak = max(peak, rss_mb())
+            await asyncio.sleep(0.1)
+
+    sampler = asyncio.create_task(sample_rss())
+    worker = asyncio.create_task(broadcast_worker(bot))
+
+    # handlers/admin/broadcast.py dagi tasdiqlash bilan bir xil
+    started = time.perf_counter()
+    broadcast_id = await db.create_broadcast(
+        broadcast_type='text',
+        target=args.target,
+        message_text="📢 Benchmark reklamasi",
+        admin_chat_id=ADMIN_CHAT_ID,
+    )
+    wake_broadcast_worker()
+
+    while True:
+        job = await db.get_broadcast(broadcast_id)
+        if job['status'] in ('done', 'failed'):
+            break
+        if not args.quiet:
+            print(f"\r  {job['sent_count'] + job['failed_count']}/{job['total_count']}", end='', flush=True)
+        await asyncio.sleep(0.5)
+    elapsed = time.perf_counter() - started
+    if not args.quiet:
+        print()
+
+    sampling = False
+    worker.cancel()
+    await asyncio.gather(worker, sampler, return_exceptions=True)
+    limiter_retry_after = bot.limiter.retry_after
+    await (await bot.get_session()).close()
+    db.shutdown()
+
+    return {
+        'status': job['status'],
+        'total': job['total_count'],
+        'sent': job['sent_count'],
+        'failed': job['failed_count'],
+        'elapsed_s': round(elapsed, 3),
+        'msg_per_sec': round(job['sent_count'] / elapsed, 1) if elapsed else 0.0,
+        'limiter_retry_after': limiter_retry_after,
+        'peak_rss_mb': round(peak, 1),
+    }
+
+
+def run_supervised(args) -> dict:
+    """Bot app.py orqali WORKERS=--bot-workers bilan; reklama bazaga navbatga qo'yiladi"""
+    from utils.db_api import database
+
+    bot = subprocess.Popen([sys.executable, 'app.py'], cwd=ROOT, env=dict(os.environ, WORKERS=str(args.bot_workers)),
+                           stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL)
+    try:
+        broadcast_id = database.create_broadcast(
+            broadcast_type='text',
+            target=args.target,
+            message_text="📢 Benchmark reklamasi",
+            admin_chat_id=ADMIN_CHAT_ID,
+        )
+        peak = 0.0
+        started = None
+        while True:
+            if bot.poll() is not None:
+                raise RuntimeError(f"Bot to'xtadi (kod {bot.returncode})")
+            job = database.get_broadcast(broadcast_id)
+            peak = max(peak, tree_rss_mb(bot.pid))
+            if started is None and job['status'] != 'pending':
+                started = time.perf_counter()
+            if job['status'] in ('done', 'failed'):
+                break
+            if started and not args.quiet:
+                print(f"\r  {job['sent_count'] + job['failed_count']}/{job['total_count']}", end='', flush=True)
+            time.sleep(0.1)
+        elapsed = time.perf_counter() - started
+        if not args.quiet:
+            print()
+    finally:
+        bot.send_signal(signal.SIGINT)
+        bot.wait(timeout=60)
+
+    return {
+        'status': job['status'],
+        'total': job['total_count'],
+        'sent': job['sent_count'],
+        'failed': job['failed_count'],
+        'elapsed_s': round(elapsed, 3),
+        'msg_per_sec': round(job['sent_count'] / elapsed, 1) if elapsed else 0.0,
+        'limiter_retry_after': None,
+        'peak_rss_mb': round(peak, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=10000, help="reklama oluvchilar (10k-500k)")
+    parser.add_argument('--target', default='all', choices=('all', 'subscribers', 'non_subscribers'))
+    parser.add_argument('--rate', type=float, default=25, help='BROADCAST_RATE, xabar/s')
+    parser.add_argument('--workers', type=int, default=8, help='BROADCAST_WORKERS')
+    parser.add_argument('--outbound-rate', type=float, help="OUTBOUND_RATE (berilmasa --rate'dan biroz ko'p)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'tradecrm-bench'))
+    parser.add_argument('--out', help='natija JSON fayli')
+    parser.add_argument('--bot-workers', type=int, default=0,
+                        help="0 - shu jarayonda; N - app.py WORKERS=N (supervisor) bilan")
+    parser.add_argument('--quiet', action='store_true')
+    parser.add_argument('--verbose', action='store_true', help="bot loglarini ko'rsatish (--bot-workers)")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    db_path = os.path.join(tmp, 'broadcast.db')
+
+    # data/config.py birinchi import qilinishidan oldin - dataset() ham uni import qiladi
+    os.environ.update(
+        DB_PATH=db_path,
+        BOT_API_SERVER=fake_api_url(args.port),
+        BROADCAST_RATE=str(args.rate),
+        BROADCAST_WORKERS=str(args.workers),
+        OUTBOUND_RATE=str(args.outbound_rate or args.rate + 5),
+    )
+
+    shutil.copyfile(dataset(args.data_dir, args.users, args.seed), db_path)
+
+    # dataset() bazani yaratgan bo'lsa, pool hali vaqtinchalik faylga qaragan
+    from utils.db_api.database import close_pool, init_pool
+    init_pool(db_path)
+
+    api = start_fake_api(args)
+    try:
+        result = run_supervised(args) if args.bot_workers else asyncio.run(run_broadcast(args))
+        stats = api_stats(args.port)
+    finally:
+        api.send_signal(signal.SIGINT)
+        api.wait(timeout=10)
+        close_pool()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    result.update(
+        users=args.users,
+        rate=args.rate,
+        workers=args.workers,
+        bot_workers=args.bot_workers,
+        api_calls=sum(stats['calls'].values()),
+        api_retry_after=stats['retry_afters'],
+        api_errors=stats['errors'],
+    )
+
+    print(f"Oluvchilar:  {result['total']} (yuborildi: {result['sent']}, xato: {result['failed']}, "
+          f"holat: {result['status']})")
+    print(f"Vaqt:        {result['elapsed_s']:.1f}s")
+    processes = f", {args.bot_workers} bot jarayoni" if args.bot_workers else ''
+    print(f"Tezlik:      {result['msg_per_sec']:.1f} xabar/s (limit {args.rate}, {args.workers} worker{processes})")
+    print(f"RetryAfter:  server {result['api_retry_after']}, bot limiteri {result['limiter_retry_after']}")
+    print(f"Xotira:      eng ko'pi {result['peak_rss_mb']:.1f} MB RSS")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
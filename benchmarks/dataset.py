@@ -0,0 +1,181 @@
+"""
+Benchmarklar uchun sintetik baza: foydalanuvchilar, to'lovlar (holatlar
+aralashmasi), obunalar (expires_at o'tmish va kelajakka yoyilgan), katalog va
+reklamalar. Bir xil --users va --seed doim bir xil ma'lumot beradi.
+
+Ishlatish:
+    python -m benchmarks.dataset --users 100000 --out bench.db
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+FIRST_NAMES = [
+    'Anvar', 'Aziz', 'Bekzod', 'Dilshod', 'Eldor', 'Farrux', 'Jasur', 'Javohir', 'Kamol', 'Laziz',
+    'Mansur', 'Nodir', 'Otabek', 'Rustam', 'Sardor', 'Sherzod', 'Timur', 'Ulugbek', 'Zafar', 'Abdulla',
+    'Dilnoza', 'Gulnora', 'Kamola', 'Madina', 'Malika', 'Nigora', 'Nilufar', 'Sevara', 'Shahnoza', 'Zarina',
+]
+LAST_NAMES = [
+    'Karimov', 'Rahimov', 'Aliyev', 'Tursunov', 'Yusupov', 'Ismoilov', 'Qodirov', 'Saidov', 'Ergashev',
+    'Nazarov', 'Mirzayev', 'Hasanov', 'Abdullayev', 'Sobirov', 'Umarov', 'Xolmatov', 'Jurayev', 'Salimov',
+]
+
+# Foydalanuvchilar shu davr ichida ro'yxatdan o'tgan
+HISTORY_DAYS = 365
+
+# To'lov holatlari ulushi
+PAYMENT_STATUSES = (('approved', 0.72), ('rejected', 0.23), ('pending', 0.05))
+PAYMENTS_PER_USER = 0.6
+PRICES = ((30, 100000), (90, 270000), (180, 500000), (365, 900000))
+
+# Obunasi bor foydalanuvchilar va ularning tugash muddati (bugundan kunlarda)
+SUBSCRIBED_SHARE = 0.4
+EXPIRES_RANGE = (-90, 90)
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+FIRST_USER_ID = 100_000_000
+
+
+def _ts(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _users(rnd: random.Random, count: int, now: datetime):
+    for i in range(count):
+        name = f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}"
+        username = f"{name.split()[0].lower()}_{i}" if rnd.random() < 0.7 else None
+        registered = now - timedelta(seconds=rnd.randrange(HISTORY_DAYS * 86400))
+        yield FIRST_USER_ID + i, username, name, _ts(registered)
+
+
+def _payments(rnd: random.Random, users: int, cards: int, now: datetime):
+    statuses = [status for status, _ in PAYMENT_STATUSES]
+    weights = [share for _, share in PAYMENT_STATUSES]
+    for _ in range(int(users * PAYMENTS_PER_USER)):
+        user_id = FIRST_USER_ID + rnd.randrange(users)
+        days, amount = rnd.choice(PRICES)
+        status = rnd.choices(statuses, weights)[0]
+        if status == 'pending':
+            # Kutilayotganlar - oxirgi kunlarda yuborilgan
+            created = now - timedelta(seconds=rnd.randrange(3 * 86400))
+        else:
+            created = now - timedelta(seconds=rnd.randrange(HISTORY_DAYS * 86400))
+        approved = created + timedelta(minutes=rnd.randrange(5, 600)) if status == 'approved' else None
+        yield status, (
+            user_id, amount, f"receipt{rnd.getrandbits(48):x}", rnd.randrange(1, cards + 1), days,
+            _ts(created), approved and _ts(approved), approved and _ts(approved + timedelta(days=days)),
+        )
+
+
+def _subscriptions(rnd: random.Random, users: int, now: datetime):
+    for user_id in rnd.sample(range(FIRST_USER_ID, FIRST_USER_ID + users), int(users * SUBSCRIBED_SHARE)):
+        expires = now + timedelta(seconds=rnd.randrange(EXPIRES_RANGE[0] * 86400, EXPIRES_RANGE[1] * 86400))
+        # Muddati o'tgan obunalarning bir qismini scheduler hali o'chirmagan
+        is_active = int(expires > now or rnd.random() < 0.02)
+        started = expires - timedelta(days=rnd.choice(PRICES)[0])
+        notified = _ts(now - timedelta(hours=rnd.randrange(48))) if rnd.random() < 0.3 else None
+        yield user_id, is_active, _ts(started), _ts(expires), int(rnd.random() < 0.8), notified
+
+
+def generate(db_path: str, users: int, seed: int = 42):
+    """db_path'da migratsiyalangan va to'ldirilgan baza yaratadi"""
+    os.environ["DB_PATH"] = db_path
+    from utils.db_api import database
+
+    database.init_pool(db_path)
+    database.init_db()
+    database.close_pool()
+
+    rnd = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    cards = 3
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=OFF')
+    with conn:
+        conn.executemany(
+            'INSERT INTO cards (card_number, card_holder, bank_name) VALUES (?, ?, ?)',
+            ((f"8600 {i:04d} 0000 0000", f"Card Holder {i}", 'Bank') for i in range(1, cards + 1))
+        )
+        conn.executemany(
+            'INSERT INTO prices (days, price, description) VALUES (?, ?, ?)',
+            ((days, price, f"{days} kun") for days, price in PRICES)
+        )
+        conn.executemany(
+            'INSERT INTO channels (channel_id, channel_name, invite_link) VALUES (?, ?, ?)',
+            ((f"-100{i:010d}", f"Kanal {i}", f"https://t.me/+channel{i}") for i in range(1, 3))
+        )
+        conn.executemany(
+            'INSERT INTO videos (name, file_id, description, is_free) VALUES (?, ?, ?, ?)',
+            ((f"Dars {i}", f"video{i}", f"Video qo'llanma {i}", int(i % 5 == 0)) for i in range(1, 51))
+        )
+        conn.executemany(
+            'INSERT INTO users (user_id, username, full_name, registered_at) VALUES (?, ?, ?, ?)',
+            _users(rnd, users, now)
+        )
+        # To'lovlar ilovadagidek 'pending' bo'lib qo'shiladi va keyin holati o'zgaradi -
+        # statistika triggerlari (0006) tasdiqlangan to'lovlarni shu yerda hisoblaydi
+        payments = list(_payments(rnd, users, cards, now))
+        conn.executemany(
+            '''INSERT INTO payments (id, user_id, amount, receipt_photo, card_id, subscription_days,
+                                     created_at, approved_at, expires_at, status)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')''',
+            ((payment_id, *row) for payment_id, (_, row) in enumerate(payments, 1))
+        )
+        conn.executemany(
+            'UPDATE payments SET status = ? WHERE id = ?',
+            ((status, payment_id) for payment_id, (status, _) in enumerate(payments, 1) if status != 'pending')
+        )
+        conn.executemany(
+            '''INSERT INTO subscriptions (user_id, is_active, started_at, expires_at, channel_joined, last_notified)
+               VALUES (?, ?, ?, ?, ?, ?)''',
+            _subscriptions(rnd, users, now)
+        )
+        conn.executemany(
+            '''INSERT INTO broadcasts (broadcast_type, target, message_text, status, total_count,
+                                       sent_count, created_at)
+               VALUES ('text', ?, ?, 'done', ?, ?, ?)''',
+            ((rnd.choice(('all', 'subscribers', 'non_subscribers')), f"Reklama {i}", users, users,
+              _ts(now - timedelta(days=200 - i))) for i in range(200))
+        )
+    conn.execute('ANALYZE')
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    conn.close()
+
+
+def dataset(data_dir: str, users: int, seed: int = 42) -> str:
+    """Tayyor bazaning yo'li; yo'q bo'lsa yaratiladi (keyingi ishga tushirishda qayta ishlatiladi)"""
+    os.makedirs(data_dir, exist_ok=True)
+    db_path = os.path.join(data_dir, f"users{users}-seed{seed}.db")
+    if not os.path.exists(db_path):
+        started = time.perf_counter()
+        generate(db_path + '.tmp', users, seed)
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(db_path + '.tmp' + suffix):
+                os.remove(db_path + '.tmp' + suffix)
+        os.replace(db_path + '.tmp', db_path)
+        print(f"Baza yaratildi: {db_path} ({time.perf_counter() - started:.1f}s)")
+    return db_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default='bench.db')
+    args = parser.parse_args()
+
+    if os.path.exists(args.out):
+        parser.error(f"{args.out} allaqachon mavjud")
+    started = time.perf_counter()
+    generate(args.out, args.users, args.seed)
+    print(f"{args.out}: {args.users} foydalanuvchi ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
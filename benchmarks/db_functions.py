@@ -0,0 +1,352 @@
+"""
+utils/db_api/database.py funksiyalarining benchmarki.
+
+Har bir o'lcham uchun sintetik baza (benchmarks/dataset.py) yaratiladi
+(--data-dir'da saqlanadi va keyingi safar qayta ishlatiladi), uning nusxasida
+har bir funksiya bir necha marta chaqiriladi. Natija JSON - commit'lar
+orasida solishtirish uchun: --compare oldingi natija bilan taqqoslaydi va
+sekinlashgan funksiyalar bo'lsa xato bilan chiqadi.
+
+Ishlatish:
+    python -m benchmarks.db_functions --sizes 10k,100k --out before.json
+    python -m benchmarks.db_functions --sizes 10k,100k --compare before.json
+    python -m benchmarks.db_functions --sizes 1m --only get_statistics,get_pending_payments
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.dataset import SIZES, FIRST_USER_ID, dataset
+from benchmarks.webhook_load import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Benchmark qilinmaydigan (ulanish va migratsiya) funksiyalar
+SKIPPED = {'init_pool', 'close_pool', 'get_connection', 'init_db'}
+
+
+class Fixture:
+    """Benchmark argumentlari uchun bazadagi mavjud ID'lar"""
+
+    def __init__(self, db_path: str, users: int, seed: int):
+        self.users = users
+        self.rnd = random.Random(seed)
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        self.pending = self._ids("SELECT id FROM payments WHERE status = 'pending'")
+        self.payments = self._ids('SELECT id FROM payments')
+        self.subscribed = self._ids('SELECT user_id FROM subscriptions WHERE is_active = 1')
+        self._deactivated = []
+        self.new_user_id = FIRST_USER_ID + users * 2
+
+    def _ids(self, sql: str) -> list:
+        ids = [row[0] for row in self.conn.execute(sql)]
+        self.rnd.shuffle(ids)
+        return ids
+
+    def user(self) -> int:
+        return FIRST_USER_ID + self.rnd.randrange(self.users)
+
+    def payment(self) -> int:
+        return self.rnd.choice(self.payments)
+
+    def take_pending(self) -> int:
+        if not self.pending:
+            return self.insert(
+                "INSERT INTO payments (user_id, amount, card_id, subscription_days) VALUES (?, 100000, 1, 30)",
+                (self.user(),)
+            )
+        return self.pending.pop()
+
+    def take_subscribed(self, count: int = None):
+        if len(self.subscribed) < (count or 1):
+            # Avval o'chirilganlar qayta faollashtiriladi
+            self.conn.execute('UPDATE subscriptions SET is_active = 1 WHERE user_id IN (SELECT value FROM json_each(?))',
+                              (json.dumps(self._deactivated),))
+            self.subscribed, self._deactivated = self._deactivated, []
+            self.rnd.shuffle(self.subscribed)
+        if count is None:
+            taken = [self.subscribed.pop()]
+        else:
+            taken, self.subscribed[-count:] = self.subscribed[-count:], []
+        self._deactivated.extend(taken)
+        return taken if count else taken[0]
+
+    def new_user(self) -> int:
+        self.new_user_id += 1
+        return self.new_user_id
+
+    def insert(self, sql: str, params=()) -> int:
+        """O'chirish funksiyalari uchun vaqtdan tashqarida yangi qator"""
+        return self.conn.execute(sql, params).lastrowid
+
+    def close(self):
+        self.conn.close()
+
+
+# (nom, funksiya, argumentlar) - argumentlar o'lchovdan tashqarida tayyorlanadi.
+# Yozuvchi funksiyalar oxirida: o'qishlar o'zgarmagan bazada o'lchanadi.
+CASES = [
+    # ---------- users ----------
+    ('get_user', 'get_user', lambda f: (f.user(),)),
+    ('get_users_count', 'get_users_count', lambda f: ()),
+    ('get_all_users', 'get_all_users', lambda f: ()),
+    ('search_users[id]', 'search_users', lambda f: (str(f.user()),)),
+    ('search_users[@]', 'search_users', lambda f: ('@sard',)),
+    ('search_users[name]', 'search_users', lambda f: ('Karim',)),
+    ('search_users[short]', 'search_users', lambda f: ('Al',)),
+    # ---------- payments ----------
+    ('get_pending_payments', 'get_pending_payments', lambda f: ()),
+    ('get_payment', 'get_payment', lambda f: (f.payment(),)),
+    ('get_user_payments', 'get_user_payments', lambda f: (f.user(),)),
+    ('get_all_payments', 'get_all_payments', lambda f: ()),
+    ('get_approved_payments', 'get_approved_payments', lambda f: ()),
+    ('get_rejected_payments', 'get_rejected_payments', lambda f: ()),
+    # ---------- subscriptions ----------
+    ('get_subscription', 'get_subscription', lambda f: (f.user(),)),
+    ('get_active_subscriptions', 'get_active_subscriptions', lambda f: ()),
+    ('get_all_subscriptions', 'get_all_subscriptions', lambda f: ()),
+    ('get_expiring_subscriptions', 'get_expiring_subscriptions', lambda f: ()),
+    ('get_expired_subscriptions', 'get_expired_subscriptions', lambda f: ()),
+    ('get_subscription_deadlines', 'get_subscription_deadlines', lambda f: ()),
+    ('get_subscription_with_user', 'get_subscription_with_user', lambda f: (f.user(),)),
+    # ---------- katalog ----------
+    ('get_active_cards', 'get_active_cards', lambda f: ()),
+    ('get_all_cards', 'get_all_cards', lambda f: ()),
+    ('get_card', 'get_card', lambda f: (1,)),
+    ('get_active_channels', 'get_active_channels', lambda f: ()),
+    ('get_all_channels', 'get_all_channels', lambda f: ()),
+    ('get_channel', 'get_channel', lambda f: (1,)),
+    ('get_all_videos', 'get_all_videos', lambda f: ()),
+    ('get_free_videos', 'get_free_videos', lambda f: ()),
+    ('get_video', 'get_video', lambda f: (1,)),
+    ('get_active_prices', 'get_active_prices', lambda f: ()),
+    ('get_all_prices', 'get_all_prices', lambda f: ()),
+    ('get_price', 'get_price', lambda f: (1,)),
+    # ---------- broadcasts ----------
+    ('get_broadcast', 'get_broadcast', lambda f: (1,)),
+    ('get_unfinished_broadcasts', 'get_unfinished_broadcasts', lambda f: ()),
+    ('get_broadcasts', 'get_broadcasts', lambda f: ()),
+    ('count_broadcast_recipients[all]', 'count_broadcast_recipients', lambda f: ('all',)),
+    ('count_broadcast_recipients[subscribers]', 'count_broadcast_recipients', lambda f: ('subscribers',)),
+    ('count_broadcast_recipients[non_subscribers]', 'count_broadcast_recipients', lambda f: ('non_subscribers',)),
+    ('get_broadcast_recipients_page[subscribers]', 'get_broadcast_recipients_page',
+     lambda f: ('subscribers', f.user())),
+    ('get_broadcast_recipients_page[non_subscribers]', 'get_broadcast_recipients_page',
+     lambda f: ('non_subscribers', f.user())),
+    ('iter_broadcast_recipients[subscribers]', 'iter_broadcast_recipients', lambda f: ('subscribers',)),
+    # ---------- admin ro'yxatlari ----------
+    ('get_page[users]', 'get_page', lambda f: ('users',)),
+    ('get_page[users, cursor]', 'get_page', lambda f: ('users', f.user())),
+    ('get_page[pay_pending]', 'get_page', lambda f: ('pay_pending',)),
+    ('get_page[pay_approved, cursor]', 'get_page', lambda f: ('pay_approved', f.payment())),
+    ('get_page[sub_expiring]', 'get_page', lambda f: ('sub_expiring',)),
+    ('get_page[sub_expired]', 'get_page', lambda f: ('sub_expired',)),
+    # ---------- FSM, ijara, sozlamalar ----------
+    ('get_fsm_record', 'get_fsm_record', lambda f: (str(f.user()), str(f.user()))),
+    ('get_lease', 'get_lease', lambda f: ('singleton_jobs',)),
+    ('get_setting', 'get_setting', lambda f: ('welcome',)),
+    # ---------- statistika ----------
+    ('get_statistics', 'get_statistics', lambda f: ()),
+    ('get_daily_stats', 'get_daily_stats', lambda f: ()),
+    ('get_monthly_stats', 'get_monthly_stats', lambda f: ()),
+
+    # ========== yozuvchi funksiyalar ==========
+    ('add_user', 'add_user', lambda f: (f.new_user(), 'bench_user', 'Bench User')),
+    ('update_user_phone', 'update_user_phone', lambda f: (f.user(), '+998901234567')),
+    ('add_payment', 'add_payment', lambda f: (f.user(), 100000, 'receipt', 1, 30)),
+    ('approve_payment', 'approve_payment', lambda f: (f.take_pending(),)),
+    ('reject_payment', 'reject_payment', lambda f: (f.take_pending(), 'bench')),
+    ('mark_channel_joined', 'mark_channel_joined', lambda f: (f.user(),)),
+    ('update_last_notified', 'update_last_notified', lambda f: (f.user(),)),
+    ('apply_queued_writes', 'apply_queued_writes', lambda f: (
+        [(f.new_user(), None, 'Bench User') for _ in range(100)],
+        [f.user() for _ in range(100)],
+        [f.user() for _ in range(100)],
+    )),
+    ('deactivate_subscription', 'deactivate_subscription', lambda f: (f.take_subscribed(),)),
+    ('deactivate_subscriptions[100]', 'deactivate_subscriptions', lambda f: (f.take_subscribed(100),)),
+    ('add_card', 'add_card', lambda f: ('8600 9999 0000 0000', 'Bench', 'Bank')),
+    ('toggle_card', 'toggle_card', lambda f: (1,)),
+    ('delete_card', 'delete_card', lambda f: (f.insert("INSERT INTO cards (card_number) VALUES ('x')"),)),
+    ('add_channel', 'add_channel', lambda f: ('-1009999999999', 'Bench', 'https://t.me/+bench')),
+    ('toggle_channel', 'toggle_channel', lambda f: (1,)),
+    ('update_channel_link', 'update_channel_link', lambda f: (1, 'https://t.me/+bench')),
+    ('delete_channel', 'delete_channel', lambda f: (f.insert("INSERT INTO channels (channel_id) VALUES ('x')"),)),
+    ('add_video', 'add_video', lambda f: ('Bench', 'video_bench')),
+    ('toggle_video_free', 'toggle_video_free', lambda f: (1,)),
+    ('delete_video', 'delete_video', lambda f: (f.insert(
+        "INSERT INTO videos (name, file_id) VALUES ('x', 'x')"),)),
+    ('add_price', 'add_price', lambda f: (30, 100000, 'Bench')),
+    ('toggle_price', 'toggle_price', lambda f: (1,)),
+    ('delete_price', 'delete_price', lambda f: (f.insert("INSERT INTO prices (days, price) VALUES (1, 1)"),)),
+    ('create_broadcast', 'create_broadcast', lambda f: ('text', 'subscribers', 'Bench')),
+    ('set_broadcast_status', 'set_broadcast_status', lambda f: (1, 'done')),
+    ('checkpoint_broadcast', 'checkpoint_broadcast', lambda f: (1, f.user(), 500, 0)),
+    ('save_fsm_records[100]', 'save_fsm_records', lambda f: (
+        [(str(uid), str(uid), 'PaymentStates:send_receipt', '{}', '{}', time.time())
+         for uid in (f.user() for _ in range(100))],
+        [],
+    )),
+    ('delete_idle_fsm_records', 'delete_idle_fsm_records', lambda f: (time.time() - 3600,)),
+    ('acquire_lease', 'acquire_lease', lambda f: ('bench', 'bench', 15)),
+    ('release_lease', 'release_lease', lambda f: ('bench', 'bench')),
+    ('set_setting', 'set_setting', lambda f: ('bench', 'value')),
+]
+
+
+def _consume(result):
+    # Generator (iter_broadcast_recipients) oxirigacha o'qiladi
+    if inspect.isgenerator(result):
+        for _ in result:
+            pass
+
+
+def run_case(func, make_args, fixture: Fixture, min_runs: int, max_runs: int, budget: float) -> dict:
+    timings = []
+    spent = 0.0
+    while len(timings) < max_runs and (len(timings) < min_runs or spent < budget):
+        args = make_args(fixture)
+        started = time.perf_counter()
+        _consume(func(*args))
+        elapsed = time.perf_counter() - started
+        timings.append(elapsed)
+        spent += elapsed
+    return {
+        'runs': len(timings),
+        'min_ms': round(min(timings) * 1000, 4),
+        'median_ms': round(percentile(timings, 0.50) * 1000, 4),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 4),
+    }
+
+
+def benchmark_size(users: int, args) -> dict:
+    source = dataset(args.data_dir, users, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Yozuvchi funksiyalar asl bazani o'zgartirmasligi uchun nusxa
+        db_path = os.path.join(tmp, 'bench.db')
+        shutil.copyfile(source, db_path)
+        os.environ["DB_PATH"] = db_path
+
+        from utils.db_api import database
+        database.init_pool(db_path)
+        fixture = Fixture(db_path, users, args.seed)
+
+        results = {}
+        try:
+            for name, function, make_args in CASES:
+                if args.only and name not in args.only and function not in args.only:
+                    continue
+                results[name] = run_case(getattr(database, function), make_args, fixture,
+                                         args.min_runs, args.max_runs, args.budget)
+                print(f"  {name:48} {results[name]['median_ms']:10.3f} ms  (p95 {results[name]['p95_ms']:.3f})")
+        finally:
+            fixture.close()
+            database.close_pool()
+    return results
+
+
+def uncovered() -> list:
+    """CASES'da yo'q public funksiyalar (yangi funksiya qo'shilsa shu yerda ko'rinadi)"""
+    from utils.db_api import database
+
+    covered = {function for _, function, _ in CASES} | SKIPPED
+    return sorted(
+        name for name, value in vars(database).items()
+        if inspect.isfunction(value) and value.__module__ == database.__name__
+        and not name.startswith('_') and name not in covered
+    )
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True, cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    """Sekinlashgan funksiyalar sonini qaytaradi"""
+    regressions = 0
+    print(f"\nSolishtirish ({baseline['meta'].get('commit')} -> {current['meta'].get('commit')}), "
+          f"chegara x{threshold}:")
+    for size, results in current['results'].items():
+        before = baseline['results'].get(size, {})
+        for name, result in results.items():
+            if name not in before:
+                continue
+            # Eng yaxshi natija (min) fon yuklamasi shovqiniga median'dan kam sezgir
+            old, new = before[name]['min_ms'], result['min_ms']
+            ratio = new / old if old else 1.0
+            # Juda tez funksiyalarda o'lchov shovqini katta - 0.05 ms'dan kichik farq hisobga olinmaydi
+            if ratio > threshold and new - old > 0.05:
+                regressions += 1
+                print(f"  SEKIN  {size:5} {name:48} {old:9.3f} -> {new:9.3f} ms (x{ratio:.2f})")
+            elif ratio < 1 / threshold and old - new > 0.05:
+                print(f"  TEZ    {size:5} {name:48} {old:9.3f} -> {new:9.3f} ms (x{ratio:.2f})")
+    if not regressions:
+        print("  Sekinlashish yo'q")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k', help=f"vergul bilan: {', '.join(SIZES)} yoki son")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'tradecrm-bench'),
+                        help="yaratilgan bazalar saqlanadigan papka")
+    parser.add_argument('--min-runs', type=int, default=5)
+    parser.add_argument('--max-runs', type=int, default=200)
+    parser.add_argument('--budget', type=float, default=0.5, help="bitta funksiyaga vaqt, s")
+    parser.add_argument('--only', help="vergul bilan funksiya (yoki holat) nomlari")
+    parser.add_argument('--out', help='natija JSON fayli')
+    parser.add_argument('--compare', help='oldingi natija JSON fayli')
+    parser.add_argument('--threshold', type=float, default=1.25, help='sekinlashish chegarasi (min_ms nisbati)')
+    args = parser.parse_args()
+    args.only = set(args.only.split(',')) if args.only else None
+
+    missing = uncovered()
+    if missing:
+        print(f"Diqqat: benchmarkda yo'q funksiyalar: {', '.join(missing)}")
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'seed': args.seed,
+        },
+        'results': {},
+    }
+    for size in args.sizes.split(','):
+        users = SIZES.get(size.lower()) or int(size)
+        print(f"\n{size}: {users} foydalanuvchi")
+        report['results'][size] = benchmark_size(users, args)
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nNatija: {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Database ulanishlari benchmarki: har so'rovda yangi ulanish (eski usul) va pool.
+
+Ishlatish:
+    python -m benchmarks.db_pool --users 100000 --queries 20000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+
+def fill_database(db_path: str, users: int):
+    """users va subscriptions jadvallarini sintetik ma'lumot bilan to'ldiradi"""
+    from utils.db_api import database
+
+    database.init_db()
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        'INSERT INTO users (user_id, username, full_name) VALUES (?, ?, ?)',
+        ((uid, f"user{uid}", f"User {uid}") for uid in range(1, users + 1))
+    )
+    conn.executemany(
+        '''INSERT INTO subscriptions (user_id, is_active, started_at, expires_at)
+           VALUES (?, 1, CURRENT_TIMESTAMP, DATETIME('now', '+30 days'))''',
+        ((uid,) for uid in range(1, users + 1, 2))
+    )
+    conn.commit()
+    conn.close()
+
+
+def run_fresh_connections(db_path: str, user_ids):
+    """Eski get_connection(): har bir so'rov uchun connect/close"""
+    for uid in user_ids:
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute('SELECT * FROM users WHERE user_id = ?', (uid,)).fetchone()
+        conn.close()
+
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute('SELECT * FROM subscriptions WHERE user_id = ?', (uid,)).fetchone()
+        conn.close()
+
+
+def run_pooled(user_ids):
+    """Yangi get_connection(): pool orqali"""
+    from utils.db_api import database
+
+    for uid in user_ids:
+        database.get_user(uid)
+        database.get_subscription(uid)
+
+
+def measure(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=20000, help="/start'ga o'xshash so'rovlar soni")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        os.environ["DB_PATH"] = db_path
+
+        from utils.db_api import database
+        database.init_pool(db_path)
+
+        fill_database(db_path, args.users)
+        database.close_pool()
+
+        rnd = random.Random(args.seed)
+        user_ids = [rnd.randint(1, args.users) for _ in range(args.queries)]
+        total_queries = len(user_ids) * 2
+
+        before = measure(run_fresh_connections, db_path, user_ids)
+
+        database.init_pool(db_path)
+        after = measure(run_pooled, user_ids)
+        database.close_pool()
+
+    print(f"Foydalanuvchilar: {args.users}, so'rovlar: {total_queries}")
+    print(f"Oldin (connect/close):  {total_queries / before:10.0f} so'rov/s")
+    print(f"Keyin (pool):           {total_queries / after:10.0f} so'rov/s")
+    print(f"Tezlashish:             {before / after:10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
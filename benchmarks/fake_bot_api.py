@@ -0,0 +1,315 @@
+"""
+Soxta Telegram Bot API server - yuklama testlari haqiqiy Telegram'siz ishlashi uchun.
+
+Bot BOT_API_SERVER=http://127.0.0.1:8081 bilan ishga tushiriladi. Server
+getUpdates/setWebhook orqali update beradi, yuborilgan xabarlarni qabul qilib
+Telegram'ga o'xshash javob qaytaradi. Kechikish, xatolar va 429 (RetryAfter)
+qo'shish mumkin.
+
+Update'lar push() orqali (yoki alohida ishlaganda POST /_push) qo'shiladi:
+webhook o'rnatilgan bo'lsa unga yuboriladi, aks holda getUpdates kutadi.
+Statistika: GET /_stats
+
+Ishlatish:
+    python -m benchmarks.fake_bot_api --port 8081 --latency 30 --error-rate 0.01 --retry-after-rate 0.02
+"""
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import random
+import time
+
+import aiohttp
+from aiohttp import web
+
+# Bu metodlarga kechikish va xatolar qo'shilmaydi
+CONTROL_METHODS = {
+    'getUpdates', 'getMe', 'setWebhook', 'deleteWebhook', 'getWebhookInfo', 'setMyCommands',
+}
+
+# Javobi Message bo'lgan metodlar (xabar chatga "yetib boradi")
+MESSAGE_METHODS = {
+    'sendMessage', 'sendPhoto', 'sendVideo', 'sendDocument', 'copyMessage', 'forwardMessage',
+    'editMessageText', 'editMessageCaption', 'editMessageReplyMarkup',
+}
+
+BOT_USER = {'id': 123456, 'is_bot': True, 'first_name': 'Fake Bot', 'username': 'fake_bot'}
+
+
+def _chat_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class FakeBotAPI:
+    """Telegram Bot API'ning yuklama testi uchun yetarli qismi"""
+
+    def __init__(self, latency: float = 0, jitter: float = 0, error_rate: float = 0,
+                 retry_after_rate: float = 0, retry_after: int = 1, rate_limit: float = 0,
+                 webhook_connections: int = 40):
+        self.latency = latency  # soniya
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after_rate = retry_after_rate
+        self.retry_after = retry_after
+        # Telegram umumiy limiti: soniyasiga shundan ko'p xabarga 429 (0 - cheksiz)
+        self.rate_limit = rate_limit
+
+        self.webhook_url = None
+        self.webhook_secret = None
+        self._webhook_slots = asyncio.Semaphore(webhook_connections)
+        self._session = None
+
+        self._updates = collections.deque()
+        self._new_update = asyncio.Event()
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+        self._window = collections.deque()  # oxirgi soniyadagi xabarlar vaqti
+        self._listeners = {}  # chat_id -> asyncio.Queue
+
+        # getUpdates yoki setWebhook chaqirilganda - bot update qabul qilishga tayyor
+        self.ready = asyncio.Event()
+
+        self.calls = collections.Counter()
+        self.errors = 0
+        self.retry_afters = 0
+        self.delivered = 0
+
+    # ---------- update'lar ----------
+
+    async def push(self, update: dict) -> int:
+        """Update'ni botga beradi (update_id shu yerda qo'yiladi)"""
+        update['update_id'] = next(self._update_ids)
+        if self.webhook_url:
+            await self._post_webhook(update)
+        else:
+            self._updates.append(update)
+            self._new_update.set()
+        return update['update_id']
+
+    async def _post_webhook(self, update: dict):
+        headers = {'X-Telegram-Bot-Api-Secret-Token': self.webhook_secret} if self.webhook_secret else {}
+        async with self._webhook_slots:
+            try:
+                async with self._session.post(self.webhook_url, json=update, headers=headers) as response:
+                    await response.read()
+                    if response.status == 200:
+                        self.delivered += 1
+                    else:
+                        self.errors += 1
+            except aiohttp.ClientError:
+                self.errors += 1
+
+    async def _get_updates(self, params: dict):
+        offset = int(params.get('offset', 0))
+        limit = int(params.get('limit', 100))
+        timeout = float(params.get('timeout', 0))
+
+        if offset < 0:
+            # skip_updates: faqat oxirgisi
+            while len(self._updates) > 1:
+                self._updates.popleft()
+        else:
+            while self._updates and self._updates[0]['update_id'] < offset:
+                self._updates.popleft()
+
+        if not self._updates and timeout:
+            self._new_update.clear()
+            try:
+                await asyncio.wait_for(self._new_update.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        updates = list(itertools.islice(self._updates, limit))
+        self.delivered += len(updates)
+        return updates
+
+    # ---------- chiquvchi xabarlarni kuzatish ----------
+
+    def listen(self, chat_id: int) -> asyncio.Queue:
+        """chat_id'ga yuborilgan xabarlar navbati: (metod, parametrlar, vaqt)"""
+        queue = self._listeners[chat_id] = asyncio.Queue()
+        return queue
+
+    def unlisten(self, chat_id: int):
+        self._listeners.pop(chat_id, None)
+
+    # ---------- metodlar ----------
+
+    def _message(self, method: str, params: dict) -> dict:
+        message = {
+            'message_id': int(params.get('message_id') or next(self._message_ids)),
+            'date': int(time.time()),
+            'chat': {'id': _chat_id(params.get('chat_id')), 'type': 'private'},
+            'from': BOT_USER,
+        }
+        if 'text' in params:
+            message['text'] = params['text']
+        if 'caption' in params:
+            message['caption'] = params['caption']
+        if 'reply_markup' in params:
+            message['reply_markup'] = json.loads(params['reply_markup'])
+        if method == 'sendPhoto':
+            message['photo'] = [{'file_id': 'fake-photo', 'file_unique_id': 'fake-photo',
+                                 'width': 800, 'height': 600}]
+        elif method == 'sendVideo':
+            message['video'] = {'file_id': 'fake-video', 'file_unique_id': 'fake-video',
+                                'width': 1280, 'height': 720, 'duration': 60}
+        return message
+
+    async def call(self, method: str, params: dict):
+        """(status, javob) qaytaradi"""
+        self.calls[method] += 1
+
+        if method == 'getUpdates':
+            self.ready.set()
+            return 200, {'ok': True, 'result': await self._get_updates(params)}
+        if method == 'setWebhook':
+            self.webhook_url = params.get('url') or None
+            self.webhook_secret = params.get('secret_token')
+            self.ready.set()
+            return 200, {'ok': True, 'result': True}
+        if method == 'deleteWebhook':
+            self.webhook_url = None
+            if params.get('drop_pending_updates') in ('true', 'True'):
+                self._updates.clear()
+            return 200, {'ok': True, 'result': True}
+        if method == 'getMe':
+            return 200, {'ok': True, 'result': BOT_USER}
+
+        if method not in CONTROL_METHODS:
+            if self.latency or self.jitter:
+                await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+            if self._throttled() or random.random() < self.retry_after_rate:
+                self.retry_afters += 1
+                return 429, {
+                    'ok': False, 'error_code': 429,
+                    'description': f"Too Many Requests: retry after {self.retry_after}",
+                    'parameters': {'retry_after': self.retry_after},
+                }
+            if random.random() < self.error_rate:
+                self.errors += 1
+                return 500, {'ok': False, 'error_code': 500, 'description': 'Internal Server Error'}
+
+        if method in MESSAGE_METHODS:
+            result = self._message(method, params)
+            listener = self._listeners.get(result['chat']['id'])
+            if listener is not None:
+                listener.put_nowait((method, params, time.perf_counter()))
+        elif method == 'getChatMember':
+            result = {'status': 'member', 'user': {'id': int(params.get('user_id', 0)),
+                                                   'is_bot': False, 'first_name': 'User'}}
+        elif method == 'createChatInviteLink':
+            result = {'invite_link': f"https://t.me/+fake{next(self._message_ids)}", 'creator': BOT_USER,
+                      'creates_join_request': False, 'is_primary': False, 'is_revoked': False}
+        elif method == 'getWebhookInfo':
+            result = {'url': self.webhook_url or '', 'has_custom_certificate': False, 'pending_update_count': 0}
+        else:
+            # kickChatMember, unbanChatMember, answerCallbackQuery, deleteMessage, ...
+            result = True
+        return 200, {'ok': True, 'result': result}
+
+    def _throttled(self) -> bool:
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        while self._window and now - self._window[0] >= 1:
+            self._window.popleft()
+        if len(self._window) >= self.rate_limit:
+            return True
+        self._window.append(now)
+        return False
+
+    def stats(self) -> dict:
+        return {
+            'calls': dict(self.calls),
+            'delivered_updates': self.delivered,
+            'errors': self.errors,
+            'retry_afters': self.retry_afters,
+        }
+
+    # ---------- HTTP ----------
+
+    async def _handle(self, request: web.Request):
+        if request.content_type == 'application/json':
+            params = await request.json()
+        else:
+            params = {key: value for key, value in (await request.post()).items()
+                      if not isinstance(value, web.FileField)}
+        status, body = await self.call(request.match_info['method'], params)
+        return web.json_response(body, status=status)
+
+    async def _handle_push(self, request: web.Request):
+        update_id = await self.push(await request.json())
+        return web.json_response({'ok': True, 'update_id': update_id})
+
+    async def _handle_stats(self, request: web.Request):
+        return web.json_response(self.stats())
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=50 * 1024 * 1024)
+        app.router.add_post('/bot{token}/{method}', self._handle)
+        app.router.add_get('/bot{token}/{method}', self._handle)
+        app.router.add_post('/_push', self._handle_push)
+        app.router.add_get('/_stats', self._handle_stats)
+        return app
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8081) -> web.AppRunner:
+        self._session = aiohttp.ClientSession()
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+    async def close(self, runner: web.AppRunner):
+        await runner.cleanup()
+        await self._session.close()
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Server sozlamalari (yuklama skriptlari ham shularni ishlatadi)"""
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency', type=float, default=0, help="har bir so'rovga kechikish, ms")
+    parser.add_argument('--jitter', type=float, default=0, help="kechikish tebranishi, ms")
+    parser.add_argument('--error-rate', type=float, default=0, help="500 xato ulushi (0..1)")
+    parser.add_argument('--retry-after-rate', type=float, default=0, help="429 ulushi (0..1)")
+    parser.add_argument('--retry-after', type=int, default=1, help="429 javobidagi retry_after, s")
+    parser.add_argument('--rate-limit', type=float, default=0, help="xabar/s, undan ortig'iga 429 (0 - cheksiz)")
+
+
+def from_arguments(args) -> FakeBotAPI:
+    return FakeBotAPI(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        retry_after_rate=args.retry_after_rate,
+        retry_after=args.retry_after,
+        rate_limit=args.rate_limit,
+    )
+
+
+async def serve(args):
+    api = from_arguments(args)
+    runner = await api.start(port=args.port)
+    print(f"Soxta Bot API: http://127.0.0.1:{args.port} (BOT_API_SERVER)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await api.close(runner)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
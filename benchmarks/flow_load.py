@@ -0,0 +1,229 @@
+"""
+To'liq yuklama testi: soxta Bot API server (benchmarks/fake_bot_api.py) va
+minglab foydalanuvchi /start -> "💳 To'lov qilish" -> chek yuborish oqimidan o'tadi.
+
+Skript vaqtinchalik bazani narx va karta bilan to'ldiradi, botni
+BOT_API_SERVER=soxta server bilan alohida jarayonda ishga tushiradi va har
+bir qadamda update yuborilgandan botning shu chatga javobi kelguncha
+vaqtni o'lchaydi.
+
+Ishlatish:
+    python -m benchmarks.flow_load --users 2000 --concurrency 200
+    python -m benchmarks.flow_load --users 5000 --workers 4 --latency 30 --retry-after-rate 0.01
+    python -m benchmarks.flow_load --webhook --error-rate 0.005
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_bot_api import add_arguments, from_arguments
+from benchmarks.webhook_load import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_USER_ID = 100000
+
+
+class FlowFailed(Exception):
+    pass
+
+
+def seed_database(db_path: str):
+    """Oqim uchun kerakli narx va karta"""
+    os.environ["DB_PATH"] = db_path
+    from utils.db_api import database
+
+    database.init_db()
+    database.add_price(30, 100000, "1 oy")
+    database.add_card("8600 0000 0000 0000", "Test User", "Test Bank")
+    database.close_pool()
+
+
+def start_bot(args, db_path: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DB_PATH=db_path,
+        BOT_API_SERVER=f"http://127.0.0.1:{args.port}",
+        WORKERS=str(args.workers),
+        # Limiter soxta serverda o'lchovni buzmasligi uchun (haqiqiy limitni --rate-limit beradi)
+        OUTBOUND_RATE=str(args.outbound_rate),
+        OUTBOUND_CHAT_RATE=str(args.outbound_rate),
+        USE_WEBHOOK=str(args.webhook),
+        WEBHOOK_HOST=f"http://127.0.0.1:{args.webhook_port}",
+        WEBAPP_HOST='127.0.0.1',
+        WEBAPP_PORT=str(args.webhook_port),
+    )
+    output = None if args.verbose else subprocess.DEVNULL
+    return subprocess.Popen([sys.executable, 'app.py'], cwd=ROOT, env=env, stdout=output, stderr=output)
+
+
+class User:
+    """Bitta sintetik foydalanuvchi: update yuboradi va botning javobini kutadi"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, api, user_id: int, timeout: float):
+        self.api = api
+        self.user_id = user_id
+        self.timeout = timeout
+        self.user = {'id': user_id, 'is_bot': False, 'first_name': f"User {user_id}", 'username': f"user{user_id}"}
+        self.chat = {'id': user_id, 'type': 'private', 'first_name': self.user['first_name']}
+        self.replies = api.listen(user_id)
+        self.last_message = None
+
+    def message(self, **fields) -> dict:
+        return {'message': dict(message_id=next(self._ids), date=int(time.time()),
+                                chat=self.chat, **{'from': self.user}, **fields)}
+
+    def text(self, text: str) -> dict:
+        fields = {'text': text}
+        if text.startswith('/'):
+            fields['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text)}]
+        return self.message(**fields)
+
+    def photo(self) -> dict:
+        return self.message(photo=[{'file_id': f"receipt{self.user_id}", 'file_unique_id': f"r{self.user_id}",
+                                    'width': 800, 'height': 600}])
+
+    def callback(self, data: str) -> dict:
+        return {'callback_query': {'id': str(next(self._ids)), 'from': self.user, 'chat_instance': str(self.user_id),
+                                   'message': self.last_message, 'data': data}}
+
+    async def step(self, update: dict, expect) -> tuple:
+        """Update yuboradi, `expect(metod, parametrlar)` mos javobgacha kutadi"""
+        while not self.replies.empty():
+            self.replies.get_nowait()
+
+        started = time.perf_counter()
+        await self.api.push(update)
+        deadline = started + self.timeout
+        while True:
+            try:
+                method, params, at = await asyncio.wait_for(self.replies.get(), deadline - time.perf_counter())
+            except asyncio.TimeoutError:
+                raise FlowFailed()
+            if expect(method, params):
+                self.last_message = {'message_id': int(params.get('message_id', 1)), 'date': int(time.time()),
+                                     'chat': self.chat, 'text': params.get('text', '')}
+                return at - started, params
+
+
+def sent(*texts):
+    """sendMessage, matnida `texts` dan biri bor"""
+    return lambda method, params: method == 'sendMessage' and any(t in params.get('text', '') for t in texts)
+
+
+def with_button(prefix: str):
+    """Inline tugmasi `prefix` bilan boshlanadigan xabar"""
+    return lambda method, params: prefix in params.get('reply_markup', '')
+
+
+def button(params: dict, prefix: str) -> str:
+    markup = json.loads(params['reply_markup'])
+    for row in markup['inline_keyboard']:
+        for btn in row:
+            if btn.get('callback_data', '').startswith(prefix):
+                return btn['callback_data']
+    raise FlowFailed()
+
+
+async def payment_flow(user: User, latencies: dict):
+    steps = []
+
+    async def step(name, update, expect):
+        try:
+            latency, params = await user.step(update, expect)
+        except FlowFailed:
+            raise FlowFailed(name)
+        steps.append((name, latency))
+        return params
+
+    await step('start', user.text('/start'), sent('Xush kelibsiz'))
+    await step('payment_menu', user.text("💳 To'lov qilish"), sent("To'lov bo'limi"))
+    params = await step('new_payment', user.text("💰 Yangi to'lov"), with_button('select_price:'))
+    params = await step('select_price', user.callback(button(params, 'select_price:')), with_button('select_card:'))
+    await step('select_card', user.callback(button(params, 'select_card:')), sent('chekini'))
+    await step('receipt', user.photo(), sent("To'lov so'rovi yuborildi"))
+
+    for name, latency in steps:
+        latencies.setdefault(name, []).append(latency)
+
+
+async def run(args):
+    api = from_arguments(args)
+    runner = await api.start(port=args.port)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'load.db')
+        seed_database(db_path)
+        bot = start_bot(args, db_path)
+        try:
+            await asyncio.wait_for(api.ready.wait(), args.startup_timeout)
+            # Bot birinchi getUpdates'dan keyin ham handler'larni ro'yxatdan o'tkazib bo'lgan
+            await asyncio.sleep(1)
+
+            latencies = {}
+            failed = {}  # qadam -> soni
+            users = iter(range(FIRST_USER_ID, FIRST_USER_ID + args.users))
+
+            async def worker():
+                for user_id in users:
+                    user = User(api, user_id, args.timeout)
+                    try:
+                        await payment_flow(user, latencies)
+                    except FlowFailed as e:
+                        failed[e.args[0]] = failed.get(e.args[0], 0) + 1
+                    finally:
+                        api.unlisten(user_id)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+        finally:
+            bot.send_signal(signal.SIGINT)
+            bot.wait(timeout=60)
+            await api.close(runner)
+
+    return latencies, failed, elapsed, api.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=100, help="bir vaqtda oqimdagi foydalanuvchilar")
+    parser.add_argument('--workers', type=int, default=1, help='WORKERS (bot jarayonlari)')
+    parser.add_argument('--webhook', action='store_true', help='polling o\'rniga webhook')
+    parser.add_argument('--webhook-port', type=int, default=8090)
+    parser.add_argument('--outbound-rate', type=float, default=100000, help='OUTBOUND_RATE va OUTBOUND_CHAT_RATE')
+    parser.add_argument('--timeout', type=float, default=15, help='bir qadam javobini kutish, s')
+    parser.add_argument('--startup-timeout', type=float, default=60)
+    parser.add_argument('--verbose', action='store_true', help='bot loglarini ko\'rsatish')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    latencies, failed, elapsed, stats = asyncio.run(run(args))
+
+    updates = sum(len(values) for values in latencies.values())
+    completed = args.users - sum(failed.values())
+    print(f"Foydalanuvchilar: {args.users} (yakunladi: {completed}, javob kelmadi: "
+          f"{', '.join(f'{name} {count}' for name, count in failed.items()) or 0})")
+    print(f"Vaqt:             {elapsed:.2f}s")
+    print(f"Tezlik:           {updates / elapsed:.0f} update/s, {completed / elapsed:.1f} oqim/s")
+    print(f"Bot API:          {sum(stats['calls'].values())} so'rov, "
+          f"500: {stats['errors']}, 429: {stats['retry_afters']}")
+    print()
+    print(f"{'qadam':14} {'soni':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    rows = list(latencies.items()) + [('jami', list(itertools.chain.from_iterable(latencies.values())))]
+    for name, values in rows:
+        print(f"{name:14} {len(values):7} {percentile(values, 0.50) * 1000:9.1f} "
+              f"{percentile(values, 0.95) * 1000:9.1f} {percentile(values, 0.99) * 1000:9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Asosiy so'rovlarning EXPLAIN QUERY PLAN tekshiruvi.
+Migratsiyalardagi indekslar haqiqatan ishlatilayotganini tasdiqlaydi,
+aks holda xato bilan chiqadi.
+
+Ishlatish:
+    python -m benchmarks.query_plans
+"""
+import os
+import sys
+import tempfile
+
+# (nom, so'rov, parametrlar, kutilgan indeks)
+HOT_QUERIES = [
+    ("pending_payments",
+     "SELECT * FROM payments WHERE status = 'pending' ORDER BY created_at DESC", (),
+     'idx_payments_status_created'),
+    ("approved_payments",
+     "SELECT * FROM payments WHERE status = 'approved' ORDER BY approved_at DESC LIMIT 30", (),
+     'idx_payments_status_approved'),
+    ("user_payments",
+     "SELECT * FROM payments WHERE user_id = ? ORDER BY created_at DESC", (1,),
+     'idx_payments_user_created'),
+    ("all_payments",
+     "SELECT * FROM payments ORDER BY created_at DESC LIMIT 50", (),
+     'idx_payments_created'),
+    ("expiring_subscriptions",
+     "SELECT * FROM subscriptions WHERE is_active = 1 AND expires_at <= ? AND expires_at > CURRENT_TIMESTAMP",
+     ('2030-01-01',), 'idx_subscriptions_active_expires'),
+    ("expired_subscriptions",
+     "SELECT * FROM subscriptions WHERE is_active = 1 AND expires_at <= CURRENT_TIMESTAMP", (),
+     'idx_subscriptions_active_expires'),
+    ("broadcast_subscribers",
+     "SELECT s.user_id FROM subscriptions s JOIN users u ON u.user_id = s.user_id "
+     "WHERE s.is_active = 1 AND s.user_id > ? ORDER BY s.user_id LIMIT 500", (0,),
+     'idx_subscriptions_active_user'),
+    ("free_videos",
+     "SELECT * FROM videos WHERE is_free = 1 ORDER BY created_at DESC", (),
+     'idx_videos_free_created'),
+    ("active_channels",
+     "SELECT * FROM channels WHERE is_active = 1", (),
+     'idx_channels_active'),
+    ("active_prices",
+     "SELECT * FROM prices WHERE is_active = 1 ORDER BY days", (),
+     'idx_prices_active_days'),
+]
+
+# Admin qidiruvi (database.search_users) - so'rov -> kutilgan indeks
+SEARCH_INDEXES = {
+    '12345': 'INTEGER PRIMARY KEY',
+    '@abc': 'idx_users_username',
+    'abc': 'VIRTUAL TABLE INDEX',
+}
+
+# Admin ro'yxatlari sahifalari (database.PAGED_LISTS) - kursor bilan
+PAGED_INDEXES = {
+    'users': 'idx_users_registered',
+    'pay_pending': 'idx_payments_status_created',
+    'pay_all': 'idx_payments_created',
+    'pay_approved': 'idx_payments_status_approved',
+    'pay_rejected': 'idx_payments_status_created',
+    'sub_active': 'idx_subscriptions_active_expires',
+    'sub_expiring': 'idx_subscriptions_active_expires',
+    'sub_expired': 'idx_subscriptions_active_expires',
+    'sub_all': 'idx_subscriptions_expires',
+    'broadcasts': 'idx_broadcasts_created',
+}
+
+
+def explain(conn, sql, params):
+    rows = conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+    return ' | '.join(row['detail'] for row in rows)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_PATH"] = os.path.join(tmp, 'plans.db')
+
+        from utils.db_api import database
+        database.init_pool(os.environ["DB_PATH"])
+        database.init_db()
+
+        conn = database.get_connection()
+        failed = 0
+        queries = list(HOT_QUERIES)
+        for list_name, index in PAGED_INDEXES.items():
+            for backward in (False, True):
+                sql, params = database._page_query(list_name, 1, backward)
+                queries.append((f"page:{list_name}{':p' if backward else ''}", sql, params, index))
+        for query, index in SEARCH_INDEXES.items():
+            sql, params = database._search_query(query)
+            queries.append((f"search:{query}", sql, params, index))
+
+        for name, sql, params, index in queries:
+            plan = explain(conn, sql, params)
+            ok = index in plan
+            failed += not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {name:24} {plan}")
+        conn.close()
+        database.close_pool()
+
+    if failed:
+        print(f"\n{failed} ta so'rov kutilgan indeksdan foydalanmayapti")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
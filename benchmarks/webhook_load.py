@@ -0,0 +1,142 @@
+"""
+Webhook yuklama testi: yozib olingan (yoki sintetik) update'larni webhook
+manziliga POST qiladi va qabul tezligini o'lchaydi.
+
+Bot avval webhook rejimida ishga tushirilgan bo'lishi kerak (USE_WEBHOOK=True).
+Update fayli - har qatorda bitta Telegram update JSON'i (JSON Lines).
+
+Ishlatish:
+    python -m benchmarks.webhook_load --url http://127.0.0.1:8080/webhook --count 10000
+    python -m benchmarks.webhook_load --updates updates.jsonl --concurrency 100 --secret SECRET
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+import aiohttp
+
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+# Foydalanuvchilar eng ko'p bosadigan tugmalar
+MENU_TEXTS = [
+    "/start",
+    "📚 Video qo'llanmalar",
+    "📊 Obuna holati",
+    "💳 To'lov qilish",
+    "ℹ️ Bot haqida",
+]
+
+
+def synthetic_updates(count: int, users: int):
+    """Turli foydalanuvchilardan menyu xabarlari"""
+    started = int(time.time())
+    for update_id in range(1, count + 1):
+        user_id = random.randint(1, users)
+        text = random.choice(MENU_TEXTS)
+        user = {'id': user_id, 'is_bot': False, 'first_name': f"User {user_id}", 'username': f"user{user_id}"}
+        message = {
+            'message_id': update_id,
+            'from': user,
+            'chat': {'id': user_id, 'type': 'private', 'first_name': user['first_name']},
+            'date': started,
+            'text': text,
+        }
+        if text.startswith('/'):
+            message['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text)}]
+        yield {'update_id': update_id, 'message': message}
+
+
+def load_updates(path: str):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def run(url: str, updates, concurrency: int, secret: str = None):
+    headers = {SECRET_HEADER: secret} if secret else {}
+    latencies = []
+    errors = 0
+    source = iter(updates)
+
+    async def worker(session: aiohttp.ClientSession):
+        nonlocal errors
+        for update in source:
+            started = time.perf_counter()
+            try:
+                async with session.post(url, json=update, headers=headers) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors += 1
+                        continue
+            except aiohttp.ClientError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        'sent': len(latencies) + errors,
+        'ok': len(latencies),
+        'errors': errors,
+        'elapsed': elapsed,
+        'updates_per_sec': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8080/webhook')
+    parser.add_argument('--updates', help="JSON Lines fayl (berilmasa sintetik update'lar)")
+    parser.add_argument('--count', type=int, default=5000, help="sintetik update'lar soni")
+    parser.add_argument('--users', type=int, default=1000, help="sintetik foydalanuvchilar soni")
+    parser.add_argument('--repeat', type=int, default=1, help="fayldagi update'larni necha marta yuborish")
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--secret', help='WEBHOOK_SECRET')
+    parser.add_argument('--save', help="sintetik update'larni faylga yozib chiqish")
+    args = parser.parse_args()
+
+    if args.updates:
+        recorded = load_updates(args.updates)
+        updates = [
+            dict(update, update_id=update_id)
+            for update_id, update in enumerate(
+                itertools.chain.from_iterable(itertools.repeat(recorded, args.repeat)), 1
+            )
+        ]
+    else:
+        updates = list(synthetic_updates(args.count, args.users))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            for update in updates:
+                f.write(json.dumps(update, ensure_ascii=False) + '\n')
+        print(f"{len(updates)} ta update {args.save} fayliga yozildi")
+        return
+
+    result = asyncio.run(run(args.url, updates, args.concurrency, args.secret))
+
+    print(f"Yuborildi:   {result['sent']} (xato: {result['errors']})")
+    print(f"Vaqt:        {result['elapsed']:.2f}s")
+    print(f"Tezlik:      {result['updates_per_sec']:.0f} update/s")
+    print(f"Javob vaqti: p50 {result['p50_ms']:.1f}ms | p95 {result['p95_ms']:.1f}ms | p99 {result['p99_ms']:.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
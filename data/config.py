@@ -8,3 +8,51 @@ env.read_env()
 BOT_TOKEN = env.str("BOT_TOKEN")  # Bot toekn
 ADMINS = env.list("ADMINS")  # adminlar ro'yxati
 IP = env.str("ip")  # Xosting ip manzili
+
+# Reklama yuborish: Telegram umumiy limiti ~30 xabar/s, interaktiv javoblar uchun zaxira qoldiramiz
+BROADCAST_RATE = env.float("BROADCAST_RATE", 25)  # xabar/sekund
+BROADCAST_WORKERS = env.int("BROADCAST_WORKERS", 8)  # parallel yuboruvchilar soni
+
+# Muddati o'tganlarni kanaldan chiqarish (kick + unban) tezligi
+REMOVAL_RATE = env.float("REMOVAL_RATE", 20)  # so'rov/sekund
+REMOVAL_WORKERS = env.int("REMOVAL_WORKERS", 8)  # parallel ishchilar soni
+
+# FSM holatlari (SQLite storage)
+FSM_CACHE_SIZE = env.int("FSM_CACHE_SIZE", 10000)  # xotirada saqlanadigan holatlar soni
+FSM_TTL_HOURS = env.float("FSM_TTL_HOURS", 24)  # shuncha vaqt o'zgarmagan holat o'chiriladi
+
+# Obuna holati keshi (xotirada saqlanadigan foydalanuvchilar soni)
+SUBSCRIPTION_CACHE_SIZE = env.int("SUBSCRIPTION_CACHE_SIZE", 50000)
+
+# Webhook rejimi (o'chiq bo'lsa long polling ishlatiladi)
+USE_WEBHOOK = env.bool("USE_WEBHOOK", False)
+WEBHOOK_HOST = env.str("WEBHOOK_HOST", f"https://{IP}")  # Telegram murojaat qiladigan tashqi manzil
+WEBHOOK_PATH = env.str("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET = env.str("WEBHOOK_SECRET", "")  # X-Telegram-Bot-Api-Secret-Token
+WEBHOOK_URL = f"{WEBHOOK_HOST}{WEBHOOK_PATH}"
+WEBAPP_HOST = env.str("WEBAPP_HOST", "0.0.0.0")  # aiohttp server tinglaydigan manzil
+WEBAPP_PORT = env.int("WEBAPP_PORT", 8080)
+
+# Bot API manzili (bo'sh - api.telegram.org). Lokal Bot API server yoki
+# yuklama testlari uchun soxta server (benchmarks/fake_bot_api.py)
+BOT_API_SERVER = env.str("BOT_API_SERVER", "")
+
+# Chiquvchi xabarlar: barcha yuboruvchilar uchun umumiy limit (Telegram ~30 xabar/s)
+OUTBOUND_RATE = env.float("OUTBOUND_RATE", 30)  # so'rov/sekund
+OUTBOUND_CHAT_RATE = env.float("OUTBOUND_CHAT_RATE", 1)  # bitta chatga xabar/sekund
+
+# Bitta foydalanuvchining navbatda kutadigan update'lari soni (ortiqchasi tashlanadi)
+USER_QUEUE_SIZE = env.int("USER_QUEUE_SIZE", 10)
+
+# Ko'p jarayonli rejim: update'lar user_id bo'yicha WORKERS ta jarayonga taqsimlanadi (1 - o'chiq)
+WORKERS = env.int("WORKERS", 1)
+WORKER_QUEUE_SIZE = env.int("WORKER_QUEUE_SIZE", 1000)  # har bir jarayon navbatidagi update'lar
+
+# Scheduler va reklama navbati faqat ijarani olgan nusxada ishlaydi (soniya).
+# Lider kutilmaganda to'xtasa boshqa nusxa ko'pi bilan shuncha vaqtda egallaydi
+LEADER_LEASE_TTL = env.int("LEADER_LEASE_TTL", 15)
+
+# Prometheus metrikalari: http://METRICS_HOST:METRICS_PORT/metrics (0 - o'chiq).
+# Ko'p jarayonli rejimda har bir worker METRICS_PORT + raqami portida
+METRICS_HOST = env.str("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = env.int("METRICS_PORT", 0)
@@ -6,13 +6,7 @@ from data.config import ADMINS
 from states.states import (
     AdminCardStates, AdminChannelStates, AdminVideoStates, AdminPriceStates
 )
-from utils.db_api.database import (
-    add_card, get_all_cards, get_card, toggle_card, delete_card,
-    add_channel, get_all_channels, get_channel, toggle_channel, delete_channel,
-    update_channel_link, add_video, get_all_videos, get_video, delete_video,
-    toggle_video_free, add_price, get_all_prices, get_price, delete_price,
-    toggle_price
-)
+from utils.db_api import db
 from keyboards.default.keyboards import (
     admin_menu_keyboard, admin_cards_keyboard, admin_channels_keyboard,
     admin_videos_keyboard, admin_prices_keyboard, cancel_keyboard,
@@ -81,7 +75,7 @@ async def enter_bank_name(message: types.Message, state: FSMContext):
     
     data = await state.get_data()
     
-    card_id = add_card(
+    card_id = await db.add_card(
         card_number=data['card_number'],
         card_holder=data['card_holder'],
         bank_name=bank
@@ -105,7 +99,7 @@ async def all_cards(message: types.Message):
     if not is_admin(message.from_user.id):
         return
     
-    cards = get_all_cards()
+    cards = await db.get_all_cards()
     
     if not cards:
         await message.answer("💳 Kartalar yo'q", reply_markup=admin_cards_keyboard())
@@ -129,9 +123,9 @@ async def toggle_card_callback(call: types.CallbackQuery):
         return
     
     card_id = int(call.data.split(":")[1])
-    toggle_card(card_id)
+    await db.toggle_card(card_id)
     
-    card = get_card(card_id)
+    card = await db.get_card(card_id)
     status = "🟢 Faol" if card['is_active'] else "🔴 O'chirilgan"
     
     await call.message.edit_text(
@@ -152,7 +146,7 @@ async def delete_card_callback(call: types.CallbackQuery):
         return
     
     card_id = int(call.data.split(":")[1])
-    delete_card(card_id)
+    await db.delete_card(card_id)
     
     await call.message.edit_text("🗑 Karta o'chirildi!")
     await call.answer()
@@ -202,7 +196,7 @@ async def enter_invite_link(message: types.Message, state: FSMContext):
     """Kanal havolasini qabul qilish"""
     data = await state.get_data()
     
-    add_channel(
+    await db.add_channel(
         channel_id=data['channel_id'],
         channel_name=data['channel_name'],
         invite_link=message.text
@@ -225,7 +219,7 @@ async def all_channels(message: types.Message):
     if not is_admin(message.from_user.id):
         return
     
-    channels = get_all_channels()
+    channels = await db.get_all_channels()
     
     if not channels:
         await message.answer("📺 Kanallar yo'q", reply_markup=admin_channels_keyboard())
@@ -248,9 +242,9 @@ async def toggle_channel_callback(call: types.CallbackQuery):
         return
     
     channel_id = int(call.data.split(":")[1])
-    toggle_channel(channel_id)
+    await db.toggle_channel(channel_id)
     
-    channel = get_channel(channel_id)
+    channel = await db.get_channel(channel_id)
     status = "🟢 Faol" if channel['is_active'] else "🔴 O'chirilgan"
     
     await call.message.edit_text(
@@ -282,7 +276,7 @@ async def edit_channel_link_save(message: types.Message, state: FSMContext):
     data = await state.get_data()
     channel_id = data['edit_channel_id']
     
-    update_channel_link(channel_id, message.text)
+    await db.update_channel_link(channel_id, message.text)
     await state.finish()
     
     await message.answer("✅ Havola yangilandi!", reply_markup=admin_channels_keyboard())
@@ -294,7 +288,7 @@ async def delete_channel_callback(call: types.CallbackQuery):
         return
     
     channel_id = int(call.data.split(":")[1])
-    delete_channel(channel_id)
+    await db.delete_channel(channel_id)
     
     await call.message.edit_text("🗑 Kanal o'chirildi!")
     await call.answer()
@@ -371,7 +365,7 @@ async def select_video_type(call: types.CallbackQuery, state: FSMContext):
     
     data = await state.get_data()
     
-    video_id = add_video(
+    video_id = await db.add_video(
         name=data['video_name'],
         file_id=data['file_id'],
         description=data['description'],
@@ -398,7 +392,7 @@ async def all_videos(message: types.Message):
     if not is_admin(message.from_user.id):
         return
     
-    videos = get_all_videos()
+    videos = await db.get_all_videos()
     
     if not videos:
         await message.answer("🎬 Videolar yo'q", reply_markup=admin_videos_keyboard())
@@ -421,9 +415,9 @@ async def toggle_video_free_callback(call: types.CallbackQuery):
         return
     
     video_id = int(call.data.split(":")[1])
-    toggle_video_free(video_id)
+    await db.toggle_video_free(video_id)
     
-    video = get_video(video_id)
+    video = await db.get_video(video_id)
     type_text = "🆓 Bepul" if video['is_free'] else "💰 Premium"
     
     await call.message.edit_text(
@@ -443,7 +437,7 @@ async def preview_video(call: types.CallbackQuery):
         return
     
     video_id = int(call.data.split(":")[1])
-    video = get_video(video_id)
+    video = await db.get_video(video_id)
     
     if video:
         await bot.send_video(call.from_user.id, video['file_id'], caption=f"📹 {video['name']}")
@@ -456,7 +450,7 @@ async def delete_video_callback(call: types.CallbackQuery):
         return
     
     video_id = int(call.data.split(":")[1])
-    delete_video(video_id)
+    await db.delete_video(video_id)
     
     await call.message.edit_text("🗑 Video o'chirildi!")
     await call.answer()
@@ -524,7 +518,7 @@ async def enter_price_description(message: types.Message, state: FSMContext):
     
     data = await state.get_data()
     
-    add_price(
+    await db.add_price(
         days=data['days'],
         price=data['price'],
         description=description
@@ -547,7 +541,7 @@ async def all_prices(message: types.Message):
     if not is_admin(message.from_user.id):
         return
     
-    prices = get_all_prices()
+    prices = await db.get_all_prices()
     
     if not prices:
         await message.answer("💵 Narxlar yo'q", reply_markup=admin_prices_keyboard())
@@ -570,9 +564,9 @@ async def toggle_price_callback(call: types.CallbackQuery):
         return
     
     price_id = int(call.data.split(":")[1])
-    toggle_price(price_id)
+    await db.toggle_price(price_id)
     
-    price = get_price(price_id)
+    price = await db.get_price(price_id)
     status = "🟢 Faol" if price['is_active'] else "🔴 O'chirilgan"
     
     await call.message.edit_text(
@@ -592,7 +586,7 @@ async def delete_price_callback(call: types.CallbackQuery):
         return
     
     price_id = int(call.data.split(":")[1])
-    delete_price(price_id)
+    await db.delete_price(price_id)
     
     await call.message.edit_text("🗑 Narx o'chirildi!")
     await call.answer()
@@ -6,13 +6,9 @@ from datetime import datetime
 from loader import dp, bot
 from data.config import ADMINS
 from states.states import AdminPaymentStates, AdminNotifyStates
-from utils.db_api.database import (
-    get_statistics, get_pending_payments, get_payment, approve_payment,
-    reject_payment, get_all_payments, get_user, get_active_channels,
-    get_subscription, mark_channel_joined, get_expiring_subscriptions,
-    get_expired_subscriptions, get_active_subscriptions, deactivate_subscription,
-    update_last_notified, get_connection
-)
+from utils.db_api import db
+from utils.subscription_cache import subscription_cache
+from utils.pagination import PAGE_PREFIX, paged_list, parse_page_callback, show_page, send_page
 from keyboards.default.keyboards import (
     admin_menu_keyboard, admin_payments_keyboard, admin_subscriptions_keyboard,
     payment_action_keyboard, subscription_action_keyboard, channel_link_keyboard,
@@ -33,7 +29,9 @@ async def admin_statistics(message: types.Message):
     if not is_admin(message.from_user.id):
         return
 
-    stats = get_statistics()
+    stats = await db.get_statistics()
+    week = await db.get_daily_stats(7)
+    cache = subscription_cache.stats()
 
     text = f"""📊 <b>Statistika</b>
 
@@ -51,7 +49,13 @@ async def admin_statistics(message: types.Message):
 
 💰 <b>Daromad:</b>
 ├ Jami: {stats['total_revenue']:,.0f} so'm
-└ Bu oy: {stats['month_revenue']:,.0f} so'm"""
+├ Bu oy: {stats['month_revenue']:,.0f} so'm
+├ 7 kun: {sum(day['revenue'] for day in week):,.0f} so'm
+└ Bugun: {stats['today_revenue']:,.0f} so'm
+
+⚡️ <b>Obuna keshi:</b>
+├ Hajmi: {cache['size']}/{cache['max_size']}
+└ Hit: {cache['hit_rate']:.0%} ({cache['hits']}/{cache['hits'] + cache['misses']})"""
 
     await message.answer(text, reply_markup=admin_menu_keyboard())
 
@@ -76,18 +80,26 @@ async def pending_payments(message: types.Message):
     if not is_admin(message.from_user.id):
         return
 
-    payments = get_pending_payments()
+    await show_page(message, 'pay_pending')
 
-    if not payments:
+
+@paged_list('pay_pending', per_page=5)
+async def render_pending_payments(message: types.Message, page, nav, edit):
+    if not page['items']:
         await message.answer(
             "✅ Kutayotgan to'lovlar yo'q",
             reply_markup=admin_payments_keyboard()
         )
         return
 
-    await message.answer(f"⏳ <b>Kutayotgan to'lovlar:</b> {len(payments)} ta")
+    # Eski sahifa tugmalarini olib tashlaymiz, yangi cheklar pastga yuboriladi
+    if edit:
+        await message.edit_reply_markup(None)
+    else:
+        stats = await db.get_statistics()
+        await message.answer(f"⏳ <b>Kutayotgan to'lovlar:</b> {stats['pending_payments']} ta")
 
-    for payment in payments[:20]:
+    for payment in page['items']:
         text = f"""📋 <b>To'lov #{payment['id']}</b>
 
 👤 {payment['full_name']}
@@ -99,7 +111,7 @@ async def pending_payments(message: types.Message):
 
         if payment['receipt_photo']:
             await bot.send_photo(
-                message.from_user.id,
+                message.chat.id,
                 payment['receipt_photo'],
                 caption=text,
                 reply_markup=payment_action_keyboard(payment['id'])
@@ -107,6 +119,9 @@ async def pending_payments(message: types.Message):
         else:
             await message.answer(text, reply_markup=payment_action_keyboard(payment['id']))
 
+    if nav:
+        await message.answer("⏳ Boshqa to'lovlar:", reply_markup=nav)
+
 
 @dp.message_handler(text="📋 Barcha to'lovlar")
 async def all_payments(message: types.Message):
@@ -114,9 +129,12 @@ async def all_payments(message: types.Message):
     if not is_admin(message.from_user.id):
         return
 
-    payments = get_all_payments(50)
+    await show_page(message, 'pay_all')
+
 
-    if not payments:
+@paged_list('pay_all')
+async def render_all_payments(message: types.Message, page, nav, edit):
+    if not page['items']:
         await message.answer("📋 To'lovlar yo'q", reply_markup=admin_payments_keyboard())
         return
 
@@ -126,14 +144,14 @@ async def all_payments(message: types.Message):
         'rejected': '❌'
     }
 
-    text = "📋 <b>Oxirgi 50 ta to'lov:</b>\n\n"
+    text = "📋 <b>Barcha to'lovlar:</b>\n\n"
 
-    for payment in payments:
+    for payment in page['items']:
         emoji = status_emoji.get(payment['status'], '❓')
         date = payment['created_at'][:10] if payment['created_at'] else '-'
         text += f"{emoji} #{payment['id']} | {payment['full_name'][:15]} | {payment['amount']:,.0f} | {date}\n"
 
-    await message.answer(text, reply_markup=admin_payments_keyboard())
+    await send_page(message, text, nav, edit)
 
 
 @dp.message_handler(text="✅ Tasdiqlangan to'lovlar")
@@ -142,30 +160,22 @@ async def approved_payments(message: types.Message):
     if not is_admin(message.from_user.id):
         return
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT p.*, u.username, u.full_name 
-        FROM payments p 
-        JOIN users u ON p.user_id = u.user_id 
-        WHERE p.status = 'approved'
-        ORDER BY p.approved_at DESC
-        LIMIT 30
-    ''')
-    payments = cursor.fetchall()
-    conn.close()
-
-    if not payments:
+    await show_page(message, 'pay_approved')
+
+
+@paged_list('pay_approved')
+async def render_approved_payments(message: types.Message, page, nav, edit):
+    if not page['items']:
         await message.answer("✅ Tasdiqlangan to'lovlar yo'q", reply_markup=admin_payments_keyboard())
         return
 
     text = "✅ <b>Tasdiqlangan to'lovlar:</b>\n\n"
 
-    for payment in payments:
+    for payment in page['items']:
         date = payment['approved_at'][:10] if payment['approved_at'] else '-'
         text += f"#{payment['id']} | {payment['full_name'][:15]} | {payment['amount']:,.0f} | {date}\n"
 
-    await message.answer(text, reply_markup=admin_payments_keyboard())
+    await send_page(message, text, nav, edit)
 
 
 @dp.message_handler(text="❌ Rad etilgan to'lovlar")
@@ -174,31 +184,37 @@ async def rejected_payments(message: types.Message):
     if not is_admin(message.from_user.id):
         return
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT p.*, u.username, u.full_name 
-        FROM payments p 
-        JOIN users u ON p.user_id = u.user_id 
-        WHERE p.status = 'rejected'
-        ORDER BY p.created_at DESC
-        LIMIT 30
-    ''')
-    payments = cursor.fetchall()
-    conn.close()
-
-    if not payments:
+    await show_page(message, 'pay_rejected')
+
+
+@paged_list('pay_rejected')
+async def render_rejected_payments(message: types.Message, page, nav, edit):
+    if not page['items']:
         await message.answer("❌ Rad etilgan to'lovlar yo'q", reply_markup=admin_payments_keyboard())
         return
 
     text = "❌ <b>Rad etilgan to'lovlar:</b>\n\n"
 
-    for payment in payments:
+    for payment in page['items']:
         date = payment['created_at'][:10] if payment['created_at'] else '-'
         note = f" ({payment['admin_note'][:20]}...)" if payment['admin_note'] else ""
         text += f"#{payment['id']} | {payment['full_name'][:15]} | {payment['amount']:,.0f} | {date}{note}\n"
 
-    await message.answer(text, reply_markup=admin_payments_keyboard())
+    await send_page(message, text, nav, edit)
+
+
+# ============ SAHIFALASH ============
+
+@dp.callback_query_handler(text_startswith=f"{PAGE_PREFIX}:")
+async def page_callback(call: types.CallbackQuery):
+    """Admin ro'yxatlarida ◀️ ▶️ tugmalari"""
+    if not is_admin(call.from_user.id):
+        await call.answer("⛔ Sizda ruxsat yo'q", show_alert=True)
+        return
+
+    list_name, cursor_id, backward = parse_page_callback(call.data)
+    await show_page(call.message, list_name, cursor_id, backward, edit=True)
+    await call.answer()
 
 
 # ============ TO'LOV CALLBACK'LARI ============
@@ -211,7 +227,7 @@ async def approve_payment_callback(call: types.CallbackQuery):
         return
 
     payment_id = int(call.data.split(":")[1])
-    payment = approve_payment(payment_id)
+    payment = await db.approve_payment(payment_id)
 
     if not payment:
         await call.answer("❌ To'lov topilmadi", show_alert=True)
@@ -227,7 +243,7 @@ async def approve_payment_callback(call: types.CallbackQuery):
     )
 
     # Foydalanuvchiga xabar yuborish
-    channels = get_active_channels()
+    channels = await db.get_active_channels()
 
     user_text = f"""🎉 <b>To'lovingiz tasdiqlandi!</b>
 
@@ -277,8 +293,8 @@ async def reject_payment_reason(message: types.Message, state: FSMContext):
 
     reason = None if message.text.lower() == 'skip' else message.text
 
-    payment = get_payment(payment_id)
-    reject_payment(payment_id, reason)
+    payment = await db.get_payment(payment_id)
+    await db.reject_payment(payment_id, reason)
 
     await state.finish()
 
@@ -307,16 +323,16 @@ async def view_user_from_payment(call: types.CallbackQuery):
         return
 
     payment_id = int(call.data.split(":")[1])
-    payment = get_payment(payment_id)
+    payment = await db.get_payment(payment_id)
 
     if not payment:
         await call.answer("❌ Topilmadi", show_alert=True)
         return
 
-    user = get_user(payment['user_id'])
-    subscription = get_subscription(payment['user_id'])
+    user = await db.get_user(payment['user_id'])
+    is_subscribed = await subscription_cache.is_active(payment['user_id'])
 
-    sub_status = "✅ Faol" if subscription and subscription['is_active'] else "❌ Faol emas"
+    sub_status = "✅ Faol" if is_subscribed else "❌ Faol emas"
 
     text = f"""👤 <b>Foydalanuvchi ma'lumotlari:</b>
 
@@ -352,19 +368,23 @@ async def active_subscriptions(message: types.Message):
     if not is_admin(message.from_user.id):
         return
 
-    subs = get_active_subscriptions()
+    await show_page(message, 'sub_active')
 
-    if not subs:
+
+@paged_list('sub_active')
+async def render_active_subscriptions(message: types.Message, page, nav, edit):
+    if not page['items']:
         await message.answer("✅ Faol obunalar yo'q", reply_markup=admin_subscriptions_keyboard())
         return
 
-    text = f"✅ <b>Faol obunalar:</b> {len(subs)} ta\n\n"
+    stats = await db.get_statistics()
+    text = f"✅ <b>Faol obunalar:</b> {stats['active_subscriptions']} ta\n\n"
 
-    for sub in subs[:30]:
+    for sub in page['items']:
         expires = sub['expires_at'][:10] if sub['expires_at'] else '-'
         text += f"👤 {sub['full_name'][:15]} | Tugashi: {expires}\n"
 
-    await message.answer(text, reply_markup=admin_subscriptions_keyboard())
+    await send_page(message, text, nav, edit)
 
 
 @dp.message_handler(text="⚠️ Tugayotgan obunalar")
@@ -373,15 +393,22 @@ async def expiring_subscriptions(message: types.Message):
     if not is_admin(message.from_user.id):
         return
 
-    subs = get_expiring_subscriptions(3)
+    await show_page(message, 'sub_expiring')
+
 
-    if not subs:
+@paged_list('sub_expiring', per_page=5)
+async def render_expiring_subscriptions(message: types.Message, page, nav, edit):
+    if not page['items']:
         await message.answer("⚠️ 3 kun ichida tugaydigan obunalar yo'q", reply_markup=admin_subscriptions_keyboard())
         return
 
-    await message.answer(f"⚠️ <b>3 kun ichida tugaydigan obunalar:</b> {len(subs)} ta")
+    if edit:
+        await message.edit_reply_markup(None)
+    else:
+        stats = await db.get_statistics()
+        await message.answer(f"⚠️ <b>3 kun ichida tugaydigan obunalar:</b> {stats['expiring_soon']} ta")
 
-    for sub in subs:
+    for sub in page['items']:
         expires = sub['expires_at'][:10] if sub['expires_at'] else '-'
         text = f"""⚠️ <b>Obuna tugayapti!</b>
 
@@ -392,6 +419,9 @@ async def expiring_subscriptions(message: types.Message):
 
         await message.answer(text, reply_markup=subscription_action_keyboard(sub['user_id']))
 
+    if nav:
+        await message.answer("⚠️ Boshqa obunalar:", reply_markup=nav)
+
 
 @dp.message_handler(text="❌ O'tgan obunalar")
 async def expired_subscriptions(message: types.Message):
@@ -399,15 +429,21 @@ async def expired_subscriptions(message: types.Message):
     if not is_admin(message.from_user.id):
         return
 
-    subs = get_expired_subscriptions()
+    await show_page(message, 'sub_expired')
 
-    if not subs:
+
+@paged_list('sub_expired', per_page=5)
+async def render_expired_subscriptions(message: types.Message, page, nav, edit):
+    if not page['items']:
         await message.answer("❌ Muddati o'tgan obunalar yo'q", reply_markup=admin_subscriptions_keyboard())
         return
 
-    await message.answer(f"❌ <b>Muddati o'tgan obunalar:</b> {len(subs)} ta")
+    if edit:
+        await message.edit_reply_markup(None)
+    else:
+        await message.answer("❌ <b>Muddati o'tgan obunalar:</b>")
 
-    for sub in subs[:20]:
+    for sub in page['items']:
         expires = sub['expires_at'][:10] if sub['expires_at'] else '-'
         text = f"""❌ <b>Obuna tugagan!</b>
 
@@ -417,6 +453,9 @@ async def expired_subscriptions(message: types.Message):
 
         await message.answer(text, reply_markup=subscription_action_keyboard(sub['user_id']))
 
+    if nav:
+        await message.answer("❌ Boshqa obunalar:", reply_markup=nav)
+
 
 @dp.message_handler(text="📋 Barcha obunalar")
 async def all_subscriptions(message: types.Message):
@@ -424,31 +463,24 @@ async def all_subscriptions(message: types.Message):
     if not is_admin(message.from_user.id):
         return
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT s.*, u.full_name, u.username 
-        FROM subscriptions s 
-        JOIN users u ON s.user_id = u.user_id 
-        ORDER BY s.expires_at DESC 
-        LIMIT 50
-    ''')
-    subs = cursor.fetchall()
-    conn.close()
-
-    if not subs:
+    await show_page(message, 'sub_all')
+
+
+@paged_list('sub_all')
+async def render_all_subscriptions(message: types.Message, page, nav, edit):
+    if not page['items']:
         await message.answer("📋 Obunalar yo'q", reply_markup=admin_subscriptions_keyboard())
         return
 
-    text = f"📋 <b>Barcha obunalar:</b> {len(subs)} ta\n\n"
+    text = "📋 <b>Barcha obunalar:</b>\n\n"
 
-    for sub in subs:
+    for sub in page['items']:
         status = "✅" if sub['is_active'] else "❌"
         expires = sub['expires_at'][:10] if sub['expires_at'] else '-'
         name = sub['full_name'][:15] if sub['full_name'] else '-'
         text += f"{status} {name} | {expires}\n"
 
-    await message.answer(text, reply_markup=admin_subscriptions_keyboard())
+    await send_page(message, text, nav, edit)
 
 
 @dp.callback_query_handler(text_startswith="notify_user:")
@@ -487,7 +519,7 @@ async def deactivate_subscription_callback(call: types.CallbackQuery):
         return
 
     user_id = int(call.data.split(":")[1])
-    deactivate_subscription(user_id)
+    await db.deactivate_subscription(user_id)
 
     await call.message.edit_text(
         call.message.text + "\n\n❌ <b>Obuna o'chirildi</b>"
@@ -503,17 +535,12 @@ async def broadcast_history(message: types.Message):
     if not is_admin(message.from_user.id):
         return
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT * FROM broadcasts 
-        ORDER BY created_at DESC 
-        LIMIT 20
-    ''')
-    broadcasts = cursor.fetchall()
-    conn.close()
-
-    if not broadcasts:
+    await show_page(message, 'broadcasts')
+
+
+@paged_list('broadcasts')
+async def render_broadcast_history(message: types.Message, page, nav, edit):
+    if not page['items']:
         await message.answer("📊 Reklama tarixi bo'sh", reply_markup=admin_broadcast_keyboard())
         return
 
@@ -523,13 +550,21 @@ async def broadcast_history(message: types.Message):
         'non_subscribers': '❌ Obunasizlar'
     }
 
-    text = "📊 <b>Oxirgi 20 ta reklama:</b>\n\n"
+    text = "📊 <b>Reklama tarixi:</b>\n\n"
+
+    status_emoji = {
+        'pending': '🕐',
+        'running': '📤',
+        'done': '✅',
+        'failed': '⚠️'
+    }
 
-    for b in broadcasts:
+    for b in page['items']:
         date = b['created_at'][:16] if b['created_at'] else '-'
         target = target_names.get(b['target'], b['target'])
-        success = b['success_count'] or 0
-        fail = b['fail_count'] or 0
-        text += f"📅 {date}\n   {target} | ✅{success} ❌{fail}\n\n"
+        status = status_emoji.get(b['status'], '❓')
+        success = b['sent_count'] or 0
+        fail = b['failed_count'] or 0
+        text += f"{status} {date}\n   {target} | ✅{success} ❌{fail} / {b['total_count'] or 0}\n\n"
 
-    await message.answer(text, reply_markup=admin_broadcast_keyboard())
\ No newline at end of file
+    await send_page(message, text, nav, edit)
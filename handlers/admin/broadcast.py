@@ -1,17 +1,15 @@
-import asyncio
 from aiogram import types
 from aiogram.dispatcher import FSMContext
 
 from loader import dp, bot
 from data.config import ADMINS
-from states.states import AdminBroadcastStates
-from utils.db_api.database import (
-    get_all_users, get_active_subscriptions, get_subscription,
-    set_setting, get_setting
-)
+from states.states import AdminBroadcastStates, AdminUserSearchStates
+from utils.db_api import db
+from utils.broadcast_jobs import wake_broadcast_worker
+from utils.pagination import paged_list, show_page, send_page
 from keyboards.default.keyboards import (
     admin_menu_keyboard, admin_broadcast_keyboard, cancel_keyboard,
-    broadcast_target_keyboard, broadcast_confirm_keyboard
+    broadcast_target_keyboard, broadcast_confirm_keyboard, users_list_keyboard
 )
 
 def is_admin(user_id):
@@ -148,58 +146,25 @@ async def enter_broadcast_video(message: types.Message, state: FSMContext):
 
 @dp.callback_query_handler(text="confirm_broadcast", state=AdminBroadcastStates.confirm_broadcast)
 async def confirm_broadcast(call: types.CallbackQuery, state: FSMContext):
-    """Reklamani yuborish"""
+    """Reklamani navbatga qo'shish"""
     data = await state.get_data()
-    target = data['target']
-    broadcast_type = data['broadcast_type']
-    
-    # Maqsadli foydalanuvchilarni olish
-    all_users = get_all_users()
-    
-    if target == 'all':
-        users = all_users
-    elif target == 'subscribers':
-        users = [u for u in all_users if get_subscription(u['user_id']) and get_subscription(u['user_id'])['is_active']]
-    else:  # non_subscribers
-        users = [u for u in all_users if not get_subscription(u['user_id']) or not get_subscription(u['user_id'])['is_active']]
-    
-    await call.message.edit_text(f"📤 Yuborilmoqda... (0/{len(users)})")
-    
-    sent = 0
-    failed = 0
-    
-    for user in users:
-        try:
-            if broadcast_type == 'text':
-                await bot.send_message(user['user_id'], data['message_text'])
-            elif broadcast_type == 'photo':
-                await bot.send_photo(user['user_id'], data['photo_id'], caption=data.get('caption', ''))
-            else:
-                await bot.send_video(user['user_id'], data['video_id'], caption=data.get('caption', ''))
-            
-            sent += 1
-        except Exception as e:
-            failed += 1
-        
-        # Har 20 ta xabardan keyin yangilash
-        if (sent + failed) % 20 == 0:
-            try:
-                await call.message.edit_text(f"📤 Yuborilmoqda... ({sent + failed}/{len(users)})")
-            except:
-                pass
-        
-        await asyncio.sleep(0.05)  # Flood limitdan himoya
     
     await state.finish()
-    
-    await call.message.edit_text(
-        f"""✅ <b>Reklama yuborildi!</b>
-
-👥 Jami: {len(users)}
-✅ Yuborildi: {sent}
-❌ Xato: {failed}"""
+    await call.message.edit_text("📤 Reklama navbatga qo'shildi, yuborish boshlanmoqda...")
+    
+    # Vazifa bazaga yoziladi: bot qayta ishga tushsa ham yuborish davom etadi
+    await db.create_broadcast(
+        broadcast_type=data['broadcast_type'],
+        target=data['target'],
+        message_text=data.get('message_text'),
+        photo_id=data.get('photo_id'),
+        video_id=data.get('video_id'),
+        caption=data.get('caption'),
+        admin_chat_id=call.message.chat.id,
+        progress_message_id=call.message.message_id
     )
-    await call.message.answer("📢 Reklama menyusi:", reply_markup=admin_broadcast_keyboard())
+    wake_broadcast_worker()
+    await call.answer()
 
 @dp.callback_query_handler(text="cancel_broadcast", state=AdminBroadcastStates.confirm_broadcast)
 async def cancel_broadcast(call: types.CallbackQuery, state: FSMContext):
@@ -216,19 +181,57 @@ async def admin_users(message: types.Message):
     if not is_admin(message.from_user.id):
         return
     
-    users = get_all_users()
-    
-    text = f"👥 <b>Foydalanuvchilar:</b> {len(users)} ta\n\n"
-    
-    # Oxirgi 20 ta foydalanuvchi
-    for user in users[:20]:
-        subscription = get_subscription(user['user_id'])
-        sub_status = "✅" if subscription and subscription['is_active'] else "❌"
-        text += f"{sub_status} {user['full_name'][:20]} | @{user['username'] or '-'}\n"
-    
-    if len(users) > 20:
-        text += f"\n... va yana {len(users) - 20} ta"
-    
+    await show_page(message, 'users')
+
+
+def user_line(user) -> str:
+    sub_status = "✅" if user['is_active'] else "❌"
+    return f"{sub_status} <code>{user['user_id']}</code> {(user['full_name'] or '-')[:20]} | @{user['username'] or '-'}\n"
+
+
+@paged_list('users', id_field='user_id')
+async def render_users(message: types.Message, page, nav, edit):
+    # Obuna holati sahifa so'rovining o'zida (LEFT JOIN) keladi
+    stats = await db.get_statistics()
+    text = f"👥 <b>Foydalanuvchilar:</b> {stats['total_users']} ta\n\n"
+    text += ''.join(user_line(user) for user in page['items'])
+
+    if not page['items']:
+        await message.answer(text, reply_markup=admin_menu_keyboard())
+        return
+
+    await send_page(message, text, users_list_keyboard(nav), edit)
+
+
+@dp.callback_query_handler(text="search_users")
+async def search_users_start(call: types.CallbackQuery):
+    """Foydalanuvchi qidirish"""
+    if not is_admin(call.from_user.id):
+        return
+
+    await call.message.answer(
+        "🔍 <b>Foydalanuvchi qidirish</b>\n\n"
+        "ID, @username yoki ism (bir qismi) kiriting:",
+        reply_markup=cancel_keyboard()
+    )
+    await AdminUserSearchStates.enter_query.set()
+    await call.answer()
+
+
+@dp.message_handler(state=AdminUserSearchStates.enter_query)
+async def search_users_result(message: types.Message, state: FSMContext):
+    """Qidiruv natijalari"""
+    await state.finish()
+
+    query = (message.text or '').strip()
+    users = await db.search_users(query) if query.lstrip('@') else []
+
+    if not users:
+        await message.answer("🔍 Hech narsa topilmadi", reply_markup=admin_menu_keyboard())
+        return
+
+    text = f"🔍 <b>Natijalar:</b> {len(users)} ta\n\n"
+    text += ''.join(user_line(user) for user in users)
     await message.answer(text, reply_markup=admin_menu_keyboard())
 
 # ============ SOZLAMALAR ============
@@ -260,7 +263,7 @@ async def edit_about_start(call: types.CallbackQuery, state: FSMContext):
     if not is_admin(call.from_user.id):
         return
     
-    current = get_setting('about_text')
+    current = await db.get_setting('about_text')
     
     await call.message.answer(
         f"📝 <b>Joriy 'Bot haqida' matni:</b>\n\n{current or 'Ornatilmagan'}\n\n"
@@ -273,7 +276,7 @@ async def edit_about_start(call: types.CallbackQuery, state: FSMContext):
 @dp.message_handler(state="edit_about_text")
 async def edit_about_save(message: types.Message, state: FSMContext):
     """Bot haqida matnini saqlash"""
-    set_setting('about_text', message.text)
+    await db.set_setting('about_text', message.text)
     await state.finish()
     await message.answer("✅ 'Bot haqida' matni yangilandi!", reply_markup=admin_menu_keyboard())
 
@@ -283,7 +286,7 @@ async def edit_support_start(call: types.CallbackQuery, state: FSMContext):
     if not is_admin(call.from_user.id):
         return
     
-    current = get_setting('support_info')
+    current = await db.get_setting('support_info')
     
     await call.message.answer(
         f"📞 <b>Joriy aloqa ma'lumotlari:</b>\n\n{current or 'Ornatilmagan'}\n\n"
@@ -296,7 +299,7 @@ async def edit_support_start(call: types.CallbackQuery, state: FSMContext):
 @dp.message_handler(state="edit_support_info")
 async def edit_support_save(message: types.Message, state: FSMContext):
     """Aloqa ma'lumotlarini saqlash"""
-    set_setting('support_info', message.text)
+    await db.set_setting('support_info', message.text)
     await state.finish()
     await message.answer("✅ Aloqa ma'lumotlari yangilandi!", reply_markup=admin_menu_keyboard())
 
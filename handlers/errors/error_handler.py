@@ -6,6 +6,7 @@ from aiogram.utils.exceptions import (Unauthorized, InvalidQueryID, TelegramAPIE
 
 
 from loader import dp
+from utils.metrics import metrics
 
 
 @dp.errors_handler()
@@ -17,6 +18,7 @@ async def errors_handler(update, exception):
     :param exception:
     :return: stdout logging
     """
+    metrics.error(update, exception)
 
     if isinstance(exception, CantDemoteChatCreator):
         logging.exception("Can't demote chat creator")
@@ -5,14 +5,12 @@ from datetime import datetime
 from loader import dp, bot
 from data.config import ADMINS
 from states.states import PaymentStates
-from utils.db_api.database import (
-    get_active_prices, get_active_cards, get_card, get_price,
-    add_payment, get_user_payments, get_subscription, get_active_channels,
-    mark_channel_joined
-)
+from utils.db_api import db, writes
+from utils.catalog import catalog
+from utils.subscription_cache import subscription_cache
+from utils.outbound import outbound_lane, ADMIN
 from keyboards.default.keyboards import (
-    main_menu_keyboard, payment_menu_keyboard, back_keyboard,
-    prices_inline_keyboard, cards_inline_keyboard, confirm_payment_keyboard,
+    main_menu_keyboard, payment_menu_keyboard, back_keyboard, confirm_payment_keyboard,
     channel_link_keyboard, cancel_keyboard
 )
 
@@ -28,7 +26,7 @@ async def payment_menu(message: types.Message):
 @dp.message_handler(text="💰 Yangi to'lov")
 async def new_payment(message: types.Message):
     """Yangi to'lov boshlash"""
-    prices = get_active_prices()
+    prices = await catalog.active_prices()
     
     if not prices:
         await message.answer(
@@ -41,7 +39,7 @@ async def new_payment(message: types.Message):
     await message.answer(
         "📦 <b>Obuna turini tanlang:</b>\n\n"
         "Quyidagi variantlardan birini tanlang:",
-        reply_markup=prices_inline_keyboard()
+        reply_markup=await catalog.prices_keyboard()
     )
     await PaymentStates.select_price.set()
 
@@ -49,7 +47,7 @@ async def new_payment(message: types.Message):
 async def select_price(call: types.CallbackQuery, state: FSMContext):
     """Narx tanlash"""
     price_id = int(call.data.split(":")[1])
-    price = get_price(price_id)
+    price = await catalog.price(price_id)
     
     if not price:
         await call.answer("❌ Narx topilmadi", show_alert=True)
@@ -57,7 +55,7 @@ async def select_price(call: types.CallbackQuery, state: FSMContext):
     
     await state.update_data(price_id=price_id, days=price['days'], amount=price['price'])
     
-    cards = get_active_cards()
+    cards = await catalog.active_cards()
     
     if not cards:
         await call.message.edit_text(
@@ -70,7 +68,7 @@ async def select_price(call: types.CallbackQuery, state: FSMContext):
     await call.message.edit_text(
         f"✅ <b>Tanlangan obuna:</b> {price['days']} kun - {price['price']:,.0f} so'm\n\n"
         "💳 <b>To'lov kartasini tanlang:</b>",
-        reply_markup=cards_inline_keyboard()
+        reply_markup=await catalog.cards_keyboard()
     )
     await PaymentStates.select_card.set()
 
@@ -78,7 +76,7 @@ async def select_price(call: types.CallbackQuery, state: FSMContext):
 async def select_card(call: types.CallbackQuery, state: FSMContext):
     """Karta tanlash"""
     card_id = int(call.data.split(":")[1])
-    card = get_card(card_id)
+    card = await catalog.card(card_id)
     
     if not card:
         await call.answer("❌ Karta topilmadi", show_alert=True)
@@ -116,8 +114,12 @@ async def receive_receipt(message: types.Message, state: FSMContext):
     data = await state.get_data()
     user_id = message.from_user.id
     
+    # users qatori hali navbatda bo'lishi mumkin (start.py) - admin ro'yxatlari
+    # payments JOIN users qiladi, shuning uchun avval yozib olamiz
+    await writes.flush()
+
     # To'lovni bazaga qo'shish
-    payment_id = add_payment(
+    payment_id = await db.add_payment(
         user_id=user_id,
         amount=data['amount'],
         receipt_photo=photo_id,
@@ -142,9 +144,6 @@ Tasdiqlangandan keyin sizga xabar beriladi.
     )
     
     # Adminlarga xabar yuborish
-    from utils.db_api.database import get_user
-    user = get_user(user_id)
-    
     admin_text = f"""🆕 <b>Yangi to'lov so'rovi!</b>
 
 👤 Foydalanuvchi: {message.from_user.full_name}
@@ -159,16 +158,17 @@ Tasdiqlangandan keyin sizga xabar beriladi.
     
     from keyboards.default.keyboards import payment_action_keyboard
     
-    for admin_id in ADMINS:
-        try:
-            await bot.send_message(admin_id, admin_text)
-            await bot.send_photo(
-                admin_id, 
-                photo_id,
-                reply_markup=payment_action_keyboard(payment_id)
-            )
-        except Exception as e:
-            print(f"Admin {admin_id} ga xabar yuborishda xato: {e}")
+    with outbound_lane(ADMIN):
+        for admin_id in ADMINS:
+            try:
+                await bot.send_message(admin_id, admin_text)
+                await bot.send_photo(
+                    admin_id, 
+                    photo_id,
+                    reply_markup=payment_action_keyboard(payment_id)
+                )
+            except Exception as e:
+                print(f"Admin {admin_id} ga xabar yuborishda xato: {e}")
 
 @dp.message_handler(state=PaymentStates.send_receipt)
 async def wrong_receipt_format(message: types.Message):
@@ -183,7 +183,7 @@ async def wrong_receipt_format(message: types.Message):
 async def payment_history(message: types.Message):
     """To'lovlar tarixi"""
     user_id = message.from_user.id
-    payments = get_user_payments(user_id)
+    payments = await db.get_user_payments(user_id)
     
     if not payments:
         await message.answer(
@@ -219,9 +219,9 @@ async def payment_history(message: types.Message):
 async def subscription_status(message: types.Message):
     """Obuna holati"""
     user_id = message.from_user.id
-    subscription = get_subscription(user_id)
+    subscription = await subscription_cache.get(user_id)
     
-    if not subscription or not subscription['is_active']:
+    if not subscription.active:
         await message.answer(
             "❌ <b>Sizda faol obuna yo'q</b>\n\n"
             "Obuna bo'lish uchun 💳 To'lov qilish tugmasini bosing.",
@@ -229,11 +229,10 @@ async def subscription_status(message: types.Message):
         )
         return
     
-    expires_at = subscription['expires_at']
-    if expires_at:
-        expires_date = datetime.strptime(expires_at, '%Y-%m-%d %H:%M:%S')
+    expires_date = subscription.expires_date
+    if expires_date:
         days_left = (expires_date - datetime.now()).days
-        expires_text = expires_at[:10]
+        expires_text = expires_date.strftime('%Y-%m-%d')
     else:
         days_left = 0
         expires_text = '-'
@@ -254,10 +253,10 @@ async def subscription_status(message: types.Message):
 """
     
     # Kanal havolasini ko'rsatish
-    if subscription['channel_joined']:
+    if subscription.channel_joined:
         text += "🔗 Siz allaqachon kanalga qo'shilgansiz."
     else:
-        channels = get_active_channels()
+        channels = await db.get_active_channels()
         if channels:
             text += "🔗 Premium kanalga qo'shilish:"
             keyboard = channel_link_keyboard(channels[0]['invite_link'])
@@ -4,7 +4,8 @@ from aiogram.dispatcher.filters import CommandStart
 
 from loader import dp, bot
 from data.config import ADMINS
-from utils.db_api.database import add_user, get_user, get_subscription
+from utils.db_api import writes
+from utils.subscription_cache import subscription_cache
 from keyboards.default.keyboards import main_menu_keyboard, admin_menu_keyboard
 
 @dp.message_handler(CommandStart(), state="*")
@@ -16,8 +17,8 @@ async def bot_start(message: types.Message, state: FSMContext):
     username = message.from_user.username
     full_name = message.from_user.full_name
     
-    # Foydalanuvchini bazaga qo'shish
-    add_user(user_id, username, full_name)
+    # Foydalanuvchini bazaga qo'shish (navbat orqali, bir necha yuz ms ichida yoziladi)
+    writes.add_user(user_id, username, full_name)
     
     # Admin yoki oddiy foydalanuvchi
     if str(user_id) in ADMINS:
@@ -34,9 +35,7 @@ async def bot_start(message: types.Message, state: FSMContext):
         keyboard = admin_menu_keyboard()
     else:
         # Obuna holatini tekshirish
-        subscription = get_subscription(user_id)
-        
-        if subscription and subscription['is_active']:
+        if await subscription_cache.is_active(user_id):
             status = "✅ Sizda faol obuna mavjud"
         else:
             status = "❌ Sizda faol obuna yo'q"
@@ -63,9 +62,7 @@ async def switch_to_user_mode(message: types.Message, state: FSMContext):
     user_id = message.from_user.id
     full_name = message.from_user.full_name
     
-    subscription = get_subscription(user_id)
-    
-    if subscription and subscription['is_active']:
+    if await subscription_cache.is_active(user_id):
         status = "✅ Sizda faol obuna mavjud"
     else:
         status = "❌ Sizda faol obuna yo'q"
@@ -4,12 +4,12 @@ from aiogram.dispatcher import FSMContext
 from loader import dp, bot
 from data.config import ADMINS
 from states.states import ContactStates
-from utils.db_api.database import (
-    get_all_videos, get_free_videos, get_video, get_subscription,
-    get_setting
-)
+from utils.db_api import db
+from utils.catalog import catalog
+from utils.subscription_cache import subscription_cache
+from utils.outbound import outbound_lane, ADMIN
 from keyboards.default.keyboards import (
-    main_menu_keyboard, videos_inline_keyboard, back_keyboard
+    main_menu_keyboard, back_keyboard
 )
 
 # ============ VIDEO QO'LLANMALAR ============
@@ -18,10 +18,9 @@ from keyboards.default.keyboards import (
 async def video_tutorials(message: types.Message):
     """Video qo'llanmalar"""
     user_id = message.from_user.id
-    subscription = get_subscription(user_id)
-    is_subscribed = subscription and subscription['is_active']
+    is_subscribed = await subscription_cache.is_active(user_id)
     
-    videos = get_all_videos() if is_subscribed else get_free_videos()
+    videos = await catalog.all_videos() if is_subscribed else await catalog.free_videos()
     
     if not videos:
         await message.answer(
@@ -34,25 +33,25 @@ async def video_tutorials(message: types.Message):
     if is_subscribed:
         text = "📚 <b>Video qo'llanmalar</b>\n\n✅ Sizda premium obuna bor. Barcha videolar ochiq!"
     else:
-        total_videos = len(get_all_videos())
+        total_videos = len(await catalog.all_videos())
         free_videos = len(videos)
-        text = f"📚 <b>Video qo'llanmalar</b>\n\n🆓 Bepul videolar: {free_videos}\n🔒 Premium videolar: {total_videos - free_videos}"
+        premium_videos = total_videos - free_videos
+        text = f"📚 <b>Video qo'llanmalar</b>\n\n🆓 Bepul videolar: {free_videos}\n🔒 Premium videolar: {premium_videos}"
     
-    await message.answer(text, reply_markup=videos_inline_keyboard(is_subscribed))
+    await message.answer(text, reply_markup=await catalog.videos_keyboard(is_subscribed))
 
 @dp.callback_query_handler(text_startswith="watch_video:")
 async def watch_video(call: types.CallbackQuery):
     """Videoni ko'rish"""
     video_id = int(call.data.split(":")[1])
-    video = get_video(video_id)
+    video = await catalog.video(video_id)
     
     if not video:
         await call.answer("❌ Video topilmadi", show_alert=True)
         return
     
     user_id = call.from_user.id
-    subscription = get_subscription(user_id)
-    is_subscribed = subscription and subscription['is_active']
+    is_subscribed = await subscription_cache.is_active(user_id)
     
     # Premium video uchun obuna tekshirish
     if not video['is_free'] and not is_subscribed:
@@ -83,7 +82,7 @@ async def watch_video(call: types.CallbackQuery):
 @dp.message_handler(text="📞 Aloqa")
 async def contact_menu(message: types.Message):
     """Aloqa menyusi"""
-    support_info = get_setting('support_info')
+    support_info = await db.get_setting('support_info')
     
     if support_info:
         text = f"📞 <b>Bog'lanish</b>\n\n{support_info}"
@@ -120,11 +119,12 @@ async def receive_contact_message(message: types.Message, state: FSMContext):
 💬 Xabar:
 {message.text}"""
     
-    for admin_id in ADMINS:
-        try:
-            await bot.send_message(admin_id, admin_text)
-        except:
-            pass
+    with outbound_lane(ADMIN):
+        for admin_id in ADMINS:
+            try:
+                await bot.send_message(admin_id, admin_text)
+            except:
+                pass
     
     await message.answer(
         "✅ Xabaringiz adminga yuborildi!\n"
@@ -138,7 +138,7 @@ async def receive_contact_message(message: types.Message, state: FSMContext):
 @dp.message_handler(text="ℹ️ Bot haqida")
 async def about_bot(message: types.Message):
     """Bot haqida"""
-    about_text = get_setting('about_text')
+    about_text = await db.get_setting('about_text')
     
     if about_text:
         text = about_text
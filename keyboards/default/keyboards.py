@@ -1,5 +1,4 @@
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
-from utils.db_api.database import get_active_cards, get_active_prices, get_all_videos, get_free_videos
 
 # ============ ASOSIY MENYU ============
 
@@ -49,10 +48,9 @@ def payment_menu_keyboard():
     keyboard.add(KeyboardButton("🔙 Orqaga"))
     return keyboard
 
-def prices_inline_keyboard():
+def prices_inline_keyboard(prices):
     """Narxlar inline klaviaturasi"""
     keyboard = InlineKeyboardMarkup(row_width=1)
-    prices = get_active_prices()
     
     for price in prices:
         text = f"📦 {price['days']} kun - {price['price']:,.0f} so'm"
@@ -60,10 +58,9 @@ def prices_inline_keyboard():
     
     return keyboard
 
-def cards_inline_keyboard():
+def cards_inline_keyboard(cards):
     """Kartalar inline klaviaturasi"""
     keyboard = InlineKeyboardMarkup(row_width=1)
-    cards = get_active_cards()
     
     for card in cards:
         text = f"💳 {card['card_number']} ({card['bank_name'] or 'Karta'})"
@@ -88,21 +85,17 @@ def skip_receipt_keyboard():
 
 # ============ VIDEO QO'LLANMALAR ============
 
-def videos_inline_keyboard(is_subscribed: bool = False):
+def videos_inline_keyboard(videos, has_premium: bool = False):
     """Videolar ro'yxati inline klaviaturasi"""
     keyboard = InlineKeyboardMarkup(row_width=1)
     
-    if is_subscribed:
-        videos = get_all_videos()
-    else:
-        videos = get_free_videos()
-    
     for video in videos:
         icon = "🆓" if video['is_free'] else "🔒"
         text = f"{icon} {video['name']}"
         keyboard.add(InlineKeyboardButton(text, callback_data=f"watch_video:{video['id']}"))
     
-    if not is_subscribed and len(get_all_videos()) > len(videos):
+    # Obunasi yo'q foydalanuvchiga yopiq videolar borligini ko'rsatish
+    if has_premium:
         keyboard.add(InlineKeyboardButton("🔓 Premium videolar uchun obuna bo'ling", callback_data="subscribe_for_videos"))
     
     return keyboard
@@ -303,6 +296,12 @@ def subscription_action_keyboard(user_id: int):
     )
     return keyboard
 
+def users_list_keyboard(nav: InlineKeyboardMarkup = None):
+    """Foydalanuvchilar ro'yxati: sahifalash va qidirish tugmalari"""
+    keyboard = nav or InlineKeyboardMarkup()
+    keyboard.add(InlineKeyboardButton("🔍 Qidirish", callback_data="search_users"))
+    return keyboard
+
 def confirm_action_keyboard(action: str, item_id: int):
     """Tasdiqlash tugmalari"""
     keyboard = InlineKeyboardMarkup(row_width=2)
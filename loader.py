@@ -1,8 +1,16 @@
-from aiogram import Bot, Dispatcher, types
-from aiogram.contrib.fsm_storage.memory import MemoryStorage
+from aiogram import Dispatcher, types
+from aiogram.bot.api import TelegramAPIServer, TELEGRAM_PRODUCTION
 
 from data import config
+from utils.db_api.fsm_storage import SQLiteStorage
+from utils.outbound import RateLimitedBot, OutboundLimiter
 
-bot = Bot(token=config.BOT_TOKEN, parse_mode=types.ParseMode.HTML)
-storage = MemoryStorage()
+# Barcha yuboruvchilar (javoblar, adminlar, scheduler, reklama) bitta limiterdan o'tadi
+bot = RateLimitedBot(
+    token=config.BOT_TOKEN,
+    parse_mode=types.ParseMode.HTML,
+    server=TelegramAPIServer.from_base(config.BOT_API_SERVER) if config.BOT_API_SERVER else TELEGRAM_PRODUCTION,
+    limiter=OutboundLimiter(rate=config.OUTBOUND_RATE, chat_rate=config.OUTBOUND_CHAT_RATE)
+)
+storage = SQLiteStorage(max_size=config.FSM_CACHE_SIZE, ttl=config.FSM_TTL_HOURS * 3600)
 dp = Dispatcher(bot, storage=storage)
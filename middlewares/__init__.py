@@ -1,8 +1,25 @@
 from aiogram import Dispatcher
 
+from data.config import USER_QUEUE_SIZE
 from loader import dp
 from .throttling import ThrottlingMiddleware
+from .user_queue import UserQueueMiddleware
+from .metrics import MetricsMiddleware
+from utils.metrics import metrics
+
+user_queue = UserQueueMiddleware(max_pending=USER_QUEUE_SIZE)
 
 
 if __name__ == "middlewares":
     dp.middleware.setup(ThrottlingMiddleware())
+    # Oxirgi bo'lib: oldingi middleware update'ni bekor qilsa navbat egallanmay qoladi
+    dp.middleware.setup(user_queue)
+    # Navbatdan keyin: kechikishga navbatda kutish kirmaydi, tashlangan update in_flight'da qolmaydi
+    dp.middleware.setup(MetricsMiddleware(metrics))
+
+    metrics.register('bot_user_queue_users', 'gauge', "Navbati bor foydalanuvchilar",
+                     lambda: user_queue.stats()['users'])
+    metrics.register('bot_user_queue_pending', 'gauge', "Navbatda kutayotgan update'lar",
+                     lambda: user_queue.stats()['pending'])
+    metrics.register('bot_user_queue_dropped_total', 'counter', "Navbat to'lgani uchun tashlangan update'lar",
+                     lambda: user_queue.dropped)
@@ -0,0 +1,54 @@
+import time
+
+from aiogram.dispatcher.handler import current_handler
+from aiogram.dispatcher.middlewares import BaseMiddleware
+
+from utils.metrics import Metrics
+from utils.misc.updates import update_type
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """
+    Update'lar soni, ishlanayotganlar va handler'lar kechikishini `Metrics`ga yozadi.
+
+    Har bir update uchun faqat bir nechta perf_counter() va lug'at amali -
+    shuning uchun `on_*` metodlari o'rniga trigger() to'g'ridan-to'g'ri
+    almashtirilgan (aiogram har bir hodisa uchun getattr qilmasin).
+
+    pre_process_update'da boshqa middleware CancelHandler ko'tarsa
+    post_process chaqirilmaydi va in_flight kamaymaydi - shuning uchun bu
+    middleware ham oxirida o'rnatiladi.
+    """
+
+    def __init__(self, metrics: Metrics):
+        super().__init__()
+        self.metrics = metrics
+        self._names = {}  # handler funksiyasi -> "modul.nom"
+
+    async def trigger(self, action: str, args):
+        if action == 'pre_process_update':
+            update, data = args
+            kind = update_type(update)
+            self.metrics.updates[kind] += 1
+            self.metrics.in_flight += 1
+            data['metrics'] = (kind, time.perf_counter())
+        elif action == 'post_process_update':
+            self.metrics.in_flight -= 1
+            kind, started = args[-1].pop('metrics')
+            self.metrics.update_duration[kind].observe(time.perf_counter() - started)
+        elif action == 'process_update' or action.startswith('pre_process_'):
+            pass
+        elif action.startswith('process_'):
+            # Filtrlardan o'tib, handler tanlangan payt
+            args[-1]['metrics_handler'] = (current_handler.get(), time.perf_counter())
+        elif action.startswith('post_process_'):
+            entry = args[-1].pop('metrics_handler', None)
+            if entry is not None:
+                handler, started = entry
+                self.metrics.handler_duration[self._name(handler)].observe(time.perf_counter() - started)
+
+    def _name(self, handler) -> str:
+        name = self._names.get(handler)
+        if name is None:
+            name = self._names[handler] = f"{handler.__module__}.{handler.__qualname__}"
+        return name
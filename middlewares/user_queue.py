@@ -0,0 +1,80 @@
+import asyncio
+import logging
+
+from aiogram import types
+from aiogram.dispatcher.handler import CancelHandler
+from aiogram.dispatcher.middlewares import BaseMiddleware
+
+from utils.misc.updates import update_user_id
+
+
+class _UserQueue:
+    """Bitta foydalanuvchining navbati: lock (FIFO) va kutayotganlar soni"""
+
+    __slots__ = ('lock', 'pending')
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.pending = 0
+
+
+class UserQueueMiddleware(BaseMiddleware):
+    """
+    Bitta foydalanuvchining update'larini kelgan tartibida, birin-ketin ishlaydi
+    (masalan, "✅ Chek yuborish" ikki marta bosilsa ikkinchisi birinchisidan keyin
+    ishlanadi va holat allaqachon o'zgargan bo'ladi). Turli foydalanuvchilar
+    to'liq parallel ishlanadi.
+
+    - Har bir foydalanuvchi uchun `max_pending` tagacha update kutadi, ortiqchasi tashlanadi
+    - Navbati bo'shagan foydalanuvchi darhol xotiradan chiqariladi
+
+    Boshqa middleware'lar on_pre_process_update'da CancelHandler ko'tarsa,
+    post_process chaqirilmaydi - shuning uchun bu middleware oxirida o'rnatiladi.
+    """
+
+    def __init__(self, max_pending: int = 10):
+        super().__init__()
+        self.max_pending = max_pending
+        self._queues = {}  # user_id -> _UserQueue
+        self.dropped = 0
+
+    async def on_pre_process_update(self, update: types.Update, data: dict):
+        user_id = update_user_id(update)
+        if user_id is None:
+            return
+
+        queue = self._queues.get(user_id)
+        if queue is None:
+            queue = self._queues[user_id] = _UserQueue()
+        if queue.pending >= self.max_pending:
+            self.dropped += 1
+            logging.warning(f"Foydalanuvchi navbati to'la, update tashlandi ({user_id})")
+            raise CancelHandler()
+
+        queue.pending += 1
+        try:
+            await queue.lock.acquire()
+        except BaseException:
+            self._leave(user_id, queue)
+            raise
+        data['user_queue'] = (user_id, queue)
+
+    async def on_post_process_update(self, update: types.Update, results, data: dict):
+        entry = data.pop('user_queue', None)
+        if entry is None:
+            return
+        user_id, queue = entry
+        queue.lock.release()
+        self._leave(user_id, queue)
+
+    def _leave(self, user_id: int, queue: _UserQueue):
+        queue.pending -= 1
+        if queue.pending == 0 and self._queues.get(user_id) is queue:
+            del self._queues[user_id]
+
+    def stats(self) -> dict:
+        return {
+            'users': len(self._queues),
+            'pending': sum(queue.pending for queue in self._queues.values()),
+            'dropped': self.dropped,
+        }
@@ -57,3 +57,7 @@ class AdminPaymentStates(StatesGroup):
 class AdminNotifyStates(StatesGroup):
     """Foydalanuvchiga xabar yuborish holatlari"""
     enter_message = State()
+
+class AdminUserSearchStates(StatesGroup):
+    """Foydalanuvchi qidirish holatlari"""
+    enter_query = State()
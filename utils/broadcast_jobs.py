@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+
+from aiogram import Bot
+
+from data.config import BROADCAST_RATE, BROADCAST_WORKERS
+from keyboards.default.keyboards import admin_broadcast_keyboard
+from utils.broadcaster import Broadcaster, report_progress
+from utils.db_api import db, events
+from utils.outbound import set_lane, BROADCAST
+
+# Bir sahifadagi foydalanuvchilar soni. Har sahifadan keyin kursor saqlanadi,
+# shuning uchun qayta ishga tushganda ko'pi bilan bitta sahifa qayta yuboriladi.
+PAGE_SIZE = 200
+
+_wakeup = asyncio.Event()
+_loop = None
+
+
+def wake_broadcast_worker():
+    """Yangi reklama qo'shilganini worker'ga bildiradi"""
+    _wakeup.set()
+
+
+def _on_broadcast_queued(**_):
+    # DB thread'idan yoki boshqa jarayondan keladi
+    if _loop is not None:
+        _loop.call_soon_threadsafe(_wakeup.set)
+
+
+events.subscribe('broadcast_queued', _on_broadcast_queued)
+
+
+def make_broadcast_sender(bot: Bot, job):
+    """Reklama turiga qarab bitta foydalanuvchiga yuboruvchi funksiya"""
+    broadcast_type = job['broadcast_type']
+    caption = job['caption'] or ''
+
+    async def send(user_id: int):
+        if broadcast_type == 'text':
+            await bot.send_message(user_id, job['message_text'])
+        elif broadcast_type == 'photo':
+            await bot.send_photo(user_id, job['photo_id'], caption=caption)
+        else:
+            await bot.send_video(user_id, job['video_id'], caption=caption)
+
+    return send
+
+
+async def process_broadcast(bot: Bot, job):
+    """Bitta reklama vazifasini oxirgi saqlangan kursordan boshlab yuboradi"""
+    broadcaster = Broadcaster(
+        make_broadcast_sender(bot, job),
+        rate=BROADCAST_RATE,
+        workers=BROADCAST_WORKERS
+    )
+    stats = broadcaster.stats
+    stats.total = job['total_count'] or 0
+    stats.sent = job['sent_count'] or 0
+    stats.failed = job['failed_count'] or 0
+
+    async def report(stats):
+        if job['admin_chat_id'] and job['progress_message_id']:
+            await bot.edit_message_text(
+                f"📤 Yuborilmoqda... ({stats.processed}/{stats.total})\n"
+                f"⚡️ {stats.speed:.1f} xabar/s",
+                job['admin_chat_id'],
+                job['progress_message_id']
+            )
+
+    await db.set_broadcast_status(job['id'], 'running')
+    progress = asyncio.create_task(report_progress(stats, report))
+
+    cursor = job['last_user_id'] or 0
+    try:
+        while True:
+            recipients = await db.get_broadcast_recipients_page(job['target'], cursor, PAGE_SIZE)
+            if not recipients:
+                break
+
+            sent, failed = await broadcaster.send_batch(recipients)
+            await db.checkpoint_broadcast(job['id'], recipients[-1], sent, failed)
+            cursor = recipients[-1]
+    finally:
+        stats.finished_at = time.monotonic()
+        progress.cancel()
+
+    await db.set_broadcast_status(job['id'], 'done')
+
+    if job['admin_chat_id']:
+        text = f"""✅ <b>Reklama yuborildi!</b>
+
+👥 Jami: {stats.total}
+✅ Yuborildi: {stats.sent}
+❌ Xato: {stats.failed}"""
+        try:
+            if job['progress_message_id']:
+                await bot.edit_message_text(text, job['admin_chat_id'], job['progress_message_id'])
+            else:
+                await bot.send_message(job['admin_chat_id'], text)
+            await bot.send_message(job['admin_chat_id'], "📢 Reklama menyusi:",
+                                   reply_markup=admin_broadcast_keyboard())
+        except Exception as e:
+            logging.warning(f"Reklama natijasi yuborilmadi: {e}")
+
+
+async def broadcast_worker(bot: Bot, poll_interval: float = 30):
+    """
+    Reklamalar navbatini ishlovchi fon vazifasi.
+    Ishga tushganda to'xtab qolgan reklamalarni davom ettiradi.
+    """
+    global _loop
+    _loop = asyncio.get_running_loop()
+    set_lane(BROADCAST)
+    while True:
+        _wakeup.clear()
+
+        try:
+            jobs = await db.get_unfinished_broadcasts()
+        except Exception as e:
+            logging.exception(f"Reklamalar navbatini o'qishda xato: {e}")
+            jobs = []
+
+        for job in jobs:
+            try:
+                await process_broadcast(bot, job)
+            except Exception as e:
+                logging.exception(f"Reklama #{job['id']} yuborilmadi: {e}")
+                await db.set_broadcast_status(job['id'], 'failed')
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), poll_interval)
+        except asyncio.TimeoutError:
+            pass
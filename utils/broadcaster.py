@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import time
+
+from aiogram.utils.exceptions import (
+    RetryAfter, BotBlocked, ChatNotFound, UserDeactivated, BotKicked, CantInitiateConversation,
+    TelegramAPIError
+)
+
+# Qayta urinish foyda bermaydigan xatolar (foydalanuvchi botni bloklagan va h.k.)
+PERMANENT_ERRORS = (BotBlocked, ChatNotFound, UserDeactivated, BotKicked, CantInitiateConversation)
+
+
+class TokenBucket:
+    """
+    Token bucket limiter: o'rtacha `rate` ta/sekund, qisqa muddatda `capacity` tagacha.
+    pause() barcha iste'molchilarni birdan to'xtatadi (RetryAfter uchun).
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Limiterni `seconds` soniyaga to'xtatadi"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+
+class BroadcastStats:
+    """Reklama yuborish holati (progress hisobotlari uchun)"""
+
+    def __init__(self, total: int = 0):
+        self.total = total
+        self.sent = 0
+        self.failed = 0
+        self.retry_after = 0
+        self.started_at = time.monotonic()
+        self.finished_at = None
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.failed
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def speed(self) -> float:
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+
+class Broadcaster:
+    """
+    Ko'p xabarni parallel yuboruvchi dvigatel.
+
+    `workers` ta vazifa umumiy navbatdan user_id oladi, har bir yuborishdan oldin
+    global TokenBucket'dan ruxsat kutadi. RetryAfter kelsa butun limiter
+    to'xtatiladi va xabar qayta yuboriladi (ko'pi bilan `max_retries` marta).
+
+        broadcaster = Broadcaster(send, rate=25, workers=8)
+        stats = await broadcaster.run(user_ids)
+    """
+
+    def __init__(self, send, rate: float = 25, workers: int = 8, max_retries: int = 3,
+                 limiter: TokenBucket = None, permanent_errors: tuple = PERMANENT_ERRORS):
+        self.send = send
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.permanent_errors = permanent_errors
+        self.limiter = limiter or TokenBucket(rate)
+        self.stats = BroadcastStats()
+
+    async def _deliver(self, user_id: int) -> bool:
+        attempt = 0
+        while True:
+            await self.limiter.acquire()
+            try:
+                await self.send(user_id)
+                return True
+            except RetryAfter as e:
+                # Telegram flood limit: hammani to'xtatib, keyin qayta urinish.
+                # Urinishlar soniga kiradi - aks holda cheksiz takrorlanishi mumkin
+                self.stats.retry_after += 1
+                self.limiter.pause(e.timeout + 1)
+                attempt += 1
+                if attempt > self.max_retries:
+                    logging.warning(f"Yuborilmadi ({user_id}): {e}")
+                    return False
+            except self.permanent_errors:
+                return False
+            except (TelegramAPIError, asyncio.TimeoutError, OSError) as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    logging.warning(f"Yuborilmadi ({user_id}): {e}")
+                    return False
+                await asyncio.sleep(2 ** attempt)
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            user_id = await queue.get()
+            try:
+                if user_id is None:
+                    return
+                if await self._deliver(user_id):
+                    self.stats.sent += 1
+                else:
+                    self.stats.failed += 1
+            except Exception as e:
+                self.stats.failed += 1
+                logging.exception(f"Yuborishda kutilmagan xato ({user_id}): {e}")
+            finally:
+                queue.task_done()
+
+    async def send_batch(self, user_ids):
+        """
+        Berilgan foydalanuvchilarga yuboradi; hisoblagichlar self.stats'da yig'iladi.
+        Shu partiya bo'yicha (yuborildi, xato) sonini qaytaradi.
+        """
+        sent_before, failed_before = self.stats.sent, self.stats.failed
+
+        # Navbat chegaralangan: ro'yxat qancha katta bo'lsa ham xotira o'smaydi
+        queue = asyncio.Queue(maxsize=self.workers * 4)
+        tasks = [asyncio.create_task(self._worker(queue)) for _ in range(self.workers)]
+
+        try:
+            for user_id in user_ids:
+                await queue.put(user_id)
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return self.stats.sent - sent_before, self.stats.failed - failed_before
+
+    async def run(self, user_ids, total: int = None) -> BroadcastStats:
+        """Barcha foydalanuvchilarga yuboradi va yakuniy statistikani qaytaradi"""
+        if total is None and hasattr(user_ids, '__len__'):
+            total = len(user_ids)
+        self.stats.total = total or 0
+        self.stats.started_at = time.monotonic()
+
+        try:
+            await self.send_batch(user_ids)
+        finally:
+            self.stats.finished_at = time.monotonic()
+
+        return self.stats
+
+
+async def report_progress(stats: BroadcastStats, report, interval: float = 5):
+    """
+    Yuborishdan mustaqil ravishda har `interval` soniyada report(stats) chaqiradi.
+    Yuborish tugagach o'zi to'xtaydi.
+    """
+    while not stats.done:
+        await asyncio.sleep(interval)
+        if stats.done:
+            break
+        try:
+            await report(stats)
+        except Exception as e:
+            logging.warning(f"Progress yangilanmadi: {e}")
@@ -0,0 +1,125 @@
+import asyncio
+
+from keyboards.default.keyboards import (
+    prices_inline_keyboard, cards_inline_keyboard, videos_inline_keyboard
+)
+from utils.db_api import db
+from utils.db_api import events
+
+
+class _Section:
+    """Bitta katalog bo'limi: ro'yxat, id bo'yicha lug'at va tayyor klaviaturalar"""
+
+    def __init__(self, load):
+        self.load = load
+        self.generation = 0
+        self.items = None
+        self.by_id = {}
+        self.views = {}  # hisoblangan ko'rinishlar (filtrlangan ro'yxatlar, klaviaturalar)
+
+
+class CatalogCache:
+    """
+    Narxlar, kartalar va videolar uchun read-through kesh.
+
+    Har bir bo'lim birinchi so'rovda bitta SELECT bilan yuklanadi, keyingi
+    so'rovlar (tayyor InlineKeyboardMarkup bilan birga) xotiradan qaytadi.
+    Admin o'zgartirganda database 'catalog_changed' hodisasi bo'limni tozalaydi.
+    """
+
+    def __init__(self):
+        self._sections = {
+            'prices': _Section(db.get_all_prices),
+            'cards': _Section(db.get_all_cards),
+            'videos': _Section(db.get_all_videos),
+        }
+        self._loop = None
+
+    def invalidate(self, section: str = None):
+        """Bo'limni (yoki butun keshni) tozalaydi (istalgan thread'dan)"""
+        if self._loop is None:
+            self._invalidate(section)
+        else:
+            self._loop.call_soon_threadsafe(self._invalidate, section)
+
+    def _invalidate(self, section: str = None):
+        names = [section] if section else list(self._sections)
+        for name in names:
+            cached = self._sections[name]
+            cached.generation += 1
+            cached.items = None
+            cached.by_id = {}
+            cached.views = {}
+
+    async def _get(self, name: str) -> _Section:
+        self._loop = self._loop or asyncio.get_running_loop()
+        cached = self._sections[name]
+        if cached.items is None:
+            generation = cached.generation
+            items = await cached.load()
+            # Yuklash paytida o'zgargan bo'lsa, eskirgan natijani saqlamaymiz
+            if generation != cached.generation:
+                return await self._get(name)
+            cached.items = items
+            cached.by_id = {item['id']: item for item in items}
+        return cached
+
+    async def _view(self, name: str, key: str, build):
+        cached = await self._get(name)
+        if key not in cached.views:
+            cached.views[key] = build(cached.items)
+        return cached.views[key]
+
+    # ---------- narxlar ----------
+
+    async def active_prices(self):
+        return await self._view('prices', 'active',
+                                lambda items: [p for p in items if p['is_active']])
+
+    async def price(self, price_id: int):
+        return (await self._get('prices')).by_id.get(price_id)
+
+    async def prices_keyboard(self):
+        prices = await self.active_prices()
+        return await self._view('prices', 'keyboard', lambda _: prices_inline_keyboard(prices))
+
+    # ---------- kartalar ----------
+
+    async def active_cards(self):
+        return await self._view('cards', 'active', lambda items: sorted(
+            (c for c in items if c['is_active']), key=lambda c: c['id']
+        ))
+
+    async def card(self, card_id: int):
+        return (await self._get('cards')).by_id.get(card_id)
+
+    async def cards_keyboard(self):
+        cards = await self.active_cards()
+        return await self._view('cards', 'keyboard', lambda _: cards_inline_keyboard(cards))
+
+    # ---------- videolar ----------
+
+    async def all_videos(self):
+        return (await self._get('videos')).items
+
+    async def free_videos(self):
+        return await self._view('videos', 'free',
+                                lambda items: [v for v in items if v['is_free']])
+
+    async def video(self, video_id: int):
+        return (await self._get('videos')).by_id.get(video_id)
+
+    async def videos_keyboard(self, is_subscribed: bool):
+        if is_subscribed:
+            videos = await self.all_videos()
+            return await self._view('videos', 'keyboard_all',
+                                    lambda _: videos_inline_keyboard(videos))
+
+        videos = await self.free_videos()
+        has_premium = len(await self.all_videos()) > len(videos)
+        return await self._view('videos', 'keyboard_free',
+                                lambda _: videos_inline_keyboard(videos, has_premium=has_premium))
+
+
+catalog = CatalogCache()
+events.subscribe('catalog_changed', catalog.invalidate)
@@ -0,0 +1,78 @@
+import logging
+
+from aiogram import Bot
+from aiogram.utils.exceptions import BadRequest, Unauthorized
+
+from data.config import REMOVAL_RATE, REMOVAL_WORKERS
+from utils.broadcaster import Broadcaster, BroadcastStats, PERMANENT_ERRORS
+from utils.db_api import db
+
+# Kanaldan chiqarishda qayta urinish foyda bermaydigan xatolar
+# (bot kanalda admin emas, foydalanuvchi kanal admini va h.k.)
+REMOVAL_PERMANENT_ERRORS = PERMANENT_ERRORS + (BadRequest, Unauthorized)
+
+NOTIFY = 'notify'
+KICK = 'kick'
+
+
+def expired_text(sub) -> str:
+    return f"""❌ <b>Obunangiz muddati tugadi!</b>
+
+📅 Tugagan sana: {sub['expires_at'][:10] if sub['expires_at'] else '-'}
+
+😔 Siz premium kanaldan chiqarildingiz.
+
+💡 Qayta obuna bo'lish uchun /start buyrug'ini yuboring va "💳 To'lov qilish" tugmasini bosing."""
+
+
+def removal_tasks(subs, channels):
+    """Har bir obuna uchun: xabar + har bir kanaldan chiqarish"""
+    for sub in subs:
+        yield NOTIFY, sub['user_id'], sub
+        for channel in channels:
+            yield KICK, sub['user_id'], channel['channel_id']
+
+
+async def remove_expired_subscriptions(bot: Bot, subs) -> BroadcastStats:
+    """
+    Muddati o'tgan obunalarni yopadi: xabar, barcha kanallardan chiqarish, o'chirish.
+
+    Kanallar bir marta o'qiladi, (foydalanuvchi, kanal) juftliklari Broadcaster
+    orqali parallel, umumiy tezlik limiti va qayta urinish bilan bajariladi.
+    Oxirida obunalar bitta tranzaksiyada o'chiriladi.
+    """
+    subs = list(subs)
+    if not subs:
+        return BroadcastStats()
+
+    channels = await db.get_active_channels()
+    broadcaster = None
+
+    async def send(task):
+        kind, user_id, arg = task
+        if kind == NOTIFY:
+            await bot.send_message(user_id, expired_text(arg))
+            return
+        await bot.kick_chat_member(chat_id=arg, user_id=user_id)
+        # Unban qilish (keyingi obunada kirish imkoniyati uchun)
+        await broadcaster.limiter.acquire()
+        await bot.unban_chat_member(chat_id=arg, user_id=user_id)
+
+    broadcaster = Broadcaster(
+        send,
+        rate=REMOVAL_RATE,
+        workers=REMOVAL_WORKERS,
+        permanent_errors=REMOVAL_PERMANENT_ERRORS
+    )
+    stats = await broadcaster.run(
+        removal_tasks(subs, channels),
+        total=len(subs) * (len(channels) + 1)
+    )
+
+    await db.deactivate_subscriptions([sub['user_id'] for sub in subs])
+
+    logging.info(
+        f"{len(subs)} ta obuna yopildi: {stats.sent} so'rov bajarildi, "
+        f"{stats.failed} xato, {stats.elapsed:.1f}s"
+    )
+    return stats
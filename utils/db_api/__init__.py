@@ -1 +1,3 @@
 from .database import *
+from .async_database import db
+from .write_behind import writes
@@ -0,0 +1,60 @@
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+from . import database
+
+
+class AsyncDatabase:
+    """
+    database.py funksiyalarining asinxron fasadi.
+    So'rovlar alohida DB thread'larida bajariladi, shuning uchun event loop bloklanmaydi:
+
+        subscription = await db.get_subscription(user_id)
+
+    Skriptlar uchun sinxron API (utils.db_api.database) o'zgarishsiz qoladi.
+    """
+
+    def __init__(self, workers: int = None):
+        self._workers = workers
+        self._executor = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # Thread'lar soni pool hajmidan oshmasligi kerak, aks holda ular ulanish kutib qoladi
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers or database.DB_POOL_SIZE,
+                thread_name_prefix="db"
+            )
+        return self._executor
+
+    async def run(self, func, *args, **kwargs):
+        """Ixtiyoriy sinxron funksiyani DB thread'ida bajaradi"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        func = getattr(database, name, None)
+        if not inspect.isfunction(func):
+            raise AttributeError(f"database modulida '{name}' funksiyasi yo'q")
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await self.run(func, *args, **kwargs)
+
+        setattr(self, name, wrapper)
+        return wrapper
+
+    def shutdown(self, wait: bool = True):
+        """DB thread'larini to'xtatadi"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+db = AsyncDatabase()
@@ -1,136 +1,76 @@
+import logging
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
 import os
 
-DB_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'bot_database.db')
+from .pool import ConnectionPool
+from .profiler import QueryProfiler
+from .migrations import run_migrations
+from .events import emit
+
+DB_PATH = os.getenv(
+    "DB_PATH",
+    os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'bot_database.db')
+)
+
+# Ulanishlar pool'i sozlamalari (.env orqali o'zgartirish mumkin)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 4))
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", 256 * 1024 * 1024))
+DB_CACHE_SIZE = int(os.getenv("DB_CACHE_SIZE", -64000))
+
+# So'rovlar profileri: statistika (DB_PROFILE) va sekin so'rovlar logi (DB_SLOW_QUERY_MS, 0 - o'chiq)
+DB_PROFILE = os.getenv("DB_PROFILE", "").lower() in ("1", "true", "yes")
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 0))
+
+_pool = None
+_pool_lock = threading.Lock()
+_profiler = QueryProfiler(DB_PROFILE, DB_SLOW_QUERY_MS) if DB_PROFILE or DB_SLOW_QUERY_MS else None
+
+def init_pool(db_path: str = None, size: int = None):
+    """Ulanishlar pool'ini (qayta) yaratadi"""
+    global _pool, DB_PATH
+    with _pool_lock:
+        if db_path:
+            DB_PATH = db_path
+        if _pool is not None:
+            _pool.close()
+        _pool = ConnectionPool(
+            DB_PATH,
+            size=size or DB_POOL_SIZE,
+            mmap_size=DB_MMAP_SIZE,
+            cache_size=DB_CACHE_SIZE,
+            profiler=_profiler
+        )
+        return _pool
+
+def close_pool():
+    """Pool'dagi barcha ulanishlarni yopadi"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+    if DB_PROFILE and _profiler.stats():
+        logging.info(f"So'rovlar statistikasi:\n{_profiler.report()}")
+
+def query_profiler():
+    """Yoqilgan bo'lsa QueryProfiler (stats(), callers(), report(), reset()), aks holda None"""
+    return _profiler
 
 def get_connection():
-    """Database ulanishini qaytaradi"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Pool'dan database ulanishini qaytaradi (close() uni pool'ga qaytaradi)"""
+    pool = _pool or init_pool()
+    return pool.acquire()
 
 def init_db():
-    """Database jadvallarini yaratadi"""
+    """Database sxemasini migratsiyalar orqali yangilaydi (ishga tushishda bir marta)"""
     conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Foydalanuvchilar jadvali
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            user_id INTEGER PRIMARY KEY,
-            username TEXT,
-            full_name TEXT,
-            phone TEXT,
-            registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            is_blocked INTEGER DEFAULT 0,
-            language TEXT DEFAULT 'uz'
-        )
-    ''')
-    
-    # To'lovlar jadvali
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS payments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            amount REAL,
-            receipt_photo TEXT,
-            card_id INTEGER,
-            status TEXT DEFAULT 'pending',
-            subscription_days INTEGER DEFAULT 30,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            approved_at TIMESTAMP,
-            expires_at TIMESTAMP,
-            admin_note TEXT,
-            FOREIGN KEY (user_id) REFERENCES users(user_id),
-            FOREIGN KEY (card_id) REFERENCES cards(id)
-        )
-    ''')
-    
-    # Obunalar jadvali
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS subscriptions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER UNIQUE,
-            is_active INTEGER DEFAULT 0,
-            started_at TIMESTAMP,
-            expires_at TIMESTAMP,
-            channel_joined INTEGER DEFAULT 0,
-            last_notified TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(user_id)
-        )
-    ''')
-    
-    # Kartalar jadvali
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS cards (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            card_number TEXT NOT NULL,
-            card_holder TEXT,
-            bank_name TEXT,
-            is_active INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Kanallar jadvali
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS channels (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            channel_id TEXT,
-            channel_name TEXT,
-            invite_link TEXT,
-            is_active INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Video qo'llanmalar jadvali
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS videos (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            file_id TEXT NOT NULL,
-            description TEXT,
-            is_free INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Reklama xabarlari jadvali
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS broadcasts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            message_text TEXT,
-            photo_id TEXT,
-            video_id TEXT,
-            sent_count INTEGER DEFAULT 0,
-            failed_count INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Bot sozlamalari jadvali
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS settings (
-            key TEXT PRIMARY KEY,
-            value TEXT
-        )
-    ''')
-    
-    # Narxlar jadvali
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS prices (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            days INTEGER NOT NULL,
-            price REAL NOT NULL,
-            description TEXT,
-            is_active INTEGER DEFAULT 1
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    try:
+        return run_migrations(conn)
+    finally:
+        conn.close()
 
 # ============ USERS ============
 
@@ -174,6 +114,52 @@ def get_users_count():
     conn.close()
     return count
 
+# Qidiruv natijalari obuna holati bilan birga (bitta so'rov)
+_USER_SEARCH_SELECT = '''
+    SELECT u.*, COALESCE(s.is_active, 0) AS is_active, s.expires_at
+    FROM users u
+    LEFT JOIN subscriptions s ON s.user_id = u.user_id
+'''
+
+def _like_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _search_query(query: str, limit: int = 20):
+    """search_users() uchun SQL va parametrlar"""
+    if query.isdigit():
+        return _USER_SEARCH_SELECT + 'WHERE u.user_id = ?', (int(query),)
+    if query.startswith('@'):
+        return (
+            _USER_SEARCH_SELECT + "WHERE u.username LIKE ? ESCAPE '\\' "
+            "ORDER BY u.username COLLATE NOCASE LIMIT ?",
+            (_like_escape(query[1:]) + '%', limit)
+        )
+    if len(query) >= 3:
+        # Trigram indeksi 3 belgidan boshlab ism ichidagi qismni topadi
+        return (
+            _USER_SEARCH_SELECT + 'JOIN users_fts f ON f.rowid = u.user_id '
+            'WHERE users_fts MATCH ? ORDER BY f.rowid DESC LIMIT ?',
+            ('"' + query.replace('"', '""') + '"', limit)
+        )
+    return (
+        _USER_SEARCH_SELECT + "WHERE u.full_name LIKE ? ESCAPE '\\' LIMIT ?",
+        ('%' + _like_escape(query) + '%', limit)
+    )
+
+def search_users(query: str, limit: int = 20):
+    """
+    Foydalanuvchilarni qidiradi:
+    - raqam - user_id bo'yicha
+    - @username - username boshlanishi bo'yicha
+    - boshqa matn - ism ichidan (FTS5 trigram)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(*_search_query(query.strip(), limit))
+    users = cursor.fetchall()
+    conn.close()
+    return users
+
 def update_user_phone(user_id: int, phone: str):
     """Foydalanuvchi telefonini yangilaydi"""
     conn = get_connection()
@@ -249,11 +235,17 @@ def approve_payment(payment_id: int, admin_note: str = None):
             WHERE id = ?
         ''', (expires_at, admin_note, payment_id))
 
-        # Obunani yangilash yoki yaratish
+        # Obunani yangilash yoki yaratish (UPSERT: statistika triggerlari to'g'ri ishlashi uchun)
         cursor.execute('''
-            INSERT OR REPLACE INTO subscriptions 
+            INSERT INTO subscriptions 
             (user_id, is_active, started_at, expires_at, channel_joined)
             VALUES (?, 1, CURRENT_TIMESTAMP, ?, 0)
+            ON CONFLICT (user_id) DO UPDATE SET
+                is_active = 1,
+                started_at = excluded.started_at,
+                expires_at = excluded.expires_at,
+                channel_joined = 0,
+                last_notified = NULL
         ''', (user_id, expires_at))
 
         conn.commit()
@@ -263,6 +255,9 @@ def approve_payment(payment_id: int, admin_note: str = None):
         payment['subscription_days'] = days
 
     conn.close()
+
+    if payment:
+        emit('subscription_activated', user_id=payment['user_id'], expires_at=expires_at)
     return payment
 
 def reject_payment(payment_id: int, admin_note: str = None):
@@ -305,6 +300,38 @@ def get_all_payments(limit: int = 50):
     conn.close()
     return payments
 
+def get_approved_payments(limit: int = 30):
+    """Tasdiqlangan to'lovlarni qaytaradi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT p.*, u.username, u.full_name 
+        FROM payments p 
+        JOIN users u ON p.user_id = u.user_id 
+        WHERE p.status = 'approved'
+        ORDER BY p.approved_at DESC
+        LIMIT ?
+    ''', (limit,))
+    payments = cursor.fetchall()
+    conn.close()
+    return payments
+
+def get_rejected_payments(limit: int = 30):
+    """Rad etilgan to'lovlarni qaytaradi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT p.*, u.username, u.full_name 
+        FROM payments p 
+        JOIN users u ON p.user_id = u.user_id 
+        WHERE p.status = 'rejected'
+        ORDER BY p.created_at DESC
+        LIMIT ?
+    ''', (limit,))
+    payments = cursor.fetchall()
+    conn.close()
+    return payments
+
 # ============ SUBSCRIPTIONS ============
 
 def get_subscription(user_id: int):
@@ -330,6 +357,21 @@ def get_active_subscriptions():
     conn.close()
     return subs
 
+def get_all_subscriptions(limit: int = 50):
+    """Barcha obunalarni qaytaradi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT s.*, u.full_name, u.username 
+        FROM subscriptions s 
+        JOIN users u ON s.user_id = u.user_id 
+        ORDER BY s.expires_at DESC 
+        LIMIT ?
+    ''', (limit,))
+    subs = cursor.fetchall()
+    conn.close()
+    return subs
+
 def get_expiring_subscriptions(days: int = 3):
     """Muddati tugayotgan obunalarni qaytaradi"""
     conn = get_connection()
@@ -362,6 +404,33 @@ def get_expired_subscriptions():
     conn.close()
     return subs
 
+def get_subscription_deadlines():
+    """Faol obunalarning tugash vaqtlarini qaytaradi (scheduler ishga tushganda bir marta)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT user_id, expires_at, last_notified 
+        FROM subscriptions 
+        WHERE is_active = 1 AND expires_at IS NOT NULL
+    ''')
+    subs = cursor.fetchall()
+    conn.close()
+    return subs
+
+def get_subscription_with_user(user_id: int):
+    """Obunani foydalanuvchi ma'lumotlari bilan qaytaradi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT s.*, u.username, u.full_name 
+        FROM subscriptions s
+        JOIN users u ON s.user_id = u.user_id
+        WHERE s.user_id = ?
+    ''', (user_id,))
+    sub = cursor.fetchone()
+    conn.close()
+    return sub
+
 def deactivate_subscription(user_id: int):
     """Obunani o'chiradi"""
     conn = get_connection()
@@ -373,6 +442,24 @@ def deactivate_subscription(user_id: int):
     ''', (user_id,))
     conn.commit()
     conn.close()
+    emit('subscription_deactivated', user_id=user_id)
+
+def deactivate_subscriptions(user_ids):
+    """Bir nechta obunani bitta tranzaksiyada o'chiradi"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.executemany('''
+        UPDATE subscriptions
+        SET is_active = 0, channel_joined = 0
+        WHERE user_id = ?
+    ''', [(user_id,) for user_id in user_ids])
+    conn.commit()
+    conn.close()
+    for user_id in user_ids:
+        emit('subscription_deactivated', user_id=user_id)
 
 def mark_channel_joined(user_id: int):
     """Foydalanuvchi kanalga qo'shilganini belgilaydi"""
@@ -385,6 +472,7 @@ def mark_channel_joined(user_id: int):
     ''', (user_id,))
     conn.commit()
     conn.close()
+    emit('channel_joined', user_id=user_id)
 
 def update_last_notified(user_id: int):
     """Oxirgi ogohlantirish vaqtini yangilaydi"""
@@ -398,6 +486,37 @@ def update_last_notified(user_id: int):
     conn.commit()
     conn.close()
 
+def apply_queued_writes(new_users, joined, notified):
+    """
+    Write-behind navbatidagi yozuvlarni bitta tranzaksiyada bajaradi.
+    new_users: (user_id, username, full_name), joined/notified: user_id'lar
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        if new_users:
+            cursor.executemany('''
+                INSERT OR IGNORE INTO users (user_id, username, full_name)
+                VALUES (?, ?, ?)
+            ''', new_users)
+        if joined:
+            cursor.executemany('''
+                UPDATE subscriptions
+                SET channel_joined = 1
+                WHERE user_id = ?
+            ''', [(user_id,) for user_id in joined])
+        if notified:
+            cursor.executemany('''
+                UPDATE subscriptions
+                SET last_notified = CURRENT_TIMESTAMP
+                WHERE user_id = ?
+            ''', [(user_id,) for user_id in notified])
+        conn.commit()
+    finally:
+        conn.close()
+    for user_id in joined:
+        emit('channel_joined', user_id=user_id)
+
 # ============ CARDS ============
 
 def add_card(card_number: str, card_holder: str = None, bank_name: str = None):
@@ -411,6 +530,7 @@ def add_card(card_number: str, card_holder: str = None, bank_name: str = None):
     card_id = cursor.lastrowid
     conn.commit()
     conn.close()
+    emit('catalog_changed', section='cards')
     return card_id
 
 def get_active_cards():
@@ -447,6 +567,7 @@ def toggle_card(card_id: int):
     cursor.execute('UPDATE cards SET is_active = NOT is_active WHERE id = ?', (card_id,))
     conn.commit()
     conn.close()
+    emit('catalog_changed', section='cards')
 
 def delete_card(card_id: int):
     """Kartani o'chiradi"""
@@ -455,6 +576,7 @@ def delete_card(card_id: int):
     cursor.execute('DELETE FROM cards WHERE id = ?', (card_id,))
     conn.commit()
     conn.close()
+    emit('catalog_changed', section='cards')
 
 # ============ CHANNELS ============
 
@@ -533,6 +655,7 @@ def add_video(name: str, file_id: str, description: str = None, is_free: int = 0
     video_id = cursor.lastrowid
     conn.commit()
     conn.close()
+    emit('catalog_changed', section='videos')
     return video_id
 
 def get_all_videos():
@@ -569,6 +692,7 @@ def delete_video(video_id: int):
     cursor.execute('DELETE FROM videos WHERE id = ?', (video_id,))
     conn.commit()
     conn.close()
+    emit('catalog_changed', section='videos')
 
 def toggle_video_free(video_id: int):
     """Video bepul/pullik holatini o'zgartiradi"""
@@ -577,6 +701,7 @@ def toggle_video_free(video_id: int):
     cursor.execute('UPDATE videos SET is_free = NOT is_free WHERE id = ?', (video_id,))
     conn.commit()
     conn.close()
+    emit('catalog_changed', section='videos')
 
 # ============ PRICES ============
 
@@ -590,6 +715,7 @@ def add_price(days: int, price: float, description: str = None):
     ''', (days, price, description))
     conn.commit()
     conn.close()
+    emit('catalog_changed', section='prices')
 
 def get_active_prices():
     """Faol narxlarni qaytaradi"""
@@ -625,6 +751,7 @@ def delete_price(price_id: int):
     cursor.execute('DELETE FROM prices WHERE id = ?', (price_id,))
     conn.commit()
     conn.close()
+    emit('catalog_changed', section='prices')
 
 def toggle_price(price_id: int):
     """Narx holatini o'zgartiradi"""
@@ -633,6 +760,362 @@ def toggle_price(price_id: int):
     cursor.execute('UPDATE prices SET is_active = NOT is_active WHERE id = ?', (price_id,))
     conn.commit()
     conn.close()
+    emit('catalog_changed', section='prices')
+
+# ============ BROADCASTS ============
+
+def create_broadcast(broadcast_type: str, target: str, message_text: str = None, photo_id: str = None,
+                     video_id: str = None, caption: str = None, admin_chat_id: int = None,
+                     progress_message_id: int = None):
+    """Yangi reklama vazifasini navbatga qo'shadi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT INTO broadcasts (broadcast_type, target, message_text, photo_id, video_id, caption,
+                                admin_chat_id, progress_message_id, total_count, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')
+    ''', (broadcast_type, target, message_text, photo_id, video_id, caption,
+          admin_chat_id, progress_message_id, count_broadcast_recipients(target, conn)))
+    broadcast_id = cursor.lastrowid
+    conn.commit()
+    conn.close()
+    emit('broadcast_queued', broadcast_id=broadcast_id)
+    return broadcast_id
+
+def get_broadcast(broadcast_id: int):
+    """Reklama vazifasini qaytaradi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('SELECT * FROM broadcasts WHERE id = ?', (broadcast_id,))
+    broadcast = cursor.fetchone()
+    conn.close()
+    return broadcast
+
+def get_unfinished_broadcasts():
+    """Tugallanmagan (navbatdagi yoki to'xtab qolgan) reklamalarni qaytaradi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT * FROM broadcasts 
+        WHERE status IN ('pending', 'running')
+        ORDER BY id
+    ''')
+    broadcasts = cursor.fetchall()
+    conn.close()
+    return broadcasts
+
+def set_broadcast_status(broadcast_id: int, status: str):
+    """Reklama holatini o'zgartiradi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    if status == 'running':
+        cursor.execute('''
+            UPDATE broadcasts 
+            SET status = ?, started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
+            WHERE id = ?
+        ''', (status, broadcast_id))
+    else:
+        cursor.execute('''
+            UPDATE broadcasts 
+            SET status = ?, finished_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (status, broadcast_id))
+    conn.commit()
+    conn.close()
+
+def checkpoint_broadcast(broadcast_id: int, last_user_id: int, sent: int, failed: int):
+    """Yuborilgan qismni saqlaydi: kursor va hisoblagichlar bitta yozuvda yangilanadi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        UPDATE broadcasts 
+        SET last_user_id = ?, sent_count = sent_count + ?, failed_count = failed_count + ?
+        WHERE id = ?
+    ''', (last_user_id, sent, failed, broadcast_id))
+    conn.commit()
+    conn.close()
+
+def count_broadcast_recipients(target: str, conn=None):
+    """Reklama oluvchilar sonini qaytaradi"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT COUNT(*) FROM users')
+    users_count = cursor.fetchone()[0]
+
+    if target == 'all':
+        count = users_count
+    else:
+        cursor.execute('''
+            SELECT COUNT(*) FROM subscriptions s
+            JOIN users u ON s.user_id = u.user_id
+            WHERE s.is_active = 1
+        ''')
+        subscribers = cursor.fetchone()[0]
+        count = subscribers if target == 'subscribers' else users_count - subscribers
+
+    if own_conn:
+        conn.close()
+    return count
+
+# Reklama maqsadlari: user_id kursoridan keyingi oluvchilar (faol obuna = is_active = 1)
+_BROADCAST_TARGET_QUERIES = {
+    'all': '''
+        SELECT user_id FROM users 
+        WHERE user_id > ?
+        ORDER BY user_id
+        LIMIT ?
+    ''',
+    'subscribers': '''
+        SELECT s.user_id FROM subscriptions s
+        JOIN users u ON u.user_id = s.user_id
+        WHERE s.is_active = 1 AND s.user_id > ?
+        ORDER BY s.user_id
+        LIMIT ?
+    ''',
+    'non_subscribers': '''
+        SELECT u.user_id FROM users u
+        LEFT JOIN subscriptions s ON s.user_id = u.user_id AND s.is_active = 1
+        WHERE u.user_id > ? AND s.user_id IS NULL
+        ORDER BY u.user_id
+        LIMIT ?
+    '''
+}
+
+def get_broadcast_recipients_page(target: str, after_user_id: int = 0, limit: int = 500):
+    """
+    after_user_id'dan keyingi reklama oluvchilar sahifasini (user_id ro'yxati) qaytaradi.
+    Keyingi sahifa uchun kursor - ro'yxatning oxirgi elementi.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(_BROADCAST_TARGET_QUERIES[target], (after_user_id, limit))
+    user_ids = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return user_ids
+
+def iter_broadcast_recipients(target: str, after_user_id: int = 0, page_size: int = 1000):
+    """Reklama oluvchilarni sahifalab oqim ko'rinishida qaytaradi (xotira doimiy)"""
+    while True:
+        page = get_broadcast_recipients_page(target, after_user_id, page_size)
+        if not page:
+            return
+        yield from page
+        after_user_id = page[-1]
+
+def get_broadcasts(limit: int = 20):
+    """Oxirgi reklamalarni qaytaradi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT * FROM broadcasts 
+        ORDER BY created_at DESC 
+        LIMIT ?
+    ''', (limit,))
+    broadcasts = cursor.fetchall()
+    conn.close()
+    return broadcasts
+
+# ============ ADMIN RO'YXATLARI (KEYSET SAHIFALASH) ============
+
+# Har bir ro'yxat (saralash ustuni, id) juftligi bo'yicha sahifalanadi.
+# Kursor - sahifa chetidagi yozuv id'si; uning saralash qiymati ichki so'rov
+# bilan olinadi, shuning uchun har bir sahifa bitta indeksli so'rov.
+#   select  - ustunlar va jadvallar
+#   where   - doimiy shart (params funksiyasi qiymatlarini oladi)
+#   key     - (saralash ustuni, id ustuni)
+#   lookup  - kursor yozuvining saralash qiymati
+#   desc    - yangilari birinchi
+PAGED_LISTS = {
+    'users': dict(
+        select="SELECT u.*, COALESCE(s.is_active, 0) AS is_active, s.expires_at "
+               "FROM users u LEFT JOIN subscriptions s ON s.user_id = u.user_id",
+        where="1 = 1",
+        key=('u.registered_at', 'u.user_id'),
+        lookup="SELECT registered_at FROM users WHERE user_id = ?",
+        desc=True),
+    'pay_pending': dict(
+        select="SELECT p.*, u.username, u.full_name FROM payments p JOIN users u ON p.user_id = u.user_id",
+        where="p.status = 'pending'",
+        key=('p.created_at', 'p.id'),
+        lookup="SELECT created_at FROM payments WHERE id = ?",
+        desc=True),
+    'pay_all': dict(
+        select="SELECT p.*, u.username, u.full_name FROM payments p JOIN users u ON p.user_id = u.user_id",
+        where="1 = 1",
+        key=('p.created_at', 'p.id'),
+        lookup="SELECT created_at FROM payments WHERE id = ?",
+        desc=True),
+    'pay_approved': dict(
+        select="SELECT p.*, u.username, u.full_name FROM payments p JOIN users u ON p.user_id = u.user_id",
+        where="p.status = 'approved'",
+        key=('p.approved_at', 'p.id'),
+        lookup="SELECT approved_at FROM payments WHERE id = ?",
+        desc=True),
+    'pay_rejected': dict(
+        select="SELECT p.*, u.username, u.full_name FROM payments p JOIN users u ON p.user_id = u.user_id",
+        where="p.status = 'rejected'",
+        key=('p.created_at', 'p.id'),
+        lookup="SELECT created_at FROM payments WHERE id = ?",
+        desc=True),
+    'sub_active': dict(
+        select="SELECT s.*, u.username, u.full_name FROM subscriptions s JOIN users u ON s.user_id = u.user_id",
+        where="s.is_active = 1",
+        key=('s.expires_at', 's.id'),
+        lookup="SELECT expires_at FROM subscriptions WHERE id = ?",
+        desc=False),
+    'sub_expiring': dict(
+        select="SELECT s.*, u.username, u.full_name FROM subscriptions s JOIN users u ON s.user_id = u.user_id",
+        where="s.is_active = 1 AND s.expires_at <= ? AND s.expires_at > CURRENT_TIMESTAMP",
+        params=lambda: (datetime.now() + timedelta(days=3),),
+        key=('s.expires_at', 's.id'),
+        lookup="SELECT expires_at FROM subscriptions WHERE id = ?",
+        desc=False),
+    'sub_expired': dict(
+        select="SELECT s.*, u.username, u.full_name FROM subscriptions s JOIN users u ON s.user_id = u.user_id",
+        where="s.is_active = 1 AND s.expires_at <= CURRENT_TIMESTAMP",
+        key=('s.expires_at', 's.id'),
+        lookup="SELECT expires_at FROM subscriptions WHERE id = ?",
+        desc=True),
+    'sub_all': dict(
+        select="SELECT s.*, u.full_name, u.username FROM subscriptions s JOIN users u ON s.user_id = u.user_id",
+        where="1 = 1",
+        key=('s.expires_at', 's.id'),
+        lookup="SELECT expires_at FROM subscriptions WHERE id = ?",
+        desc=True),
+    'broadcasts': dict(
+        select="SELECT * FROM broadcasts b",
+        where="1 = 1",
+        key=('b.created_at', 'b.id'),
+        lookup="SELECT created_at FROM broadcasts WHERE id = ?",
+        desc=True),
+}
+
+def _page_query(list_name: str, cursor_id: int = None, backward: bool = False, limit: int = 20):
+    """get_page() uchun SQL va parametrlar"""
+    spec = PAGED_LISTS[list_name]
+    sort_column, id_column = spec['key']
+    params = list(spec['params']()) if 'params' in spec else []
+    where = spec['where']
+
+    # Orqaga yurish - teskari tartibda o'qib, natijani aylantirish
+    descending = spec['desc'] != backward
+    if cursor_id is not None:
+        op = '<' if descending else '>'
+        where += f" AND ({sort_column}, {id_column}) {op} (({spec['lookup']}), ?)"
+        params += [cursor_id, cursor_id]
+    order = 'DESC' if descending else 'ASC'
+
+    sql = (f"{spec['select']} WHERE {where} "
+           f"ORDER BY {sort_column} {order}, {id_column} {order} LIMIT ?")
+    return sql, params + [limit + 1]
+
+def get_page(list_name: str, cursor_id: int = None, backward: bool = False, limit: int = 20):
+    """
+    Admin ro'yxatining bitta sahifasi.
+    cursor_id berilsa - undan keyingi (backward=True bo'lsa oldingi) yozuvlar.
+    {'items': [...], 'has_prev': bool, 'has_next': bool} qaytaradi.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(*_page_query(list_name, cursor_id, backward, limit))
+    rows = cursor.fetchall()
+    conn.close()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+        return {'items': rows, 'has_prev': has_more, 'has_next': True}
+    return {'items': rows, 'has_prev': cursor_id is not None, 'has_next': has_more}
+
+# ============ FSM STORAGE ============
+
+def get_fsm_record(chat: str, user: str):
+    """Bitta chat/foydalanuvchining FSM holatini qaytaradi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT state, data, updated_at
+        FROM fsm_storage
+        WHERE chat = ? AND user = ?
+    ''', (chat, user))
+    record = cursor.fetchone()
+    conn.close()
+    return record
+
+def save_fsm_records(upserts, deletes):
+    """
+    FSM holatlarini bitta tranzaksiyada saqlaydi.
+    upserts: (chat, user, state, data, updated_at), deletes: (chat, user)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    if upserts:
+        cursor.executemany('''
+            INSERT INTO fsm_storage (chat, user, state, data, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (chat, user) DO UPDATE SET
+                state = excluded.state,
+                data = excluded.data,
+                updated_at = excluded.updated_at
+        ''', upserts)
+    if deletes:
+        cursor.executemany('DELETE FROM fsm_storage WHERE chat = ? AND user = ?', deletes)
+    conn.commit()
+    conn.close()
+
+def delete_idle_fsm_records(before: float) -> int:
+    """`before` vaqtidan beri o'zgarmagan FSM holatlarini o'chiradi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('DELETE FROM fsm_storage WHERE updated_at < ?', (before,))
+    deleted = cursor.rowcount
+    conn.commit()
+    conn.close()
+    return deleted
+
+# ============ LEADER LEASES ============
+
+def acquire_lease(name: str, owner: str, ttl: float) -> bool:
+    """
+    `name` ijarasini `owner` uchun `ttl` soniyaga oladi yoki uzaytiradi.
+    Ijara boshqa egada va muddati tugamagan bo'lsa False qaytaradi.
+    """
+    now = time.time()
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT INTO leader_leases (name, owner, expires_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET
+            owner = excluded.owner,
+            expires_at = excluded.expires_at
+        WHERE leader_leases.owner = excluded.owner OR leader_leases.expires_at < ?
+    ''', (name, owner, now + ttl, now))
+    acquired = cursor.rowcount > 0
+    conn.commit()
+    conn.close()
+    return acquired
+
+def release_lease(name: str, owner: str):
+    """Ijarani bo'shatadi (faqat egasi), boshqa nusxa uni darhol egallay oladi"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('DELETE FROM leader_leases WHERE name = ? AND owner = ?', (name, owner))
+    conn.commit()
+    conn.close()
+
+def get_lease(name: str):
+    """Ijara egasi va tugash vaqti"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('SELECT * FROM leader_leases WHERE name = ?', (name,))
+    lease = cursor.fetchone()
+    conn.close()
+    return lease
 
 # ============ SETTINGS ============
 
@@ -659,48 +1142,25 @@ def set_setting(key: str, value: str):
 # ============ STATISTICS ============
 
 def get_statistics():
-    """Statistika ma'lumotlarini qaytaradi"""
+    """Statistika ma'lumotlarini qaytaradi (triggerlar yuritadigan hisoblagichlardan)"""
     conn = get_connection()
     cursor = conn.cursor()
     
-    stats = {}
-    
-    # Foydalanuvchilar soni
-    cursor.execute('SELECT COUNT(*) FROM users')
-    stats['total_users'] = cursor.fetchone()[0]
-    
-    # Bugungi yangi foydalanuvchilar
-    cursor.execute('''
-        SELECT COUNT(*) FROM users 
-        WHERE DATE(registered_at) = DATE('now')
-    ''')
-    stats['today_users'] = cursor.fetchone()[0]
-    
-    # Faol obunalar
-    cursor.execute('SELECT COUNT(*) FROM subscriptions WHERE is_active = 1')
-    stats['active_subscriptions'] = cursor.fetchone()[0]
-    
-    # Kutayotgan to'lovlar
-    cursor.execute("SELECT COUNT(*) FROM payments WHERE status = 'pending'")
-    stats['pending_payments'] = cursor.fetchone()[0]
-    
-    # Tasdiqlangan to'lovlar
-    cursor.execute("SELECT COUNT(*) FROM payments WHERE status = 'approved'")
-    stats['approved_payments'] = cursor.fetchone()[0]
+    cursor.execute('SELECT name, value FROM stats_counters')
+    stats = {row['name']: row['value'] for row in cursor.fetchall()}
     
-    # Jami to'lovlar summasi
-    cursor.execute("SELECT COALESCE(SUM(amount), 0) FROM payments WHERE status = 'approved'")
-    stats['total_revenue'] = cursor.fetchone()[0]
+    # Bugungi yangi foydalanuvchilar va daromad
+    cursor.execute("SELECT new_users, revenue FROM stats_daily WHERE day = DATE('now')")
+    today = cursor.fetchone()
+    stats['today_users'] = today['new_users'] if today else 0
+    stats['today_revenue'] = today['revenue'] if today else 0
     
     # Bu oydagi to'lovlar
-    cursor.execute('''
-        SELECT COALESCE(SUM(amount), 0) FROM payments 
-        WHERE status = 'approved' 
-        AND strftime('%Y-%m', approved_at) = strftime('%Y-%m', 'now')
-    ''')
-    stats['month_revenue'] = cursor.fetchone()[0]
+    cursor.execute("SELECT revenue FROM stats_monthly WHERE month = strftime('%Y-%m', 'now')")
+    month = cursor.fetchone()
+    stats['month_revenue'] = month['revenue'] if month else 0
     
-    # Muddati tugayotgan obunalar (3 kun ichida)
+    # Muddati tugayotgan obunalar (3 kun ichida) - vaqtga bog'liq, indeks bo'yicha oraliq
     check_date = datetime.now() + timedelta(days=3)
     cursor.execute('''
         SELECT COUNT(*) FROM subscriptions 
@@ -713,5 +1173,24 @@ def get_statistics():
     conn.close()
     return stats
 
-# Initialize database
-init_db()
+def get_daily_stats(days: int = 7):
+    """Oxirgi `days` kunlik yig'indilar (yangi foydalanuvchilar, to'lovlar, daromad)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT * FROM stats_daily 
+        WHERE day > DATE('now', ?)
+        ORDER BY day DESC
+    ''', (f'-{days} days',))
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+def get_monthly_stats(months: int = 12):
+    """Oxirgi `months` oylik yig'indilar"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('SELECT * FROM stats_monthly ORDER BY month DESC LIMIT ?', (months,))
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
@@ -0,0 +1,55 @@
+import logging
+from collections import defaultdict
+
+# Database o'zgarishlari haqida xabar beruvchi oddiy hodisalar tizimi.
+# Hodisalar tranzaksiya commit qilingandan keyin, so'rov bajarilgan thread'da chaqiriladi:
+# tinglovchi asyncio obyektlariga tegsa, loop.call_soon_threadsafe() ishlatishi kerak.
+#
+# Hodisalar:
+#   subscription_activated    user_id, expires_at
+#   subscription_deactivated  user_id
+#   channel_joined            user_id
+#   catalog_changed           section ('prices' | 'cards' | 'videos')
+#   broadcast_queued          broadcast_id
+#
+# Ko'p jarayonli rejimda (utils/supervisor.py) hodisalar forwarder orqali
+# boshqa jarayonlarga ham uzatiladi va u yerda deliver() bilan chaqiriladi.
+
+_listeners = defaultdict(list)
+_forwarder = None
+
+
+def subscribe(event: str, callback):
+    """Hodisaga tinglovchi qo'shadi"""
+    _listeners[event].append(callback)
+
+
+def unsubscribe(event: str, callback):
+    """Tinglovchini olib tashlaydi"""
+    if callback in _listeners[event]:
+        _listeners[event].remove(callback)
+
+
+def set_forwarder(callback):
+    """Har bir hodisani callback(event, payload) ga ham uzatadi (None - o'chirish)"""
+    global _forwarder
+    _forwarder = callback
+
+
+def emit(event: str, **payload):
+    """Hodisani barcha tinglovchilarga yuboradi (tinglovchi xatosi so'rovni buzmaydi)"""
+    deliver(event, **payload)
+    if _forwarder is not None:
+        try:
+            _forwarder(event, payload)
+        except Exception as e:
+            logging.exception(f"'{event}' hodisasini uzatishda xato: {e}")
+
+
+def deliver(event: str, **payload):
+    """Hodisani faqat shu jarayondagi tinglovchilarga yuboradi"""
+    for callback in list(_listeners.get(event, ())):
+        try:
+            callback(**payload)
+        except Exception as e:
+            logging.exception(f"'{event}' hodisasi tinglovchisida xato: {e}")
@@ -0,0 +1,252 @@
+import asyncio
+import copy
+import json
+import logging
+import time
+import typing
+from collections import OrderedDict
+
+from aiogram.dispatcher.storage import BaseStorage
+
+from .async_database import db
+
+
+class _Record:
+    """Bitta chat/foydalanuvchining FSM holati"""
+
+    __slots__ = ('state', 'data', 'updated_at')
+
+    def __init__(self, state=None, data=None, updated_at=0.0):
+        self.state = state
+        self.data = data or {}
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_row(cls, row):
+        if row is None:
+            return cls()
+        return cls(
+            row['state'],
+            json.loads(row['data']) if row['data'] else {},
+            row['updated_at']
+        )
+
+    def is_empty(self) -> bool:
+        return self.state is None and not self.data
+
+    def clear(self):
+        self.state = None
+        self.data = {}
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    SQLite'da saqlanadigan FSM storage (MemoryStorage o'rniga).
+
+    - O'qish/yozish xotiradagi LRU kesh orqali, kesh hajmi `max_size` bilan chegaralangan
+    - O'zgarishlar keshga darhol yoziladi, bazaga esa har `flush_interval` soniyada
+      yoki `flush_batch` ta yig'ilganda bitta tranzaksiyada yoziladi
+    - `ttl` soniya o'zgarmagan holatlar eskirgan hisoblanadi va bazadan o'chiriladi
+    - Throttling bucket'lari (har bir xabarda yangilanadi) faqat xotirada,
+      MemoryStorage'dagidek - bazaga yozilmaydi, qayta ishga tushganda yo'qoladi
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 24 * 3600,
+                 flush_interval: float = 1.0, flush_batch: int = 500,
+                 cleanup_interval: float = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.cleanup_interval = cleanup_interval
+
+        self._cache = OrderedDict()  # (chat, user) -> _Record
+        self._dirty = {}  # bazaga yozilishini kutayotganlar
+        self._flushing = {}  # hozir yozilayotgan partiya
+        self._buckets = OrderedDict()  # (chat, user) -> bucket, faqat xotirada
+        self._flush_event = None
+        self._task = None
+        self._last_cleanup = time.time()
+        self._closed = False
+
+    # ---------- kesh ----------
+
+    def _key(self, chat, user):
+        chat, user = self.check_address(chat=chat, user=user)
+        return str(chat), str(user)
+
+    def _remember(self, key, record: _Record):
+        self._cache[key] = record
+        self._cache.move_to_end(key)
+        # Eng uzoq ishlatilmaganlar chiqariladi; yozilmagan o'zgarishlar _dirty'da qoladi
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def _lookup(self, key):
+        return self._cache.get(key) or self._dirty.get(key) or self._flushing.get(key)
+
+    async def _get(self, chat, user) -> _Record:
+        key = self._key(chat, user)
+        record = self._lookup(key)
+        if record is None:
+            row = await db.get_fsm_record(*key)
+            # Kutish paytida boshqa so'rov shu holatni yuklagan bo'lishi mumkin
+            record = self._lookup(key) or _Record.from_row(row)
+
+        if self.ttl and record.updated_at and record.updated_at < time.time() - self.ttl:
+            record.clear()
+        self._remember(key, record)
+        return record
+
+    def _changed(self, chat, user, record: _Record):
+        key = self._key(chat, user)
+        record.updated_at = time.time()
+        self._dirty[key] = record
+        self._remember(key, record)
+
+        if self._task is None and not self._closed:
+            self._flush_event = asyncio.Event()
+            self._task = asyncio.create_task(self._flusher())
+        if len(self._dirty) >= self.flush_batch:
+            self._flush_event.set()
+
+    # ---------- bazaga yozish ----------
+
+    async def flush(self):
+        """Yig'ilgan o'zgarishlarni bitta tranzaksiyada bazaga yozadi"""
+        if not self._dirty:
+            return
+
+        batch, self._dirty = self._dirty, {}
+        self._flushing = batch
+        upserts, deletes = [], []
+        for (chat, user), record in batch.items():
+            if record.is_empty():
+                deletes.append((chat, user))
+            else:
+                upserts.append((
+                    chat, user, record.state,
+                    json.dumps(record.data), record.updated_at
+                ))
+
+        try:
+            await db.save_fsm_records(upserts, deletes)
+        except Exception:
+            # Keyingi urinishda qayta yoziladi (yangiroq o'zgarishlar ustun)
+            for key, record in batch.items():
+                self._dirty.setdefault(key, record)
+            raise
+        finally:
+            self._flushing = {}
+
+    async def cleanup(self):
+        """Eskirgan holatlarni keshdan va bazadan o'chiradi"""
+        cutoff = time.time() - self.ttl
+        for key in [key for key, record in self._cache.items()
+                    if record.updated_at < cutoff and key not in self._dirty]:
+            del self._cache[key]
+        deleted = await db.delete_idle_fsm_records(cutoff)
+        if deleted:
+            logging.info(f"{deleted} ta eskirgan FSM holati o'chirildi")
+
+    async def _flusher(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+
+            try:
+                await self.flush()
+                if self.ttl and time.time() - self._last_cleanup >= self.cleanup_interval:
+                    self._last_cleanup = time.time()
+                    await self.cleanup()
+            except Exception as e:
+                logging.exception(f"FSM holatlarini saqlashda xato: {e}")
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def wait_closed(self):
+        pass
+
+    # ---------- BaseStorage ----------
+
+    async def get_state(self, *,
+                        chat: typing.Union[str, int, None] = None,
+                        user: typing.Union[str, int, None] = None,
+                        default: typing.Optional[str] = None) -> typing.Optional[str]:
+        record = await self._get(chat, user)
+        return record.state if record.state is not None else self.resolve_state(default)
+
+    async def get_data(self, *,
+                       chat: typing.Union[str, int, None] = None,
+                       user: typing.Union[str, int, None] = None,
+                       default: typing.Optional[dict] = None) -> typing.Dict:
+        record = await self._get(chat, user)
+        return copy.deepcopy(record.data)
+
+    async def set_state(self, *,
+                        chat: typing.Union[str, int, None] = None,
+                        user: typing.Union[str, int, None] = None,
+                        state: typing.AnyStr = None):
+        record = await self._get(chat, user)
+        record.state = self.resolve_state(state)
+        self._changed(chat, user, record)
+
+    async def set_data(self, *,
+                       chat: typing.Union[str, int, None] = None,
+                       user: typing.Union[str, int, None] = None,
+                       data: typing.Dict = None):
+        record = await self._get(chat, user)
+        record.data = copy.deepcopy(data) if data else {}
+        self._changed(chat, user, record)
+
+    async def update_data(self, *,
+                          chat: typing.Union[str, int, None] = None,
+                          user: typing.Union[str, int, None] = None,
+                          data: typing.Dict = None, **kwargs):
+        record = await self._get(chat, user)
+        record.data.update(data or {}, **kwargs)
+        self._changed(chat, user, record)
+
+    def has_bucket(self):
+        return True
+
+    def _bucket(self, chat, user) -> dict:
+        key = self._key(chat, user)
+        bucket = self._buckets.setdefault(key, {})
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_size:
+            self._buckets.popitem(last=False)
+        return bucket
+
+    async def get_bucket(self, *,
+                         chat: typing.Union[str, int, None] = None,
+                         user: typing.Union[str, int, None] = None,
+                         default: typing.Optional[dict] = None) -> typing.Dict:
+        return copy.deepcopy(self._bucket(chat, user))
+
+    async def set_bucket(self, *,
+                         chat: typing.Union[str, int, None] = None,
+                         user: typing.Union[str, int, None] = None,
+                         bucket: typing.Dict = None):
+        self._buckets[self._key(chat, user)] = copy.deepcopy(bucket) if bucket else {}
+        self._bucket(chat, user)
+
+    async def update_bucket(self, *,
+                            chat: typing.Union[str, int, None] = None,
+                            user: typing.Union[str, int, None] = None,
+                            bucket: typing.Dict = None, **kwargs):
+        self._bucket(chat, user).update(bucket or {}, **kwargs)
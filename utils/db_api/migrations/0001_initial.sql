@@ -0,0 +1,97 @@
+-- Boshlang'ich sxema (avvalgi init_db() jadvallari)
+
+-- Foydalanuvchilar jadvali
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT,
+    full_name TEXT,
+    phone TEXT,
+    registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    is_blocked INTEGER DEFAULT 0,
+    language TEXT DEFAULT 'uz'
+);
+
+-- To'lovlar jadvali
+CREATE TABLE IF NOT EXISTS payments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    amount REAL,
+    receipt_photo TEXT,
+    card_id INTEGER,
+    status TEXT DEFAULT 'pending',
+    subscription_days INTEGER DEFAULT 30,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    approved_at TIMESTAMP,
+    expires_at TIMESTAMP,
+    admin_note TEXT,
+    FOREIGN KEY (user_id) REFERENCES users(user_id),
+    FOREIGN KEY (card_id) REFERENCES cards(id)
+);
+
+-- Obunalar jadvali
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER UNIQUE,
+    is_active INTEGER DEFAULT 0,
+    started_at TIMESTAMP,
+    expires_at TIMESTAMP,
+    channel_joined INTEGER DEFAULT 0,
+    last_notified TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+);
+
+-- Kartalar jadvali
+CREATE TABLE IF NOT EXISTS cards (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    card_number TEXT NOT NULL,
+    card_holder TEXT,
+    bank_name TEXT,
+    is_active INTEGER DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Kanallar jadvali
+CREATE TABLE IF NOT EXISTS channels (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel_id TEXT,
+    channel_name TEXT,
+    invite_link TEXT,
+    is_active INTEGER DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Video qo'llanmalar jadvali
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    file_id TEXT NOT NULL,
+    description TEXT,
+    is_free INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Reklama xabarlari jadvali
+CREATE TABLE IF NOT EXISTS broadcasts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    message_text TEXT,
+    photo_id TEXT,
+    video_id TEXT,
+    sent_count INTEGER DEFAULT 0,
+    failed_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Bot sozlamalari jadvali
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Narxlar jadvali
+CREATE TABLE IF NOT EXISTS prices (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    days INTEGER NOT NULL,
+    price REAL NOT NULL,
+    description TEXT,
+    is_active INTEGER DEFAULT 1
+);
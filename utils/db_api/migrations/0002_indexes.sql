@@ -0,0 +1,24 @@
+-- Tez-tez ishlatiladigan so'rovlar uchun indekslar
+
+-- To'lovlar: status bo'yicha ro'yxatlar va statistika
+CREATE INDEX IF NOT EXISTS idx_payments_status_created ON payments (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_payments_status_approved ON payments (status, approved_at);
+CREATE INDEX IF NOT EXISTS idx_payments_user_created ON payments (user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_payments_created ON payments (created_at);
+
+-- Obunalar: faol / tugayotgan / tugagan obunalar
+CREATE INDEX IF NOT EXISTS idx_subscriptions_active_expires ON subscriptions (is_active, expires_at);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_expires ON subscriptions (expires_at);
+
+-- Foydalanuvchilar: bugungi ro'yxatdan o'tganlar
+CREATE INDEX IF NOT EXISTS idx_users_registered ON users (registered_at);
+
+-- Katalog jadvallari
+CREATE INDEX IF NOT EXISTS idx_videos_free_created ON videos (is_free, created_at);
+CREATE INDEX IF NOT EXISTS idx_videos_created ON videos (created_at);
+CREATE INDEX IF NOT EXISTS idx_channels_active ON channels (is_active);
+CREATE INDEX IF NOT EXISTS idx_cards_active ON cards (is_active);
+CREATE INDEX IF NOT EXISTS idx_prices_active_days ON prices (is_active, days);
+
+-- Reklama tarixi
+CREATE INDEX IF NOT EXISTS idx_broadcasts_created ON broadcasts (created_at);
@@ -0,0 +1,18 @@
+-- Reklamalar navbati: har bir reklama - qayta ishga tushganda davom ettiriladigan vazifa
+
+ALTER TABLE broadcasts ADD COLUMN broadcast_type TEXT DEFAULT 'text';
+ALTER TABLE broadcasts ADD COLUMN caption TEXT;
+ALTER TABLE broadcasts ADD COLUMN target TEXT DEFAULT 'all';
+ALTER TABLE broadcasts ADD COLUMN status TEXT DEFAULT 'pending';
+ALTER TABLE broadcasts ADD COLUMN total_count INTEGER DEFAULT 0;
+-- Oxirgi tasdiqlangan (yuborib bo'lingan) user_id - shu joydan davom ettiriladi
+ALTER TABLE broadcasts ADD COLUMN last_user_id INTEGER DEFAULT 0;
+ALTER TABLE broadcasts ADD COLUMN admin_chat_id INTEGER;
+ALTER TABLE broadcasts ADD COLUMN progress_message_id INTEGER;
+ALTER TABLE broadcasts ADD COLUMN started_at TIMESTAMP;
+ALTER TABLE broadcasts ADD COLUMN finished_at TIMESTAMP;
+
+-- Avvalgi yozuvlar qayta yuborilmasin
+UPDATE broadcasts SET status = 'done';
+
+CREATE INDEX IF NOT EXISTS idx_broadcasts_status ON broadcasts (status, id);
@@ -0,0 +1,3 @@
+-- Reklama oluvchilarni user_id tartibida SQL orqali tanlash uchun
+
+CREATE INDEX IF NOT EXISTS idx_subscriptions_active_user ON subscriptions (is_active, user_id);
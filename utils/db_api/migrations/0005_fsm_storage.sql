@@ -0,0 +1,14 @@
+-- FSM holatlari (to'lov, reklama va admin formalari) qayta ishga tushganda yo'qolmasligi uchun.
+-- updated_at - unix vaqt (soniya), eskirgan holatlarni o'chirishda ishlatiladi.
+
+CREATE TABLE IF NOT EXISTS fsm_storage (
+    chat TEXT NOT NULL,
+    user TEXT NOT NULL,
+    state TEXT,
+    data TEXT,
+    bucket TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (chat, user)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_fsm_storage_updated ON fsm_storage (updated_at);
@@ -0,0 +1,152 @@
+-- Admin statistikasi uchun hisoblagichlar va kunlik/oylik yig'indilar.
+-- Triggerlar orqali yoziladigan so'rov bilan bitta tranzaksiyada yangilanadi,
+-- shuning uchun get_statistics() jadvallar hajmidan qat'i nazar bir nechta qatorni o'qiydi.
+-- Sanalar CURRENT_TIMESTAMP kabi UTC bo'yicha.
+
+CREATE TABLE IF NOT EXISTS stats_counters (
+    name TEXT PRIMARY KEY,
+    value NUMERIC NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS stats_daily (
+    day TEXT PRIMARY KEY,  -- YYYY-MM-DD
+    new_users INTEGER NOT NULL DEFAULT 0,
+    new_payments INTEGER NOT NULL DEFAULT 0,
+    approved_payments INTEGER NOT NULL DEFAULT 0,
+    revenue NUMERIC NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS stats_monthly (
+    month TEXT PRIMARY KEY,  -- YYYY-MM
+    new_users INTEGER NOT NULL DEFAULT 0,
+    new_payments INTEGER NOT NULL DEFAULT 0,
+    approved_payments INTEGER NOT NULL DEFAULT 0,
+    revenue NUMERIC NOT NULL DEFAULT 0
+);
+
+-- Mavjud ma'lumotlardan boshlang'ich qiymatlar
+INSERT OR REPLACE INTO stats_counters (name, value)
+SELECT 'total_users', COUNT(*) FROM users
+UNION ALL SELECT 'active_subscriptions', COUNT(*) FROM subscriptions WHERE is_active = 1
+UNION ALL SELECT 'pending_payments', COUNT(*) FROM payments WHERE status = 'pending'
+UNION ALL SELECT 'approved_payments', COUNT(*) FROM payments WHERE status = 'approved'
+UNION ALL SELECT 'total_revenue', COALESCE(SUM(amount), 0) FROM payments WHERE status = 'approved';
+
+INSERT OR REPLACE INTO stats_daily (day, new_users, new_payments, approved_payments, revenue)
+SELECT day, SUM(new_users), SUM(new_payments), SUM(approved_payments), SUM(revenue) FROM (
+    SELECT DATE(registered_at) AS day, 1 AS new_users, 0 AS new_payments, 0 AS approved_payments, 0 AS revenue
+    FROM users WHERE registered_at IS NOT NULL
+    UNION ALL
+    SELECT DATE(created_at), 0, 1, 0, 0 FROM payments WHERE created_at IS NOT NULL
+    UNION ALL
+    SELECT DATE(approved_at), 0, 0, 1, amount FROM payments WHERE status = 'approved' AND approved_at IS NOT NULL
+)
+GROUP BY day;
+
+INSERT OR REPLACE INTO stats_monthly (month, new_users, new_payments, approved_payments, revenue)
+SELECT substr(day, 1, 7), SUM(new_users), SUM(new_payments), SUM(approved_payments), SUM(revenue)
+FROM stats_daily
+GROUP BY substr(day, 1, 7);
+
+-- ---------- users ----------
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_users_insert AFTER INSERT ON users
+BEGIN
+    UPDATE stats_counters SET value = value + 1 WHERE name = 'total_users';
+    INSERT INTO stats_daily (day, new_users) VALUES (DATE(COALESCE(NEW.registered_at, 'now')), 1)
+        ON CONFLICT (day) DO UPDATE SET new_users = new_users + 1;
+    INSERT INTO stats_monthly (month, new_users) VALUES (strftime('%Y-%m', COALESCE(NEW.registered_at, 'now')), 1)
+        ON CONFLICT (month) DO UPDATE SET new_users = new_users + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_users_delete AFTER DELETE ON users
+BEGIN
+    UPDATE stats_counters SET value = value - 1 WHERE name = 'total_users';
+END;
+
+-- ---------- subscriptions ----------
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_subscriptions_insert AFTER INSERT ON subscriptions
+WHEN NEW.is_active = 1
+BEGIN
+    UPDATE stats_counters SET value = value + 1 WHERE name = 'active_subscriptions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_subscriptions_update AFTER UPDATE OF is_active ON subscriptions
+WHEN COALESCE(NEW.is_active, 0) != COALESCE(OLD.is_active, 0)
+BEGIN
+    UPDATE stats_counters
+    SET value = value + (CASE WHEN NEW.is_active = 1 THEN 1 ELSE -1 END)
+    WHERE name = 'active_subscriptions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_subscriptions_delete AFTER DELETE ON subscriptions
+WHEN OLD.is_active = 1
+BEGIN
+    UPDATE stats_counters SET value = value - 1 WHERE name = 'active_subscriptions';
+END;
+
+-- ---------- payments ----------
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_payments_insert AFTER INSERT ON payments
+BEGIN
+    UPDATE stats_counters SET value = value + 1
+    WHERE name = 'pending_payments' AND NEW.status = 'pending';
+    INSERT INTO stats_daily (day, new_payments) VALUES (DATE(COALESCE(NEW.created_at, 'now')), 1)
+        ON CONFLICT (day) DO UPDATE SET new_payments = new_payments + 1;
+    INSERT INTO stats_monthly (month, new_payments) VALUES (strftime('%Y-%m', COALESCE(NEW.created_at, 'now')), 1)
+        ON CONFLICT (month) DO UPDATE SET new_payments = new_payments + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_payments_status AFTER UPDATE OF status ON payments
+WHEN NEW.status IS NOT OLD.status
+BEGIN
+    UPDATE stats_counters
+    SET value = value + (NEW.status = 'pending') - (OLD.status = 'pending')
+    WHERE name = 'pending_payments';
+    UPDATE stats_counters
+    SET value = value + (NEW.status = 'approved') - (OLD.status = 'approved')
+    WHERE name = 'approved_payments';
+    UPDATE stats_counters
+    SET value = value + (CASE WHEN NEW.status = 'approved' THEN COALESCE(NEW.amount, 0) ELSE 0 END)
+                      - (CASE WHEN OLD.status = 'approved' THEN COALESCE(OLD.amount, 0) ELSE 0 END)
+    WHERE name = 'total_revenue';
+END;
+
+-- Tasdiqlangan to'lov tasdiqlangan kun/oy yig'indisiga qo'shiladi
+CREATE TRIGGER IF NOT EXISTS trg_stats_payments_approved AFTER UPDATE OF status ON payments
+WHEN NEW.status = 'approved' AND OLD.status IS NOT 'approved'
+BEGIN
+    INSERT INTO stats_daily (day, approved_payments, revenue)
+        VALUES (DATE(COALESCE(NEW.approved_at, 'now')), 1, COALESCE(NEW.amount, 0))
+        ON CONFLICT (day) DO UPDATE SET
+            approved_payments = approved_payments + 1,
+            revenue = revenue + excluded.revenue;
+    INSERT INTO stats_monthly (month, approved_payments, revenue)
+        VALUES (strftime('%Y-%m', COALESCE(NEW.approved_at, 'now')), 1, COALESCE(NEW.amount, 0))
+        ON CONFLICT (month) DO UPDATE SET
+            approved_payments = approved_payments + 1,
+            revenue = revenue + excluded.revenue;
+END;
+
+-- Tasdiq bekor qilinsa (masalan, keyin rad etilsa) o'sha kun/oydan ayiriladi
+CREATE TRIGGER IF NOT EXISTS trg_stats_payments_unapproved AFTER UPDATE OF status ON payments
+WHEN OLD.status = 'approved' AND NEW.status IS NOT 'approved' AND OLD.approved_at IS NOT NULL
+BEGIN
+    UPDATE stats_daily
+    SET approved_payments = approved_payments - 1, revenue = revenue - COALESCE(OLD.amount, 0)
+    WHERE day = DATE(OLD.approved_at);
+    UPDATE stats_monthly
+    SET approved_payments = approved_payments - 1, revenue = revenue - COALESCE(OLD.amount, 0)
+    WHERE month = strftime('%Y-%m', OLD.approved_at);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_payments_delete AFTER DELETE ON payments
+BEGIN
+    UPDATE stats_counters SET value = value - 1
+    WHERE name = 'pending_payments' AND OLD.status = 'pending';
+    UPDATE stats_counters SET value = value - 1
+    WHERE name = 'approved_payments' AND OLD.status = 'approved';
+    UPDATE stats_counters SET value = value - COALESCE(OLD.amount, 0)
+    WHERE name = 'total_revenue' AND OLD.status = 'approved';
+END;
@@ -0,0 +1,31 @@
+-- Admin paneli uchun foydalanuvchi qidiruvi.
+-- @username prefiksi - NOCASE indeks (LIKE 'abc%' shu indeksdan foydalanadi),
+-- ism bo'yicha qism-satr - FTS5 trigram jadvali (3 va undan ko'p belgi).
+
+CREATE INDEX IF NOT EXISTS idx_users_username ON users (username COLLATE NOCASE);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+    full_name,
+    content = 'users',
+    content_rowid = 'user_id',
+    tokenize = 'trigram'
+);
+
+-- Mavjud foydalanuvchilarni indekslash
+INSERT INTO users_fts (users_fts) VALUES ('rebuild');
+
+CREATE TRIGGER IF NOT EXISTS trg_users_fts_insert AFTER INSERT ON users
+BEGIN
+    INSERT INTO users_fts (rowid, full_name) VALUES (NEW.user_id, NEW.full_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_users_fts_delete AFTER DELETE ON users
+BEGIN
+    INSERT INTO users_fts (users_fts, rowid, full_name) VALUES ('delete', OLD.user_id, OLD.full_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_users_fts_update AFTER UPDATE OF full_name ON users
+BEGIN
+    INSERT INTO users_fts (users_fts, rowid, full_name) VALUES ('delete', OLD.user_id, OLD.full_name);
+    INSERT INTO users_fts (rowid, full_name) VALUES (NEW.user_id, NEW.full_name);
+END;
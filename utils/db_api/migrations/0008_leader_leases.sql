@@ -0,0 +1,10 @@
+-- Bir nechta jarayon/nusxa ishlaganda yagona bo'lishi kerak bo'lgan vazifalar
+-- (scheduler, reklama navbati) uchun ijaraga olinadigan qulf.
+-- Egasi ijarani muddati tugashidan oldin yangilab turadi; yangilanmasa
+-- (jarayon o'lgan) boshqa nusxa uni egallaydi.
+
+CREATE TABLE IF NOT EXISTS leader_leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL  -- unix vaqt (soniya)
+) WITHOUT ROWID;
@@ -0,0 +1,68 @@
+import logging
+import os
+import re
+import sqlite3
+
+MIGRATIONS_DIR = os.path.dirname(__file__)
+
+_FILENAME_RE = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+
+def get_migrations():
+    """Migratsiya fayllarini versiya tartibida qaytaradi: [(version, name, path), ...]"""
+    migrations = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = _FILENAME_RE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    migrations.sort()
+    return migrations
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Database'ning joriy sxema versiyasini qaytaradi"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+
+def run_migrations(conn: sqlite3.Connection):
+    """
+    Hali qo'llanilmagan migratsiyalarni tartib bilan bajaradi.
+    Har bir migratsiya alohida tranzaksiyada ishlaydi.
+    Qo'llanilgan versiyalar ro'yxatini qaytaradi.
+    """
+    current = get_schema_version(conn)
+    conn.commit()
+
+    applied = []
+    for version, name, path in get_migrations():
+        if version <= current:
+            continue
+
+        with open(path, encoding='utf-8') as f:
+            sql = f.read()
+
+        try:
+            conn.executescript(
+                'BEGIN IMMEDIATE;\n'
+                f'{sql}\n'
+                f"INSERT INTO schema_version (version, name) VALUES ({version}, '{name}');\n"
+                'COMMIT;'
+            )
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            logging.exception(f"Migratsiya {version:04d}_{name} bajarilmadi")
+            raise
+
+        logging.info(f"Migratsiya qo'llanildi: {version:04d}_{name}")
+        applied.append(version)
+
+    return applied
@@ -0,0 +1,158 @@
+import queue
+import sqlite3
+import threading
+
+from .profiler import ProfiledCursor
+
+
+class PooledConnection:
+    """
+    Pool'dan olingan ulanish.
+    sqlite3.Connection kabi ishlaydi, faqat close() ulanishni yopmaydi -
+    uni pool'ga qaytaradi.
+    """
+
+    def __init__(self, pool, conn: sqlite3.Connection):
+        self._pool = pool
+        self._conn = conn
+        self._cursors = []  # profiler yoqilgan bo'lsa - yakunlanmagan so'rovlar
+
+    def __getattr__(self, item):
+        if item.startswith('_'):
+            raise AttributeError(item)
+        return getattr(self._conn, item)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self._conn.commit()
+        self.close()
+
+    def __del__(self):
+        # close() chaqirilmay qolgan ulanish yo'qolib ketmasligi uchun
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @property
+    def raw(self) -> sqlite3.Connection:
+        return self._conn
+
+    def cursor(self):
+        cursor = self._conn.cursor()
+        if self._pool.profiler is None:
+            return cursor
+        cursor = ProfiledCursor(self._pool.profiler, self._conn, cursor)
+        self._cursors.append(cursor)
+        return cursor
+
+    # sqlite3.Connection'ning qisqa yo'llari - profiler cursor'idan o'tsin
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+    def close(self):
+        """Ulanishni pool'ga qaytaradi"""
+        if self._conn is None:
+            return
+        for cursor in self._cursors:
+            cursor.finish()
+        self._cursors.clear()
+        conn, self._conn = self._conn, None
+        self._pool.release(conn)
+
+
+class ConnectionPool:
+    """
+    Uzoq yashovchi SQLite ulanishlari pool'i.
+    PRAGMA'lar har bir ulanish ochilganda bir marta qo'llaniladi.
+    """
+
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 30.0,
+                 mmap_size: int = 256 * 1024 * 1024, cache_size: int = -64000, profiler=None):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.mmap_size = mmap_size
+        self.cache_size = cache_size
+        # utils/db_api/profiler.py: QueryProfiler (None - o'lchanmaydi)
+        self.profiler = profiler
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA mmap_size={int(self.mmap_size)}')
+        conn.execute(f'PRAGMA cache_size={int(self.cache_size)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """Bo'sh ulanishni qaytaradi, kerak bo'lsa yangisini ochadi"""
+        if self._closed:
+            raise RuntimeError("Connection pool yopilgan")
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    create = True
+                else:
+                    create = False
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError("Bo'sh ulanish kutish vaqti tugadi")
+
+        return PooledConnection(self, conn)
+
+    def release(self, conn: sqlite3.Connection):
+        """Ulanishni pool'ga qaytaradi (yakunlanmagan tranzaksiya bekor qilinadi)"""
+        if conn.in_transaction:
+            conn.rollback()
+
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._created -= 1
+            return
+
+        self._idle.put(conn)
+
+    def close(self):
+        """Barcha bo'sh ulanishlarni yopadi"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
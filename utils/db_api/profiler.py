@@ -0,0 +1,230 @@
+"""
+So'rovlar profileri: har bir SQL uchun chaqiruvlar soni, umumiy/eng katta
+vaqt, qaytgan qatorlar va uni chaqirgan funksiyalar. Chegaradan sekin so'rov
+EXPLAIN QUERY PLAN bilan log'ga yoziladi.
+
+Pool profiler bilan yaratilsa (DB_PROFILE / DB_SLOW_QUERY_MS) PooledConnection
+cursor'lari ProfiledCursor'ga o'raladi; aks holda hech qanday qo'shimcha ish yo'q.
+"""
+import collections
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+
+# EXPLAIN QUERY PLAN faqat shu so'rovlar uchun (PRAGMA, BEGIN, CREATE ... emas)
+_EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+# Chaqiruvchi qidirilganda o'tkazib yuboriladigan fayllar
+_SKIP_FILES = (os.path.join('db_api', 'pool.py'), os.path.join('db_api', 'profiler.py'))
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize(sql: str) -> str:
+    """Bo'shliqlarni yig'adi: bir xil so'rov bir xil kalit bo'lsin"""
+    return ' '.join(sql.split())
+
+
+def _caller() -> str:
+    """Ulanishdan foydalangan funksiya (masalan, 'database.get_user')"""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename.endswith(_SKIP_FILES):
+        frame = frame.f_back
+    if frame is None:
+        return 'unknown'
+    module = frame.f_globals.get('__name__', '?').rsplit('.', 1)[-1]
+    return f"{module}.{frame.f_code.co_name}"
+
+
+class QueryStats:
+    __slots__ = ('calls', 'total', 'max', 'rows', 'callers')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.callers = collections.Counter()
+
+
+class QueryProfiler:
+    """
+    So'rovlar statistikasi (barcha DB thread'lari uchun umumiy).
+
+    - `profile` - har bir so'rov statistikasini yig'ish
+    - `slow_ms` - shundan sekin so'rovlar log'ga yoziladi (0 - o'chiq)
+    """
+
+    def __init__(self, profile: bool = True, slow_ms: float = 0):
+        self.profile = profile
+        self.slow = slow_ms / 1000
+        self._stats = {}  # normallashgan SQL -> QueryStats
+        self._lock = threading.Lock()
+
+    def record(self, conn, sql: str, params, caller: str, elapsed: float, rows: int):
+        if self.profile:
+            key = normalize(sql)
+            with self._lock:
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = QueryStats()
+                stats.calls += 1
+                stats.total += elapsed
+                stats.rows += rows
+                stats.callers[caller] += 1
+                if elapsed > stats.max:
+                    stats.max = elapsed
+        if self.slow and elapsed >= self.slow:
+            self._log_slow(conn, sql, params, caller, elapsed, rows)
+
+    def _log_slow(self, conn, sql: str, params, caller: str, elapsed: float, rows: int):
+        message = f"Sekin so'rov: {elapsed * 1000:.1f} ms, {rows} qator ({caller})\n  {normalize(sql)}"
+        # executemany'da parametrlar to'plami - reja olinmaydi
+        if params is not None and normalize(sql).upper().startswith(_EXPLAINABLE):
+            try:
+                plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or ()).fetchall()
+            except Exception as e:
+                message += f"\n  (reja olinmadi: {e})"
+            else:
+                depth = {0: 0}
+                for node, parent, _, detail in plan:
+                    depth[node] = depth.get(parent, 0) + 1
+                    message += f"\n  {'  ' * depth[node]}{detail}"
+        logging.warning(message)
+
+    def stats(self) -> list:
+        """So'rovlar umumiy vaqt bo'yicha kamayish tartibida"""
+        with self._lock:
+            items = [
+                {
+                    'sql': sql,
+                    'calls': stats.calls,
+                    'total_ms': stats.total * 1000,
+                    'avg_ms': stats.total * 1000 / stats.calls,
+                    'max_ms': stats.max * 1000,
+                    'rows': stats.rows,
+                    'callers': dict(stats.callers),
+                }
+                for sql, stats in self._stats.items()
+            ]
+        return sorted(items, key=lambda item: item['total_ms'], reverse=True)
+
+    def callers(self) -> dict:
+        """Funksiya -> so'rovlar soni (N+1 shu yerda ko'rinadi)"""
+        counts = collections.Counter()
+        with self._lock:
+            for stats in self._stats.values():
+                counts.update(stats.callers)
+        return dict(counts.most_common())
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def report(self, limit: int = 20) -> str:
+        """Log uchun matnli hisobot"""
+        lines = [f"{'soni':>9} {'jami ms':>10} {'avg ms':>9} {'max ms':>9} {'qator':>9}  so'rov"]
+        for item in self.stats()[:limit]:
+            callers = ', '.join(f"{name} {count}" for name, count in item['callers'].items())
+            lines.append(f"{item['calls']:9} {item['total_ms']:10.1f} {item['avg_ms']:9.3f} "
+                         f"{item['max_ms']:9.1f} {item['rows']:9}  {item['sql'][:120]}")
+            lines.append(f"{'':51}<- {callers}")
+        return '\n'.join(lines)
+
+
+class ProfiledCursor:
+    """
+    sqlite3.Cursor o'rami: execute() dan natija to'liq o'qilguncha (yoki
+    cursor/ulanish yopilguncha) bo'lgan vaqt va qatorlar bitta so'rovga yoziladi.
+    """
+
+    def __init__(self, profiler: QueryProfiler, conn, cursor):
+        self._profiler = profiler
+        self._conn = conn
+        self._cursor = cursor
+        self._query = None  # (sql, params, chaqiruvchi)
+        self._elapsed = 0.0
+        self._rows = 0
+
+    def __getattr__(self, item):
+        return getattr(self._cursor, item)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = next(self._cursor)
+        except StopIteration:
+            self._elapsed += time.perf_counter() - started
+            self.finish()
+            raise
+        self._elapsed += time.perf_counter() - started
+        self._rows += 1
+        return row
+
+    def _start(self, sql, params, method, *args):
+        self.finish()
+        self._query = (sql, params, _caller())
+        started = time.perf_counter()
+        try:
+            method(sql, *args)
+        finally:
+            self._elapsed = time.perf_counter() - started
+        if self._cursor.description is None:
+            # SELECT emas: natija yo'q, so'rov tugadi
+            self._rows = max(self._cursor.rowcount, 0)
+            self.finish()
+        return self
+
+    def execute(self, sql, params=()):
+        return self._start(sql, params, self._cursor.execute, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self._start(sql, None, self._cursor.executemany, seq_of_params)
+
+    def executescript(self, script):
+        return self._start(script, None, self._cursor.executescript)
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        self._elapsed += time.perf_counter() - started
+        return result
+
+    def fetchone(self):
+        row = self._fetch(self._cursor.fetchone)
+        if row is None:
+            self.finish()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._fetch(self._cursor.fetchmany, size or self._cursor.arraysize)
+        self._rows += len(rows)
+        if not rows:
+            self.finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(self._cursor.fetchall)
+        self._rows += len(rows)
+        self.finish()
+        return rows
+
+    def finish(self):
+        """Joriy so'rovni statistikaga yozadi (ikkinchi chaqiruv hech narsa qilmaydi)"""
+        if self._query is None:
+            return
+        (sql, params, caller), self._query = self._query, None
+        self._profiler.record(self._conn, sql, params, caller, self._elapsed, self._rows)
+        self._elapsed = 0.0
+        self._rows = 0
+
+    def close(self):
+        self.finish()
+        self._cursor.close()
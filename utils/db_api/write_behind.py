@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import os
+
+from .async_database import db
+
+# Navbat sozlamalari (.env orqali o'zgartirish mumkin)
+DB_WRITE_BEHIND_MS = int(os.getenv("DB_WRITE_BEHIND_MS", 500))
+DB_WRITE_BEHIND_BATCH = int(os.getenv("DB_WRITE_BEHIND_BATCH", 500))
+
+
+class WriteBehindQueue:
+    """
+    Tez-tez keladigan kichik idempotent yozuvlar uchun navbat.
+
+    add_user, mark_channel_joined va update_last_notified darhol bazaga
+    yozilmaydi: kalit bo'yicha birlashtiriladi (bitta foydalanuvchining
+    takroriy /start'i - bitta yozuv) va har `interval` soniyada yoki `batch`
+    ta yig'ilganda bitta tranzaksiyada yoziladi. close() qolganini yozadi.
+    """
+
+    def __init__(self, interval: float = 0.5, batch: int = 500):
+        self.interval = interval
+        self.batch = batch
+
+        self._users = {}  # user_id -> (user_id, username, full_name)
+        self._joined = set()
+        self._notified = set()
+        self._flush_event = None
+        self._task = None
+        self._closed = False
+
+        self.queued = 0
+        self.written = 0
+        self.flushes = 0
+
+    def __len__(self):
+        return len(self._users) + len(self._joined) + len(self._notified)
+
+    # ---------- navbatga qo'shish ----------
+
+    def add_user(self, user_id: int, username: str = None, full_name: str = None):
+        # INSERT OR IGNORE - birinchi yozuv yetarli
+        self._users.setdefault(user_id, (user_id, username, full_name))
+        self._queued()
+
+    def mark_channel_joined(self, user_id: int):
+        self._joined.add(user_id)
+        self._queued()
+
+    def update_last_notified(self, user_id: int):
+        self._notified.add(user_id)
+        self._queued()
+
+    def _queued(self):
+        self.queued += 1
+        if self._closed:
+            # To'xtash jarayonida navbat yo'q - keyingi flush() yozadi
+            return
+        if self._task is None:
+            self._flush_event = asyncio.Event()
+            self._task = asyncio.create_task(self._flusher())
+        if len(self) >= self.batch:
+            self._flush_event.set()
+
+    # ---------- bazaga yozish ----------
+
+    async def flush(self):
+        """Yig'ilgan yozuvlarni bitta tranzaksiyada bazaga yozadi"""
+        if not len(self):
+            return
+
+        users, self._users = self._users, {}
+        joined, self._joined = self._joined, set()
+        notified, self._notified = self._notified, set()
+
+        try:
+            await db.apply_queued_writes(list(users.values()), list(joined), list(notified))
+        except Exception:
+            # Keyingi urinishda qayta yoziladi
+            for user_id, row in users.items():
+                self._users.setdefault(user_id, row)
+            self._joined |= joined
+            self._notified |= notified
+            raise
+
+        self.written += len(users) + len(joined) + len(notified)
+        self.flushes += 1
+
+    async def _flusher(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logging.exception(f"Navbatdagi yozuvlarni saqlashda xato: {e}")
+
+    async def close(self):
+        """Fon vazifasini to'xtatib, qolgan yozuvlarni saqlaydi"""
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            'pending': len(self),
+            'queued': self.queued,
+            'written': self.written,
+            'flushes': self.flushes,
+        }
+
+
+writes = WriteBehindQueue(interval=DB_WRITE_BEHIND_MS / 1000, batch=DB_WRITE_BEHIND_BATCH)
@@ -0,0 +1,157 @@
+"""
+Yagona vazifalar uchun lider tanlash.
+
+Bot bir nechta nusxada (replika yoki WORKERS > 1) ishlaganda obunalar
+scheduleri va reklama navbati faqat bitta nusxada ishlashi kerak - aks holda
+ogohlantirishlar ikki marta yuboriladi va foydalanuvchilar ikki marta chiqariladi.
+
+Lider `leader_leases` jadvalidagi ijarani har `ttl / 3` soniyada uzaytiradi.
+Qolgan nusxalar har `retry` soniyada ijarani olishga urinadi:
+- lider to'xtasa ijarani bo'shatadi, boshqasi ~`retry` soniyada egallaydi
+- lider kutilmaganda o'lsa ijara ko'pi bilan `ttl` soniyada bo'shaydi
+- ijarani uzaytira olmagan lider muddati tugaguncha vazifalarni to'xtatadi
+"""
+import abc
+import asyncio
+import logging
+import os
+import socket
+import time
+
+from aiogram import Bot
+
+from data.config import LEADER_LEASE_TTL
+from utils.broadcast_jobs import broadcast_worker
+from utils.db_api import db
+from utils.scheduler import subscription_scheduler
+
+SINGLETON_JOBS = 'singleton_jobs'
+
+
+class LeaseStore(abc.ABC):
+    """Ijara ombori interfeysi (boshqa bazalar uchun shu klassdan meros olinadi)"""
+
+    @abc.abstractmethod
+    async def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        """Ijarani olish yoki uzaytirish; boshqa egada bo'lsa False"""
+
+    @abc.abstractmethod
+    async def release(self, name: str, owner: str):
+        """Ijarani bo'shatish (faqat `owner` egasi bo'lsa)"""
+
+
+class SQLiteLeaseStore(LeaseStore):
+    """Ijara bot bazasidagi leader_leases jadvalida saqlanadi"""
+
+    async def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        return await db.acquire_lease(name, owner, ttl)
+
+    async def release(self, name: str, owner: str):
+        await db.release_lease(name, owner)
+
+
+class LeaderElection:
+    """
+    Ijarani olgan nusxada `jobs` vazifalarini ishlatadi, yo'qotganda to'xtatadi.
+    jobs: {nom: korutina yaratuvchi funksiya}
+    """
+
+    def __init__(self, name: str, jobs: dict, store: LeaseStore = None,
+                 ttl: float = 15, retry: float = 1, owner: str = None, on_change=None):
+        self.name = name
+        self.jobs = jobs
+        # on_change(is_leader) - liderlik olinganda/yo'qotilganda
+        self.on_change = on_change
+        self.store = store or SQLiteLeaseStore()
+        self.ttl = ttl
+        self.retry = retry
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+
+        self._tasks = {}  # nom -> asyncio.Task
+        self._renewed_at = 0.0
+        self._task = None
+
+    @property
+    def is_leader(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Vazifalarni to'xtatib, ijarani bo'shatadi"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run(self):
+        try:
+            while True:
+                await self._heartbeat()
+                await asyncio.sleep(self.ttl / 3 if self.is_leader else self.retry)
+        finally:
+            if self.is_leader:
+                await self._revoke()
+                try:
+                    await self.store.release(self.name, self.owner)
+                except Exception as e:
+                    logging.exception(f"Ijarani bo'shatishda xato: {e}")
+
+    async def _heartbeat(self):
+        started = time.monotonic()
+        try:
+            if self.is_leader:
+                # Baza band bo'lsa acquire busy_timeout'gacha (30s) kutishi mumkin - ijara
+                # muddati tugaguncha javob kelmasa vazifalar boshqa nusxa egallashidan oldin to'xtaydi
+                acquired = await asyncio.wait_for(
+                    self.store.acquire(self.name, self.owner, self.ttl),
+                    timeout=max(0.0, self._renewed_at + self.ttl - started)
+                )
+            else:
+                acquired = await self.store.acquire(self.name, self.owner, self.ttl)
+        except asyncio.TimeoutError:
+            logging.warning(f"Ijara muddati ichida yangilanmadi ({self.name}, {self.owner})")
+            acquired = False
+        except Exception as e:
+            logging.exception(f"Ijarani yangilashda xato: {e}")
+            # Oxirgi muvaffaqiyatli yangilanishdan ttl o'tmaguncha ijara bizniki
+            acquired = self.is_leader and started - self._renewed_at < self.ttl
+        else:
+            if acquired:
+                self._renewed_at = started
+
+        if acquired:
+            self._elect()
+        elif self.is_leader:
+            logging.warning(f"Ijara yo'qotildi, vazifalar to'xtatildi ({self.name}, {self.owner})")
+            await self._revoke()
+
+    def _elect(self):
+        if not self.is_leader:
+            logging.info(f"Lider: {self.owner} ({self.name}: {', '.join(self.jobs)})")
+            if self.on_change:
+                self.on_change(True)
+        for job, factory in self.jobs.items():
+            task = self._tasks.get(job)
+            if task is not None and not task.done():
+                continue
+            if task is not None and not task.cancelled() and task.exception():
+                logging.error(f"{job} xato bilan to'xtadi, qayta ishga tushirilmoqda", exc_info=task.exception())
+            self._tasks[job] = asyncio.create_task(factory())
+
+    async def _revoke(self):
+        tasks, self._tasks = list(self._tasks.values()), {}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.on_change:
+            self.on_change(False)
+
+
+def singleton_jobs(bot: Bot, on_change=None) -> LeaderElection:
+    """Obunalar scheduleri va reklama navbati - bitta nusxada ishlaydi"""
+    return LeaderElection(SINGLETON_JOBS, {
+        'scheduler': lambda: subscription_scheduler(bot),
+        'broadcasts': lambda: broadcast_worker(bot),
+    }, ttl=LEADER_LEASE_TTL, on_change=on_change)
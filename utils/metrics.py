@@ -0,0 +1,118 @@
+"""
+Bot metrikalari (Prometheus text formatida): update'lar soni, ishlanayotganlar,
+handler'lar kechikishi gistogrammasi va xatolar. Qiymatlarni
+middlewares/metrics.py va errors_handler yozadi, start_metrics_server() esa
+lokal /metrics endpoint'ini ochadi.
+
+Hammasi bitta event loop'da yangilanadi - lock kerak emas.
+"""
+import bisect
+import collections
+import logging
+
+from aiohttp import web
+
+from utils.misc.updates import update_type
+
+# Gistogramma chegaralari, soniya
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """Bitta label qiymati uchun gistogramma (chegaralar bo'yicha sanoq, yig'indi)"""
+
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # oxirgisi - +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """Jarayonning barcha metrikalari (har bir worker jarayonida alohida)"""
+
+    def __init__(self):
+        self.updates = collections.Counter()  # update turi -> soni
+        self.in_flight = 0
+        self.update_duration = collections.defaultdict(Histogram)  # update turi -> gistogramma
+        self.handler_duration = collections.defaultdict(Histogram)  # handler -> gistogramma
+        self.errors = collections.Counter()  # (update turi, xato turi) -> soni
+        self._gauges = []  # (nom, turi, izoh, funksiya)
+
+    def error(self, update, exception: BaseException):
+        """errors_handler chaqiradi"""
+        kind = update_type(update) if update else 'unknown'
+        self.errors[kind, type(exception).__name__] += 1
+
+    def register(self, name: str, kind: str, help: str, collect):
+        """Tashqi qiymat (masalan, navbat hajmi): `collect()` /metrics so'ralganda chaqiriladi"""
+        self._gauges.append((name, kind, help, collect))
+
+    def render(self) -> str:
+        lines = []
+
+        def header(name, kind, help):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name, label, values):
+            for key, hist in sorted(values.items()):
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ('+Inf',), hist.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{label}="{_label(key)}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{label}="{_label(key)}"}} {hist.sum:.6f}')
+                lines.append(f'{name}_count{{{label}="{_label(key)}"}} {hist.count}')
+
+        header('bot_updates_total', 'counter', "Qabul qilingan update'lar (turi bo'yicha)")
+        for kind, count in sorted(self.updates.items()):
+            lines.append(f'bot_updates_total{{type="{_label(kind)}"}} {count}')
+
+        header('bot_updates_in_flight', 'gauge', "Hozir ishlanayotgan update'lar")
+        lines.append(f'bot_updates_in_flight {self.in_flight}')
+
+        header('bot_update_duration_seconds', 'histogram', "Update'ni to'liq ishlash vaqti")
+        histogram('bot_update_duration_seconds', 'type', self.update_duration)
+
+        header('bot_handler_duration_seconds', 'histogram', "Handler ishlash vaqti")
+        histogram('bot_handler_duration_seconds', 'handler', self.handler_duration)
+
+        header('bot_errors_total', 'counter', "errors_handler'ga kelgan xatolar")
+        for (kind, exception), count in sorted(self.errors.items()):
+            lines.append(f'bot_errors_total{{type="{_label(kind)}",exception="{_label(exception)}"}} {count}')
+
+        for name, kind, help, collect in self._gauges:
+            header(name, kind, help)
+            lines.append(f'{name} {collect()}')
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+
+
+async def _handle_metrics(request: web.Request):
+    return web.Response(text=metrics.render(), headers={'Content-Type': CONTENT_TYPE})
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """/metrics endpoint'ini alohida portda ochadi"""
+    app = web.Application()
+    app.router.add_get('/metrics', _handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logging.info(f"Metrikalar: http://{host}:{port}/metrics")
+    return runner
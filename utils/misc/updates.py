@@ -0,0 +1,35 @@
+from aiogram import types
+
+# Update ichida foydalanuvchi bo'lishi mumkin bo'lgan maydonlar
+USER_FIELDS = (
+    'message', 'edited_message', 'callback_query', 'inline_query', 'chosen_inline_result',
+    'shipping_query', 'pre_checkout_query', 'poll_answer', 'my_chat_member', 'chat_member',
+    'chat_join_request',
+)
+
+
+def update_user_id(update: types.Update):
+    """Update yuborgan foydalanuvchi ID'si (kanal postlari va h.k. uchun None)"""
+    for field in USER_FIELDS:
+        event = getattr(update, field, None)
+        if event is None:
+            continue
+        user = getattr(event, 'from_user', None) or getattr(event, 'user', None)
+        return user.id if user else None
+    return None
+
+
+def update_type(update: types.Update) -> str:
+    """Update turi: 'message', 'callback_query', ..."""
+    return next((field for field in update.values if field != 'update_id'), 'unknown')
+
+
+def raw_update_user_id(update: dict):
+    """update_user_id() ning xom JSON (dict) uchun varianti"""
+    for field in USER_FIELDS:
+        event = update.get(field)
+        if event is None:
+            continue
+        user = event.get('from') or event.get('user')
+        return user['id'] if user else None
+    return None
@@ -3,12 +3,14 @@ import logging
 from aiogram import Dispatcher
 
 from data.config import ADMINS
+from utils.outbound import outbound_lane, ADMIN
 
 
 async def on_startup_notify(dp: Dispatcher):
-    for admin in ADMINS:
-        try:
-            await dp.bot.send_message(admin, "Bot ishga tushdi")
+    with outbound_lane(ADMIN):
+        for admin in ADMINS:
+            try:
+                await dp.bot.send_message(admin, "Bot ishga tushdi")
 
-        except Exception as err:
-            logging.exception(err)
+            except Exception as err:
+                logging.exception(err)
@@ -0,0 +1,204 @@
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+
+from aiogram import Bot
+from aiogram.utils.exceptions import RetryAfter
+
+# Navbat ustuvorligi (kichik raqam - oldinroq yuboriladi)
+INTERACTIVE = 0  # foydalanuvchiga javoblar
+ADMIN = 1  # adminlarga xabarlar
+SCHEDULER = 2  # obuna ogohlantirishlari, kanaldan chiqarish
+BROADCAST = 3  # reklama
+
+LANE_NAMES = {INTERACTIVE: 'interactive', ADMIN: 'admin', SCHEDULER: 'scheduler', BROADCAST: 'broadcast'}
+
+# Telegram xabar limitiga kirmaydigan so'rovlar
+UNLIMITED_METHODS = {
+    'getUpdates', 'getMe', 'setWebhook', 'deleteWebhook', 'getWebhookInfo',
+    'answerCallbackQuery', 'getChat', 'getChatMember', 'getFile', 'setMyCommands',
+}
+
+_lane = contextvars.ContextVar('outbound_lane', default=INTERACTIVE)
+
+
+def set_lane(lane: int):
+    """Joriy vazifa (va undan yaratilgan vazifalar) uchun navbatni o'rnatadi"""
+    return _lane.set(lane)
+
+
+@contextlib.contextmanager
+def outbound_lane(lane: int):
+    """Blok ichidagi so'rovlarni berilgan navbatdan yuboradi"""
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def is_chat_message(method: str) -> bool:
+    return method.startswith('send') or method in ('copyMessage', 'forwardMessage')
+
+
+class OutboundLimiter:
+    """
+    Barcha chiquvchi so'rovlar uchun umumiy limiter.
+
+    - Umumiy token bucket: o'rtacha `rate` so'rov/sekund
+    - Bo'sh token birinchi navbatda eng ustuvor navbatdagi so'rovga beriladi
+    - Bitta chatga xabarlar `chat_rate`/sekund (qisqa muddatda `chat_burst` tagacha)
+    - pause() RetryAfter kelganda hamma navbatni to'xtatadi
+    """
+
+    def __init__(self, rate: float = 30, chat_rate: float = 1, chat_burst: int = 3):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters = []  # (navbat, tartib, future)
+        self._counter = itertools.count()
+        self._wakeup = None
+        self._pump = None
+        self._chats = {}  # chat_id -> (tokens, updated)
+
+        self.granted = {lane: 0 for lane in LANE_NAMES}
+        self.retry_after = 0
+
+    # ---------- umumiy limit ----------
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self) -> bool:
+        now = time.monotonic()
+        if now < self._paused_until:
+            return False
+        self._refill(now)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self, lane: int = None):
+        """Umumiy limitdan bitta ruxsat oladi (navbat ustuvorligi bo'yicha)"""
+        lane = _lane.get() if lane is None else lane
+
+        # Kutayotganlar bo'lmasa darhol o'tkazamiz
+        if not self._waiters and self._try_take():
+            self.granted[lane] += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (lane, next(self._counter), future))
+        if self._pump is None or self._pump.done():
+            self._wakeup = asyncio.Event()
+            self._pump = asyncio.create_task(self._run_pump())
+        self._wakeup.set()
+        await future
+        self.granted[lane] += 1
+
+    async def _run_pump(self):
+        while True:
+            while self._waiters and self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+
+            if not self._waiters:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            if self._try_take():
+                _, _, future = heapq.heappop(self._waiters)
+                future.set_result(None)
+                continue
+
+            now = time.monotonic()
+            if now < self._paused_until:
+                delay = self._paused_until - now
+            else:
+                delay = (1 - self._tokens) / self.rate
+            await asyncio.sleep(delay)
+
+    def set_rate(self, rate: float):
+        """Umumiy limitni o'zgartiradi (ko'p jarayonli rejimda lider almashganda)"""
+        self._refill(time.monotonic())
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self._tokens = min(self._tokens, self.capacity)
+
+    def pause(self, seconds: float):
+        """Barcha navbatlarni `seconds` soniyaga to'xtatadi"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+    # ---------- chat limiti ----------
+
+    async def acquire_chat(self, chat_id):
+        """Bitta chatga yuborish tezligini cheklaydi"""
+        while True:
+            now = time.monotonic()
+            tokens, updated = self._chats.get(chat_id, (self.chat_burst, now))
+            tokens = min(self.chat_burst, tokens + (now - updated) * self.chat_rate)
+            if tokens >= 1:
+                self._chats[chat_id] = (tokens - 1, now)
+                break
+            self._chats[chat_id] = (tokens, now)
+            await asyncio.sleep((1 - tokens) / self.chat_rate)
+
+        if len(self._chats) > 10000:
+            self._prune(now)
+
+    def _prune(self, now: float):
+        # To'liq tiklangan chatlarni saqlash shart emas
+        idle = self.chat_burst / self.chat_rate
+        for chat_id in [c for c, (_, updated) in self._chats.items() if now - updated > idle]:
+            del self._chats[chat_id]
+
+    def stats(self) -> dict:
+        return {
+            'queued': len(self._waiters),
+            'retry_after': self.retry_after,
+            'granted': {LANE_NAMES[lane]: count for lane, count in self.granted.items()},
+        }
+
+
+class RateLimitedBot(Bot):
+    """
+    Barcha so'rovlarni OutboundLimiter orqali yuboradigan Bot.
+    RetryAfter kelsa limiter to'xtatiladi va so'rov qayta yuboriladi.
+    """
+
+    def __init__(self, *args, limiter: OutboundLimiter = None, max_retries: int = 3, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limiter = limiter or OutboundLimiter()
+        self.max_retries = max_retries
+
+    async def request(self, method, data=None, files=None, **kwargs):
+        if method in UNLIMITED_METHODS:
+            return await super().request(method, data, files, **kwargs)
+
+        chat_id = data.get('chat_id') if data and is_chat_message(method) else None
+        attempt = 0
+        while True:
+            if chat_id is not None:
+                await self.limiter.acquire_chat(chat_id)
+            await self.limiter.acquire()
+            try:
+                return await super().request(method, data, files, **kwargs)
+            except RetryAfter as e:
+                self.limiter.retry_after += 1
+                self.limiter.pause(e.timeout + 1)
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                logging.warning(f"RetryAfter {e.timeout}s ({method}), qayta urinish {attempt}")
@@ -0,0 +1,79 @@
+"""
+Admin ro'yxatlari uchun keyset sahifalash va "◀️ ▶️" inline tugmalari.
+
+Ro'yxat database.PAGED_LISTS da tavsiflanadi, ko'rinishi esa @paged_list
+bilan ro'yxatdan o'tkaziladi:
+
+    @paged_list('pay_all')
+    async def render_all_payments(message, page, nav, edit):
+        await send_page(message, text, nav, edit)
+
+Tugmalar `page:<ro'yxat>:<n|p>:<kursor id>` callback'ini yuboradi, uni
+admin paneldagi bitta handler show_page() orqali ishlaydi.
+"""
+from aiogram import types
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.utils.exceptions import MessageNotModified
+
+from utils.db_api import db
+
+PAGE_PREFIX = 'page'
+
+# ro'yxat nomi -> (render, id maydoni, sahifa hajmi)
+_lists = {}
+
+
+def paged_list(list_name: str, id_field: str = 'id', per_page: int = 20):
+    """Ro'yxat ko'rinishini ro'yxatdan o'tkazadi"""
+    def decorator(render):
+        _lists[list_name] = (render, id_field, per_page)
+        return render
+    return decorator
+
+
+def page_keyboard(list_name: str, page: dict, id_field: str = 'id'):
+    """Sahifa chetidagi yozuvlar bo'yicha ◀️ ▶️ tugmalari (kerak bo'lmasa None)"""
+    items = page['items']
+    if not items or not (page['has_prev'] or page['has_next']):
+        return None
+
+    buttons = []
+    if page['has_prev']:
+        buttons.append(InlineKeyboardButton(
+            "◀️", callback_data=f"{PAGE_PREFIX}:{list_name}:p:{items[0][id_field]}"
+        ))
+    if page['has_next']:
+        buttons.append(InlineKeyboardButton(
+            "▶️", callback_data=f"{PAGE_PREFIX}:{list_name}:n:{items[-1][id_field]}"
+        ))
+    return InlineKeyboardMarkup(row_width=2).row(*buttons)
+
+
+def parse_page_callback(data: str):
+    """`page:<ro'yxat>:<n|p>:<id>` -> (ro'yxat, kursor id, orqagami)"""
+    _, list_name, direction, cursor_id = data.split(':')
+    return list_name, int(cursor_id), direction == 'p'
+
+
+async def show_page(message: types.Message, list_name: str, cursor_id: int = None,
+                    backward: bool = False, edit: bool = False):
+    """Ro'yxat sahifasini o'qib, uning ko'rinishini chiqaradi"""
+    render, id_field, per_page = _lists[list_name]
+    page = await db.get_page(list_name, cursor_id, backward, per_page)
+
+    # Kursor yozuvi o'chirilgan yoki ro'yxat o'zgargan - boshidan ko'rsatamiz
+    if not page['items'] and cursor_id is not None:
+        page = await db.get_page(list_name, None, False, per_page)
+
+    await render(message, page, page_keyboard(list_name, page, id_field), edit)
+
+
+async def send_page(message: types.Message, text: str, nav: InlineKeyboardMarkup, edit: bool):
+    """Matnli ro'yxat: yangi xabar yoki mavjud xabarni tahrirlash"""
+    if not edit:
+        await message.answer(text, reply_markup=nav)
+        return
+    try:
+        await message.edit_text(text, reply_markup=nav)
+    except MessageNotModified:
+        pass
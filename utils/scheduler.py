@@ -1,37 +1,42 @@
 import asyncio
+import heapq
+import itertools
+import logging
 from datetime import datetime, timedelta
 from aiogram import Bot
 
-from utils.db_api.database import (
-    get_expiring_subscriptions, get_expired_subscriptions,
-    deactivate_subscription, update_last_notified, get_active_channels
-)
+from utils.db_api import db, writes
+from utils.db_api import events
+from utils.channel_removal import remove_expired_subscriptions
+from utils.outbound import set_lane, SCHEDULER
 
-async def check_subscriptions(bot: Bot):
-    """
-    Obunalarni tekshirish va xabar yuborish
-    Har soatda bir marta ishlatiladi
-    """
-    # 3 kun ichida tugaydigan obunalar
-    expiring_subs = get_expiring_subscriptions(3)
-    
-    for sub in expiring_subs:
-        # Oxirgi ogohlantirish 24 soatdan oldin bo'lgan bo'lsa
-        last_notified = sub['last_notified']
-        
-        if last_notified:
-            last_time = datetime.strptime(last_notified, '%Y-%m-%d %H:%M:%S')
-            if datetime.now() - last_time < timedelta(hours=24):
-                continue
-        
-        expires_at = sub['expires_at']
-        if expires_at:
-            expires_date = datetime.strptime(expires_at, '%Y-%m-%d %H:%M:%S')
-            days_left = (expires_date - datetime.now()).days
-        else:
-            days_left = 0
-        
-        text = f"""⚠️ <b>Obuna tugash muddati yaqinlashmoqda!</b>
+# Tugashdan qancha oldin ogohlantirish boshlanadi va qanchalik tez-tez takrorlanadi
+WARN_BEFORE = timedelta(days=3)
+WARN_INTERVAL = timedelta(hours=24)
+
+WARN = 'warn'
+EXPIRE = 'expire'
+
+
+def parse_timestamp(value):
+    """Bazadagi vaqtni datetime'ga o'giradi ('YYYY-MM-DD HH:MM:SS[.ffffff]')"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+async def send_expiry_warning(bot: Bot, sub):
+    """Obuna tugashi yaqinlashgani haqida ogohlantirish"""
+    expires_at = sub['expires_at']
+    if expires_at:
+        expires_date = parse_timestamp(expires_at)
+        days_left = (expires_date - datetime.now()).days
+    else:
+        days_left = 0
+
+    text = f"""⚠️ <b>Obuna tugash muddati yaqinlashmoqda!</b>
 
 📅 Tugash sanasi: {expires_at[:10] if expires_at else '-'}
 ⏳ Qolgan vaqt: <b>{days_left} kun</b>
@@ -39,60 +44,172 @@ async def check_subscriptions(bot: Bot):
 💡 Obunani yangilash uchun /start buyrug'ini yuboring va "💳 To'lov qilish" tugmasini bosing.
 
 ❗️ Vaqtida to'lov qilmasangiz, premium kanaldan chiqarilasiz."""
-        
-        try:
-            await bot.send_message(sub['user_id'], text)
-            update_last_notified(sub['user_id'])
-        except Exception as e:
-            print(f"Xabar yuborishda xato (user {sub['user_id']}): {e}")
-    
-    # Muddati o'tgan obunalar
-    expired_subs = get_expired_subscriptions()
-    
-    for sub in expired_subs:
-        # Foydalanuvchiga xabar yuborish
-        text = f"""❌ <b>Obunangiz muddati tugadi!</b>
-
-📅 Tugagan sana: {sub['expires_at'][:10] if sub['expires_at'] else '-'}
-
-😔 Siz premium kanaldan chiqarildingiz.
-
-💡 Qayta obuna bo'lish uchun /start buyrug'ini yuboring va "💳 To'lov qilish" tugmasini bosing."""
-        
-        try:
-            await bot.send_message(sub['user_id'], text)
-        except:
-            pass
-        
-        # Kanaldan chiqarish
-        channels = get_active_channels()
-        for channel in channels:
+
+    try:
+        await bot.send_message(sub['user_id'], text)
+        writes.update_last_notified(sub['user_id'])
+    except Exception as e:
+        print(f"Xabar yuborishda xato (user {sub['user_id']}): {e}")
+
+
+class ExpiryScheduler:
+    """
+    Obunalar tugash vaqtlari bo'yicha ishlovchi scheduler.
+
+    Ishga tushganda faol obunalarning tugash vaqtlari min-heap'ga yuklanadi,
+    keyin faqat navbatdagi vaqt kelganda uyg'onadi va faqat shu obunani tekshiradi.
+    approve_payment / deactivate_subscription heap'ni database hodisalari orqali yangilaydi.
+    """
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self._heap = []  # (vaqt, tartib, tur, user_id, expires_at)
+        self._deadlines = {}  # user_id -> joriy expires_at
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._loop = None
+
+    # ---------- heap boshqaruvi ----------
+
+    def _push(self, when: datetime, kind: str, user_id: int, expires_at: datetime):
+        entry = (when, next(self._counter), kind, user_id, expires_at)
+        if not self._heap or entry < self._heap[0]:
+            self._wakeup.set()
+        heapq.heappush(self._heap, entry)
+
+    def _schedule(self, user_id: int, expires_at: datetime, last_notified: datetime = None):
+        self._deadlines[user_id] = expires_at
+
+        warn_at = expires_at - WARN_BEFORE
+        if last_notified:
+            warn_at = max(warn_at, last_notified + WARN_INTERVAL)
+        if warn_at < expires_at and expires_at > datetime.now():
+            self._push(warn_at, WARN, user_id, expires_at)
+
+        self._push(expires_at, EXPIRE, user_id, expires_at)
+
+    def _cancel(self, user_id: int):
+        # Heap'dagi eski yozuvlar o'chirilmaydi, navbati kelganda e'tiborsiz qoldiriladi
+        self._deadlines.pop(user_id, None)
+
+    def schedule(self, user_id: int, expires_at, last_notified=None):
+        """Obuna tugash vaqtini qo'shadi yoki yangilaydi (istalgan thread'dan)"""
+        expires_at = parse_timestamp(expires_at)
+        last_notified = parse_timestamp(last_notified)
+        self._call(self._schedule, user_id, expires_at, last_notified)
+
+    def cancel(self, user_id: int):
+        """Obunani kuzatishdan chiqaradi (istalgan thread'dan)"""
+        self._call(self._cancel, user_id)
+
+    def _call(self, func, *args):
+        if self._loop is None:
+            func(*args)
+        else:
+            self._loop.call_soon_threadsafe(func, *args)
+
+    # ---------- database hodisalari ----------
+
+    def _on_activated(self, user_id: int, expires_at):
+        self.schedule(user_id, expires_at)
+
+    def _on_deactivated(self, user_id: int):
+        self.cancel(user_id)
+
+    # ---------- asosiy sikl ----------
+
+    async def load(self):
+        """Faol obunalarni heap'ga yuklaydi"""
+        for sub in await db.get_subscription_deadlines():
             try:
-                await bot.kick_chat_member(
-                    chat_id=channel['channel_id'],
-                    user_id=sub['user_id']
+                self._schedule(
+                    sub['user_id'],
+                    parse_timestamp(sub['expires_at']),
+                    parse_timestamp(sub['last_notified'])
                 )
-                # Unban qilish (keyingi obunada kirish imkoniyati uchun)
-                await bot.unban_chat_member(
-                    chat_id=channel['channel_id'],
-                    user_id=sub['user_id']
-                )
-            except Exception as e:
-                print(f"Kanaldan chiqarishda xato (user {sub['user_id']}): {e}")
-        
-        # Obunani o'chirish
-        deactivate_subscription(sub['user_id'])
+            except ValueError as e:
+                logging.warning(f"Obuna vaqti noto'g'ri (user {sub['user_id']}): {e}")
+
+    def _pop_due(self, now: datetime):
+        """Vaqti kelgan va hali dolzarb yozuvlarni qaytaradi"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, kind, user_id, expires_at = heapq.heappop(self._heap)
+            if self._deadlines.get(user_id) == expires_at:
+                due.append((kind, user_id, expires_at))
+        return due
+
+    async def _current(self, user_id: int, expires_at: datetime):
+        """Obunaning joriy holatini o'qiydi; heap'dagi yozuv eskirgan bo'lsa None"""
+        sub = await db.get_subscription_with_user(user_id)
+        if not sub or not sub['is_active'] or parse_timestamp(sub['expires_at']) != expires_at:
+            return None
+        return sub
+
+    async def _warn(self, user_id: int, expires_at: datetime):
+        sub = await self._current(user_id, expires_at)
+        if not sub or expires_at <= datetime.now():
+            return
+        await send_expiry_warning(self.bot, sub)
+        next_warn = datetime.now() + WARN_INTERVAL
+        if next_warn < expires_at and self._deadlines.get(user_id) == expires_at:
+            self._push(next_warn, WARN, user_id, expires_at)
+
+    async def _expire(self, due):
+        """Bir vaqtda muddati o'tgan obunalarni bitta partiyada yopadi"""
+        subs = []
+        for user_id, expires_at in due:
+            sub = await self._current(user_id, expires_at)
+            if sub:
+                self._deadlines.pop(user_id, None)
+                subs.append(sub)
+        await remove_expired_subscriptions(self.bot, subs)
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        events.subscribe('subscription_activated', self._on_activated)
+        events.subscribe('subscription_deactivated', self._on_deactivated)
+
+        try:
+            await self.load()
+
+            while True:
+                self._wakeup.clear()
+
+                expired = []
+                for kind, user_id, expires_at in self._pop_due(datetime.now()):
+                    if kind == EXPIRE:
+                        expired.append((user_id, expires_at))
+                        continue
+                    try:
+                        await self._warn(user_id, expires_at)
+                    except Exception as e:
+                        logging.exception(f"Scheduler xatosi (user {user_id}): {e}")
+
+                if expired:
+                    try:
+                        await self._expire(expired)
+                    except Exception as e:
+                        logging.exception(f"Obunalarni yopishda xato: {e}")
+
+                if self._heap:
+                    timeout = max(0.0, (self._heap[0][0] - datetime.now()).total_seconds())
+                else:
+                    timeout = None
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            events.unsubscribe('subscription_activated', self._on_activated)
+            events.unsubscribe('subscription_deactivated', self._on_deactivated)
+
 
 async def subscription_scheduler(bot: Bot):
     """
-    Obunalar tekshirish scheduleri
-    Har 1 soatda ishlaydi
+    Obunalar scheduleri: ogohlantirish va kanaldan chiqarish
+    aynan tugash vaqtida bajariladi
     """
-    while True:
-        try:
-            await check_subscriptions(bot)
-        except Exception as e:
-            print(f"Scheduler xatosi: {e}")
-        
-        # 1 soat kutish
-        await asyncio.sleep(3600)
+    set_lane(SCHEDULER)
+    await ExpiryScheduler(bot).run()
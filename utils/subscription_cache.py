@@ -0,0 +1,110 @@
+import asyncio
+import typing
+from collections import OrderedDict
+from datetime import datetime
+
+from data.config import SUBSCRIPTION_CACHE_SIZE
+from utils.db_api import db
+from utils.db_api import events
+
+
+class SubscriptionStatus(typing.NamedTuple):
+    """Foydalanuvchi obunasining ixcham holati"""
+    active: bool
+    expires_at: typing.Optional[float]  # unix vaqt
+    channel_joined: bool
+
+    @classmethod
+    def from_row(cls, row):
+        if row is None:
+            return NO_SUBSCRIPTION
+        expires_at = None
+        if row['expires_at']:
+            try:
+                expires_at = datetime.fromisoformat(row['expires_at']).timestamp()
+            except ValueError:
+                pass
+        return cls(bool(row['is_active']), expires_at, bool(row['channel_joined']))
+
+    @property
+    def expires_date(self) -> typing.Optional[datetime]:
+        return datetime.fromtimestamp(self.expires_at) if self.expires_at else None
+
+
+NO_SUBSCRIPTION = SubscriptionStatus(False, None, False)
+
+
+class SubscriptionCache:
+    """
+    Obuna holati uchun LRU kesh (hajmi `max_size` bilan chegaralangan).
+
+    Obunasi yo'q foydalanuvchilar ham keshlanadi. approve_payment,
+    deactivate_subscription va mark_channel_joined database hodisalari
+    orqali shu foydalanuvchining yozuvini o'chiradi.
+    """
+
+    def __init__(self, max_size: int = 50000):
+        self.max_size = max_size
+        self._cache = OrderedDict()  # user_id -> SubscriptionStatus
+        self._version = 0
+        self._loop = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get(self, user_id: int) -> SubscriptionStatus:
+        """Obuna holatini keshdan (bo'lmasa bazadan) qaytaradi"""
+        self._loop = self._loop or asyncio.get_running_loop()
+
+        status = self._cache.get(user_id)
+        if status is not None:
+            self.hits += 1
+            self._cache.move_to_end(user_id)
+            return status
+
+        self.misses += 1
+        version = self._version
+        status = SubscriptionStatus.from_row(await db.get_subscription(user_id))
+
+        # O'qish paytida obuna o'zgargan bo'lsa, natijani keshga yozmaymiz
+        if version == self._version:
+            self._cache[user_id] = status
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+        return status
+
+    async def is_active(self, user_id: int) -> bool:
+        return (await self.get(user_id)).active
+
+    def invalidate(self, user_id: int, **_):
+        """Foydalanuvchi yozuvini o'chiradi (istalgan thread'dan)"""
+        if self._loop is None:
+            self._invalidate(user_id)
+        else:
+            self._loop.call_soon_threadsafe(self._invalidate, user_id)
+
+    def _invalidate(self, user_id: int):
+        self._version += 1
+        self.invalidations += 1
+        self._cache.pop(user_id, None)
+
+    def stats(self) -> dict:
+        """Monitoring uchun hisoblagichlar"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._cache),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+
+subscription_cache = SubscriptionCache(SUBSCRIPTION_CACHE_SIZE)
+for _event in ('subscription_activated', 'subscription_deactivated', 'channel_joined'):
+    events.subscribe(_event, subscription_cache.invalidate)
@@ -0,0 +1,302 @@
+"""
+Ko'p jarayonli rejim (WORKERS > 1).
+
+Supervisor jarayoni update'larni qabul qiladi (webhook server yoki bitta
+getUpdates poller) va ularni user_id bo'yicha worker jarayonlarga taqsimlaydi.
+Bitta foydalanuvchining update'lari doim bitta worker'ga boradi, shuning uchun
+uning FSM holati, navbati va keshlari o'sha jarayonda izchil qoladi.
+
+- Har bir worker o'z Dispatcher'i, handler'lari va DB pool'i bilan ishlaydi
+- Database hodisalari (obuna, katalog, reklama) boshqa worker'larga ham
+  uzatiladi - ularning keshlari eskirib qolmaydi
+- Scheduler va reklama navbati ijarani olgan bitta worker'da ishlaydi (utils/leader.py)
+- Chiquvchi limit (OUTBOUND_RATE) bitta byudjet: har bir worker javoblar uchun
+  ulush oladi, reklama/scheduler ulushi (BROADCAST_RATE) esa lider worker'da
+- To'xtab qolgan worker qayta ishga tushiriladi
+"""
+import asyncio
+import contextvars
+import hmac
+import logging
+import multiprocessing
+import queue
+import signal
+import threading
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher, types
+
+from data import config
+from utils.db_api import events
+from utils.db_api.database import init_db, close_pool
+from utils.leader import singleton_jobs
+from utils.metrics import start_metrics_server
+from utils.misc.updates import raw_update_user_id
+from utils.webhook import SECRET_HEADER
+
+STOP = None  # navbatdagi to'xtash belgisi
+
+
+def route_key(update: dict) -> int:
+    """Update qaysi worker'ga borishini belgilovchi kalit (odatda user_id)"""
+    user_id = raw_update_user_id(update)
+    return user_id if user_id is not None else update.get('update_id', 0)
+
+
+# ============ WORKER ============
+
+def worker_rates(workers: int) -> tuple:
+    """
+    (oddiy worker, lider worker) uchun OUTBOUND_RATE ulushlari - jami OUTBOUND_RATE.
+    Reklama va scheduler faqat liderda ishlaydi, shuning uchun BROADCAST_RATE
+    bo'linmaydi; qolgani javoblar uchun hamma worker'larga teng bo'linadi.
+    """
+    interactive = max(config.OUTBOUND_RATE - config.BROADCAST_RATE, 1.0) / workers
+    return interactive, max(config.OUTBOUND_RATE - interactive * (workers - 1), interactive)
+
+
+def worker_main(index: int, workers: int, updates, relay):
+    """Worker jarayoni: navbatdan update'larni olib, o'z Dispatcher'ida ishlaydi"""
+    # Jarayon supervisor orqali (navbatga STOP) to'xtatiladi
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    asyncio.run(_run_worker(index, workers, updates, relay))
+
+
+async def _run_worker(index: int, workers: int, updates, relay):
+    from loader import dp, bot
+    import middlewares, filters, handlers  # noqa: F401 (handler'larni ro'yxatdan o'tkazadi)
+    from utils.db_api import db, writes
+    from utils.notify_admins import on_startup_notify
+    from utils.set_bot_commands import set_default_commands
+
+    loop = asyncio.get_running_loop()
+    Bot.set_current(bot)
+    Dispatcher.set_current(dp)
+    # Reader thread'dan kelgan update'lar shu kontekstda (joriy bot/dp bilan) ishlanadi
+    context = contextvars.copy_context()
+
+    # Shu jarayondagi database hodisalari boshqa worker'larga ham yuboriladi
+    events.set_forwarder(lambda event, payload: relay.put((index, event, payload)))
+
+    if index == 0:
+        try:
+            await set_default_commands(dp)
+            await on_startup_notify(dp)
+        except Exception as e:
+            logging.exception(f"Ishga tushirishda xato: {e}")
+
+    in_flight = set()
+    stopped = asyncio.Event()
+
+    def on_update(update: dict):
+        # updates_handler orqali - update darajasidagi middleware'lar (foydalanuvchi navbati) ishlaydi
+        task = loop.create_task(dp.updates_handler.notify(types.Update.to_object(update)))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    def reader():
+        while True:
+            item = updates.get()
+            if item is STOP:
+                loop.call_soon_threadsafe(stopped.set)
+                return
+            kind, *args = item
+            if kind == 'event':
+                # Tinglovchilar istalgan thread'dan chaqirilishi mumkin (events.py)
+                event, payload = args
+                events.deliver(event, **payload)
+            else:
+                loop.call_soon_threadsafe(on_update, args[0], context=context)
+
+    threading.Thread(target=reader, name=f"worker-{index}-updates", daemon=True).start()
+    # Telegram limiti bot uchun umumiy: limiter app.py import qilinganda to'liq
+    # OUTBOUND_RATE bilan yaratilgan, bu yerda worker ulushiga tushiriladi
+    follower_rate, leader_rate = worker_rates(workers)
+    bot.limiter.set_rate(follower_rate)
+    leader = singleton_jobs(
+        bot, on_change=lambda leading: bot.limiter.set_rate(leader_rate if leading else follower_rate)
+    )
+    leader.start()
+    # Har bir worker o'z metrikalarini alohida portda beradi
+    metrics_server = None
+    if config.METRICS_PORT:
+        metrics_server = await start_metrics_server(config.METRICS_HOST, config.METRICS_PORT + index)
+    logging.info(f"Worker {index} ishga tushdi ({leader.owner})")
+
+    await stopped.wait()
+
+    if in_flight:
+        await asyncio.wait(list(in_flight), timeout=30)
+    await leader.stop()
+    if metrics_server:
+        await metrics_server.cleanup()
+    events.set_forwarder(None)
+
+    await writes.close()
+    await dp.storage.close()
+    await (await bot.get_session()).close()
+    db.shutdown()
+    close_pool()
+
+
+async def _cancel(tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# ============ SUPERVISOR ============
+
+class Supervisor:
+    """Update'larni qabul qilib, user_id bo'yicha worker jarayonlarga taqsimlaydi"""
+
+    def __init__(self, workers: int, queue_size: int = 1000):
+        self.workers = workers
+        self._ctx = multiprocessing.get_context('spawn')
+        self.queues = [self._ctx.Queue(maxsize=queue_size) for _ in range(workers)]
+        self.relay = self._ctx.Queue()
+        self.processes = [None] * workers
+        self._locks = []
+        self._stopping = False
+
+    def _spawn(self, index: int):
+        process = self._ctx.Process(
+            target=worker_main,
+            args=(index, self.workers, self.queues[index], self.relay),
+            name=f"worker-{index}"
+        )
+        process.start()
+        self.processes[index] = process
+
+    # ---------- taqsimlash ----------
+
+    async def dispatch(self, update: dict):
+        """Update'ni foydalanuvchisiga biriktirilgan worker navbatiga qo'yadi"""
+        index = route_key(update) % self.workers
+        item = ('update', update)
+        lock = self._locks[index]
+        if not lock.locked():
+            try:
+                self.queues[index].put_nowait(item)
+                return
+            except queue.Full:
+                pass
+        # Navbat to'la: tartib buzilmasligi uchun keyingilar ham shu yerda kutadi
+        async with lock:
+            await asyncio.get_running_loop().run_in_executor(None, self.queues[index].put, item)
+
+    def _relay_events(self):
+        while True:
+            item = self.relay.get()
+            if item is STOP:
+                return
+            source, event, payload = item
+            for index, updates in enumerate(self.queues):
+                if index != source:
+                    updates.put(('event', event, payload))
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(1)
+            for index, process in enumerate(self.processes):
+                if not process.is_alive() and not self._stopping:
+                    logging.error(f"Worker {index} to'xtab qoldi (kod {process.exitcode}), qayta ishga tushirilmoqda")
+                    self._spawn(index)
+
+    # ---------- update manbalari ----------
+
+    async def _poll(self, bot: Bot):
+        await bot.delete_webhook(drop_pending_updates=True)
+        offset = None
+        while True:
+            payload = {'timeout': 20}
+            if offset is not None:
+                payload['offset'] = offset
+            try:
+                with bot.request_timeout(30):
+                    updates = await bot.request('getUpdates', payload)
+            except Exception as e:
+                logging.exception(f"getUpdates xatosi: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            for update in updates:
+                offset = update['update_id'] + 1
+                await self.dispatch(update)
+
+    async def _webhook(self, request: web.Request):
+        if config.WEBHOOK_SECRET:
+            secret = request.headers.get(SECRET_HEADER, '')
+            if not hmac.compare_digest(secret, config.WEBHOOK_SECRET):
+                raise web.HTTPForbidden()
+        try:
+            update = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest()
+        if not isinstance(update, dict):
+            raise web.HTTPBadRequest()
+
+        await self.dispatch(update)
+        return web.Response(text='ok')
+
+    # ---------- ishga tushirish ----------
+
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        self._locks = [asyncio.Lock() for _ in range(self.workers)]
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        from loader import bot
+        tasks = [asyncio.create_task(self._watch())]
+        runner = None
+        if config.USE_WEBHOOK:
+            await bot.set_webhook(
+                config.WEBHOOK_URL,
+                secret_token=config.WEBHOOK_SECRET or None,
+                drop_pending_updates=True
+            )
+            app = web.Application()
+            app.router.add_post(config.WEBHOOK_PATH, self._webhook)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.TCPSite(runner, config.WEBAPP_HOST, config.WEBAPP_PORT).start()
+            logging.info(f"Webhook: {config.WEBHOOK_URL} -> {config.WEBAPP_HOST}:{config.WEBAPP_PORT}")
+        else:
+            tasks.append(asyncio.create_task(self._poll(bot)))
+
+        print(f"Bot ishga tushdi! ({self.workers} ta worker)")
+        await stop.wait()
+
+        self._stopping = True
+        await _cancel(tasks)
+        if runner is not None:
+            await runner.cleanup()
+        await (await bot.get_session()).close()
+
+    def run(self):
+        # Migratsiyalar bir marta, worker'lardan oldin
+        init_db()
+        close_pool()
+
+        for index in range(self.workers):
+            self._spawn(index)
+        relay = threading.Thread(target=self._relay_events, name='events-relay', daemon=True)
+        relay.start()
+
+        try:
+            asyncio.run(self._serve())
+        finally:
+            self._stopping = True
+            for updates in self.queues:
+                updates.put(STOP)
+            for process in self.processes:
+                process.join(timeout=60)
+                if process.is_alive():
+                    process.terminate()
+            self.relay.put(STOP)
+            relay.join(timeout=5)
+            print("Bot to'xtatildi!")
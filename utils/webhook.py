@@ -0,0 +1,84 @@
+import asyncio
+import hmac
+import logging
+
+from aiohttp import web
+from aiogram import Dispatcher
+from aiogram.dispatcher.webhook import WebhookRequestHandler
+from aiogram.utils.executor import Executor
+
+from data.config import WEBHOOK_URL, WEBHOOK_PATH, WEBHOOK_SECRET, WEBAPP_HOST, WEBAPP_PORT
+
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+# Bir vaqtda fonda ishlanayotgan update'lar chegarasi. Undan oshsa update
+# so'rov ichida ishlanadi - Telegram keyingisini javobdan keyin yuboradi.
+MAX_IN_FLIGHT = 1000
+
+_in_flight = set()
+
+
+class FastAckWebhookHandler(WebhookRequestHandler):
+    """
+    Update'ni qabul qilib darhol 200 qaytaradi, ishlashni esa fonda davom ettiradi.
+    Standart handler handler tugashini kutadi (55 soniyagacha), bu esa
+    Telegram'ning keyingi update'larni yuborishini sekinlashtiradi.
+    """
+
+    async def post(self):
+        self.validate_ip()
+
+        if WEBHOOK_SECRET:
+            secret = self.request.headers.get(SECRET_HEADER, '')
+            if not hmac.compare_digest(secret, WEBHOOK_SECRET):
+                raise web.HTTPForbidden()
+
+        dispatcher = self.get_dispatcher()
+        try:
+            update = await self.parse_update(dispatcher.bot)
+        except (ValueError, TypeError):
+            raise web.HTTPBadRequest()
+
+        # updates_handler orqali - update darajasidagi middleware'lar ham ishlaydi
+        if len(_in_flight) >= MAX_IN_FLIGHT:
+            await dispatcher.updates_handler.notify(update)
+        else:
+            task = asyncio.create_task(dispatcher.updates_handler.notify(update))
+            _in_flight.add(task)
+            task.add_done_callback(_in_flight.discard)
+
+        return web.Response(text='ok')
+
+
+async def wait_in_flight(timeout: float = 30):
+    """Fonda ishlanayotgan update'lar tugashini kutadi (to'xtashdan oldin)"""
+    if _in_flight:
+        logging.info(f"{len(_in_flight)} ta update tugashi kutilmoqda")
+        await asyncio.wait(list(_in_flight), timeout=timeout)
+
+
+async def set_webhook(dispatcher: Dispatcher):
+    """Telegram'ga webhook manzilini o'rnatadi"""
+    await dispatcher.bot.set_webhook(
+        WEBHOOK_URL,
+        secret_token=WEBHOOK_SECRET or None,
+        drop_pending_updates=True
+    )
+    logging.info(f"Webhook o'rnatildi: {WEBHOOK_URL}")
+
+
+def start_webhook(dispatcher: Dispatcher, on_startup=None, on_shutdown=None):
+    """Botni webhook rejimida (aiohttp server) ishga tushiradi"""
+    executor = Executor(dispatcher)
+    executor.on_startup(set_webhook, polling=False)
+    if on_startup:
+        executor.on_startup(on_startup, polling=False)
+    if on_shutdown:
+        executor.on_shutdown(on_shutdown, polling=False)
+
+    executor.start_webhook(
+        webhook_path=WEBHOOK_PATH,
+        request_handler=FastAckWebhookHandler,
+        host=WEBAPP_HOST,
+        port=WEBAPP_PORT
+    )